@@ -3,203 +3,200 @@
 # Doctor-Style Explanations
 # ============================================================
 
-from typing import Dict
+from typing import Dict, List, NamedTuple, Optional
 
+from risk_calculator.risk_rules import get_rules
+from translation.catalog import Message, render_skeleton, source_templates
 
-def generate_summary(data: Dict) -> str:
-    """Generate a clinically structured risk summary."""
-    risk_score = data.get("risk_score", 0)
 
-    if risk_score <= 25:
-        return f"Diabetes Risk Score: {risk_score}/100. Clinical assessment indicates Low Risk."
-    elif risk_score <= 50:
-        return f"Diabetes Risk Score: {risk_score}/100. Clinical assessment indicates Moderate Risk."
-    elif risk_score <= 75:
-        return f"Diabetes Risk Score: {risk_score}/100. Clinical assessment indicates High Risk. Preventive intervention is recommended."
-    else:
-        return f"Diabetes Risk Score: {risk_score}/100. Clinical assessment indicates Critical Risk. Immediate medical evaluation is advised."
+_SUMMARY_ADVICE = {
+    "High Risk": "summary.advice.high_risk",
+    "Critical Risk": "summary.advice.critical_risk",
+}
 
+_MEAL_CONTEXT_MESSAGES = {
+    "high-carb": "explanation.meal_context.high_carb",
+    "balanced": "explanation.meal_context.balanced",
+    "low-carb": "explanation.meal_context.low_carb",
+}
 
-def generate_explanation(data: Dict) -> Dict:
-    risk_score = data.get("risk_score", 0)
-    risk_level = data.get("risk_level", "Unknown")
-    attribution = data.get("attribution", {})
-    derived = data.get("derived_metrics", {})
 
-    explanations = []
+def risk_level_message(risk_level: str):
+    """Catalog message for a risk band label; labels from custom rule tables pass through as-is."""
+    message_id = "risk_level." + risk_level.lower().replace(" ", "_")
+    return Message(message_id) if message_id in source_templates() else risk_level
+
+
+def summary_messages(risk_level: str) -> List[Message]:
+    """Summary for a risk band as catalog messages ({risk_score} left open)."""
+    messages = [Message("summary.score", {"risk_level": risk_level_message(risk_level)})]
+    if risk_level in _SUMMARY_ADVICE:
+        messages.append(Message(_SUMMARY_ADVICE[risk_level]))
+    return messages
 
-    # ---------------------------
-    # Extract Clinical Inputs
-    # ---------------------------
+
+def generate_summary(data: Dict, lang: str = "en") -> str:
+    """Generate a clinically structured risk summary."""
+    risk_score = data.get("risk_score", 0)
+    risk_level = get_rules().risk_level(risk_score)
+    skeleton = render_skeleton(("summary", risk_level), lang, lambda: summary_messages(risk_level))
+    return " ".join(skeleton.fill(risk_score=risk_score))
+
+
+class ExplanationBucket(NamedTuple):
+    """Everything the explanation text depends on except the glucose and BMI values."""
+    glucose_context: str             # resolved rule-table context
+    glucose_band: str
+    high_glucose: bool               # at or above 140 mg/dL
+    meal_type: Optional[str]         # only matters after meals
+    trend: Optional[str]
+    bmi_category: Optional[str]
+    physical_activity: Optional[str]
+    medication: Optional[str]
+    symptoms: Optional[str]
+    diabetes_status: Optional[str]
+    family_history: bool
+
+
+def explanation_bucket(data: Dict) -> ExplanationBucket:
+    attribution = data.get("attribution", {})
 
     gly = attribution.get("immediate_glycemic", {})
     glucose = gly.get("glucose_value", 0)
     context = gly.get("glucose_context", "")
-    trend = gly.get("trend", "")
 
     treat = attribution.get("treatment_symptoms", {})
-    meal = treat.get("meal_type", "")
-    symptoms = treat.get("symptoms", "")
-    medication = treat.get("medication", "")
-
     baseline = attribution.get("baseline", {})
-    bmi = derived.get("bmi", 0)
-    bmi_cat = baseline.get("bmi_category", "")
-    activity = baseline.get("physical_activity", "")
-    status = baseline.get("diabetes_status", "")
-    family_history = baseline.get("family_history", False)
+
+    # Glucose bands come from the same rule table the risk score uses
+    rules = get_rules()
+    resolved_context = rules.resolve_glucose_context(context)
+
+    return ExplanationBucket(
+        glucose_context=resolved_context,
+        glucose_band=rules.glucose_band(context, glucose),
+        high_glucose=glucose >= 140,
+        meal_type=treat.get("meal_type", "") if resolved_context != "fasting" else None,
+        trend=gly.get("trend", ""),
+        bmi_category=baseline.get("bmi_category", ""),
+        physical_activity=baseline.get("physical_activity", ""),
+        medication=treat.get("medication", ""),
+        symptoms=treat.get("symptoms", ""),
+        diabetes_status=baseline.get("diabetes_status", ""),
+        family_history=bool(baseline.get("family_history", False)),
+    )
+
+
+def explanation_messages(bucket: ExplanationBucket) -> List[Message]:
+    """Explanations for one bucket as catalog messages, most important first ({glucose}/{bmi} left open)."""
+    (context, glucose_band, high_glucose, meal, trend, bmi_cat,
+     activity, medication, symptoms, status, family_history) = bucket
+
+    explanations = []
 
     # ============================================================
     # 1. BLOOD SUGAR EXPLANATION (SIMPLE LANGUAGE)
     # ============================================================
 
     if context == "fasting":
-        if glucose < 100:
-            explanations.append(
-                f"Your fasting sugar is {glucose} mg/dL. This is in a healthy range for fasting sugar."
-            )
-        elif 100 <= glucose <= 125:
-            explanations.append(
-                f"Your fasting sugar is {glucose} mg/dL. This is higher than normal and falls in the prediabetes range (100-125 mg/dL), which means the body is starting to have difficulty handling sugar."
-            )
+        if glucose_band == "normal":
+            explanations.append(Message("explanation.fasting.normal"))
+        elif glucose_band == "prediabetes":
+            explanations.append(Message("explanation.fasting.prediabetes"))
         else:
-            explanations.append(
-                f"Your fasting sugar is {glucose} mg/dL. This is in the diabetes range (126 mg/dL or above), meaning blood sugar is staying high instead of moving into cells normally."
-            )
+            explanations.append(Message("explanation.fasting.diabetes"))
     else:
-        meal_context = {
-            "high-carb": "after a high-carbohydrate meal",
-            "balanced": "after a balanced meal",
-            "low-carb": "after a low-carbohydrate meal"
-        }.get(meal, "after meals")
-
-        if glucose < 140:
-            explanations.append(
-                f"Your sugar after food is {glucose} mg/dL {meal_context}. This is in a good post-meal range (below 140 mg/dL)."
-            )
-        elif 140 <= glucose <= 180:
-            explanations.append(
-                f"Your sugar after food is {glucose} mg/dL {meal_context}. This is above the ideal range, showing a moderate sugar rise after meals."
-            )
+        meal_context = Message(_MEAL_CONTEXT_MESSAGES.get(meal, "explanation.meal_context.default"))
+
+        if glucose_band == "normal":
+            explanations.append(Message("explanation.post_meal.normal", {"meal_context": meal_context}))
+        elif glucose_band == "elevated":
+            explanations.append(Message("explanation.post_meal.elevated", {"meal_context": meal_context}))
         else:
-            explanations.append(
-                f"Your sugar after food is {glucose} mg/dL {meal_context}. This is quite high, which means your body is under sugar stress after meals."
-            )
+            explanations.append(Message("explanation.post_meal.high", {"meal_context": meal_context}))
 
     # ============================================================
     # 2. TREND EXPLANATION
     # ============================================================
 
     if trend == "improving":
-        explanations.append(
-            "Your recent readings are improving. This usually means your current routine is helping your sugar control."
-        )
+        explanations.append(Message("explanation.trend.improving"))
     elif trend == "worsening":
-        explanations.append(
-            "Your recent readings are getting worse. Over time, this can affect the eyes, kidneys, nerves, heart, and blood vessels."
-        )
-    elif trend == "stable" and glucose >= 140:
-        explanations.append(
-            "Your readings are stable, but still higher than healthy. This means sugar is staying high in a steady way."
-        )
+        explanations.append(Message("explanation.trend.worsening"))
+    elif trend == "stable" and high_glucose:
+        explanations.append(Message("explanation.trend.stable_high"))
 
     # ============================================================
     # 3. WEIGHT / ACTIVITY EXPLANATION
     # ============================================================
 
     if bmi_cat == "obese":
-        explanations.append(
-            f"Your body weight measure (BMI) is {bmi}, which is in the obese range. Extra body weight often makes sugar control harder."
-        )
+        explanations.append(Message("explanation.bmi.obese"))
     elif bmi_cat == "overweight":
-        explanations.append(
-            f"Your BMI is {bmi}, which is in the overweight range. This can raise the chance of higher sugar over time."
-        )
+        explanations.append(Message("explanation.bmi.overweight"))
     elif bmi_cat == "normal":
-        explanations.append(
-            f"Your BMI is {bmi}, which is in the normal range. This is a positive factor for sugar health."
-        )
+        explanations.append(Message("explanation.bmi.normal"))
     elif bmi_cat == "underweight":
-        explanations.append(
-            f"Your BMI is {bmi}, which is below the usual range. Low body reserve can also make sugar patterns less stable."
-        )
+        explanations.append(Message("explanation.bmi.underweight"))
 
     if activity == "never":
-        explanations.append(
-            "You reported very low physical activity. When the body moves less, sugar tends to stay in the blood longer."
-        )
+        explanations.append(Message("explanation.activity.never"))
     elif activity == "sometimes":
-        explanations.append(
-            "You reported occasional activity. Irregular movement gives less steady sugar control than regular movement."
-        )
+        explanations.append(Message("explanation.activity.sometimes"))
     elif activity == "active":
-        explanations.append(
-            "You reported regular activity. This helps muscles use sugar better and supports better blood sugar control."
-        )
+        explanations.append(Message("explanation.activity.active"))
 
     # ============================================================
     # 4. FOOD PATTERN EXPLANATION
     # ============================================================
 
-    if glucose >= 140 or trend == "worsening":
-        explanations.append(
-            "Based on your readings, foods that release sugar slowly are usually safer. Common examples are oats, whole grains, lentils/beans, nuts, seeds, and non-starchy vegetables."
-        )
-        explanations.append(
-            "For fruits, diabetes-friendly choices are apple, pear, guava, orange, sweet lime, berries, kiwi, papaya, and pomegranate seeds. Whole fruit is better than juice because juice raises sugar faster."
-        )
+    if high_glucose or trend == "worsening":
+        explanations.append(Message("explanation.food.slow_release"))
+        explanations.append(Message("explanation.food.fruits"))
     else:
-        explanations.append(
-            "Your current pattern looks relatively better. Balanced meals with controlled portions help keep sugar steady throughout the day."
-        )
+        explanations.append(Message("explanation.food.balanced"))
 
     # ============================================================
     # 5. MEDICINE / SYMPTOM EXPLANATION
     # ============================================================
 
     if medication == "insulin":
-        explanations.append(
-            "You are using insulin. This usually means your body needs direct support to control sugar, so timing of food and insulin is very important."
-        )
+        explanations.append(Message("explanation.medication.insulin"))
     elif medication == "oral":
-        explanations.append(
-            "You are on diabetes tablets. This means sugar control is being supported by medicine in addition to food and activity."
-        )
+        explanations.append(Message("explanation.medication.oral"))
 
     if symptoms == "severe":
-        explanations.append(
-            "You reported severe symptoms. With high sugar, this can be a warning sign and may need urgent medical attention."
-        )
+        explanations.append(Message("explanation.symptoms.severe"))
     elif symptoms == "mild":
-        explanations.append(
-            "You reported mild symptoms. This suggests sugar may be affecting your day-to-day comfort and needs close follow-up."
-        )
+        explanations.append(Message("explanation.symptoms.mild"))
 
     # ============================================================
     # 6. BACKGROUND RISK EXPLANATION
     # ============================================================
 
     if status == "type2":
-        explanations.append(
-            "You already have Type 2 diabetes. This means long-term sugar protection is important to prevent damage to organs."
-        )
+        explanations.append(Message("explanation.status.type2"))
     elif status == "type1":
-        explanations.append(
-            "You already have Type 1 diabetes. In Type 1, the body depends on insulin treatment for safe sugar control."
-        )
+        explanations.append(Message("explanation.status.type1"))
     elif status == "prediabetic":
-        explanations.append(
-            "You are in the prediabetes stage. This stage is an early warning and many people can delay or prevent full diabetes with timely care."
-        )
+        explanations.append(Message("explanation.status.prediabetic"))
 
     if family_history:
-        explanations.append(
-            "You have family history of diabetes. This means your natural risk is higher, even if symptoms are not strong."
-        )
+        explanations.append(Message("explanation.family_history"))
+
+    return explanations
+
+
+def generate_explanation(data: Dict, lang: str = "en") -> Dict:
+    bucket = explanation_bucket(data)
+    skeleton = render_skeleton(("explanation", bucket), lang, lambda: explanation_messages(bucket))
+    glucose = data.get("attribution", {}).get("immediate_glycemic", {}).get("glucose_value", 0)
+    bmi = data.get("derived_metrics", {}).get("bmi", 0)
+    explanations = skeleton.fill(glucose=glucose, bmi=bmi)
 
     return {
-        "risk_score": risk_score,
-        "risk_level": risk_level,
+        "risk_score": data.get("risk_score", 0),
+        "risk_level": data.get("risk_level", "Unknown"),
         "priority_explanations": explanations[:3],
         "remaining_explanations": explanations[3:]
     }
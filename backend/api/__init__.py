@@ -1,2 +1,4 @@
-from .auth_routes import router as auth_router
-from .risk_routes import router as risk_router
\ No newline at end of file
+from .auth_routes import router as auth_router, async_router as async_auth_router
+from .risk_routes import router as risk_router, async_router as async_risk_router
+from .metrics_routes import router as metrics_router, async_router as async_metrics_router
+from .recommendation_routes import router as recommendation_router, async_router as async_recommendation_router
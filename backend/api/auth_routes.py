@@ -1,21 +1,22 @@
 # api/auth_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from database import SessionLocal
 from models.user import User
 from auth.auth_utils import hash_password, verify_password, create_access_token
-from auth.auth_utils import get_current_user
+from auth.auth_utils import get_db, get_current_user, get_current_user_async, get_async_db
+from auth.auth_utils import invalidate_user, auth_cache_stats
+from models.stat_counter import USERS, increment_counters
 
 router = APIRouter()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async_router = APIRouter()
 
 class RegisterInput(BaseModel):
     name: str
@@ -73,8 +74,8 @@ def register(data: RegisterInput, db: Session = Depends(get_db)):
     )
 
     db.add(user)
+    increment_counters(db, {USERS: 1})
     db.commit()
-    db.refresh(user)
 
     return {"message": "User registered successfully"}
 
@@ -106,14 +107,140 @@ def login(data: LoginInput, db: Session = Depends(get_db)):
     }
 
 
+# ---------- ADMIN USER LISTING ----------
+DEFAULT_USERS_PAGE = 50
+MAX_USERS_PAGE = 500
+# Searches count matches up to this many; beyond it the total is a lower bound
+USER_SEARCH_COUNT_CAP = 1000
+# Sortable columns; each is indexed and paired with id as the keyset tie-breaker
+USER_SORT_COLUMNS = {
+    "id": User.id,
+    "name": User.name,
+    "email": User.email,
+}
+
+
+def _encode_users_cursor(sort: str, value, user_id: int) -> str:
+    raw = json.dumps([sort, value, user_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_users_cursor(cursor: str, sort: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        cursor_sort, value, user_id = json.loads(raw)
+        user_id = int(user_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match sort")
+    return value, user_id
+
+
+def _like_prefix(text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _list_users(
+    db: Session,
+    limit: int = DEFAULT_USERS_PAGE,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = "id",
+    order: str = "asc",
+) -> dict:
+    """
+    One page of users for the admin dashboard.
+
+    `q` matches a prefix of name, email or phone number, each served by its
+    own index. Keyset-paginated on (sort column, id): pass next_cursor back
+    to continue after the last row. The unfiltered total comes from the
+    users stat counter; a search counts at most USER_SEARCH_COUNT_CAP
+    matches (total_exact is false beyond that).
+    """
+    from models.stat_counter import read_counters
+
+    column = USER_SORT_COLUMNS[sort]
+    limit = max(1, min(limit, MAX_USERS_PAGE))
+    q = (q or "").strip()
+
+    query = db.query(User.id, User.name, User.email, User.phone_number, User.is_admin, User.created_at)
+    if q:
+        pattern = _like_prefix(q)
+        query = query.filter(or_(
+            User.name.like(pattern, escape="\\"),
+            User.email.like(_like_prefix(q.lower()), escape="\\"),
+            User.phone_number.like(pattern, escape="\\"),
+        ))
+    filtered = query
+
+    descending = order == "desc"
+    if cursor:
+        after_value, after_id = _decode_users_cursor(cursor, sort)
+        if sort == "id":
+            query = query.filter(User.id < after_id if descending else User.id > after_id)
+        elif descending:
+            query = query.filter(or_(column < after_value, and_(column == after_value, User.id < after_id)))
+        else:
+            query = query.filter(or_(column > after_value, and_(column == after_value, User.id > after_id)))
+    if sort == "id":
+        query = query.order_by(User.id.desc() if descending else User.id.asc())
+    elif descending:
+        query = query.order_by(column.desc(), User.id.desc())
+    else:
+        query = query.order_by(column.asc(), User.id.asc())
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_users_cursor(sort, getattr(last, column.key), last.id)
+
+    if q:
+        matches = filtered.with_entities(User.id).limit(USER_SEARCH_COUNT_CAP + 1).subquery()
+        total = db.query(func.count()).select_from(matches).scalar()
+        total_exact = total <= USER_SEARCH_COUNT_CAP
+        total = min(total, USER_SEARCH_COUNT_CAP)
+    else:
+        total = read_counters(db, [USERS])[USERS]
+        total_exact = True
+
+    return {
+        "users": [
+            {
+                "id": u.id,
+                "name": u.name,
+                "email": u.email,
+                "phone_number": u.phone_number,
+                "is_admin": bool(u.is_admin),
+                "created_at": u.created_at.isoformat() if u.created_at else None,
+            }
+            for u in rows
+        ],
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_exact": total_exact,
+    }
+
+
 @router.get("/users")
-def get_users(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_users(
+    limit: int = Query(DEFAULT_USERS_PAGE, ge=1, le=MAX_USERS_PAGE),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|name|email)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
     # Only admins may list users
     if not getattr(current_user, 'is_admin', False):
         raise HTTPException(status_code=403, detail="Forbidden: admin access required")
 
-    users = db.query(User).all()
-    return {"users": [{"id": u.id, "name": u.name, "email": u.email, "is_admin": bool(u.is_admin)} for u in users]}
+    return _list_users(db, limit, cursor, q, sort, order)
 
 
 @router.delete("/users/{user_id}")
@@ -130,8 +257,11 @@ def delete_user(user_id: int, current_user: User = Depends(get_current_user), db
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
 
+    email = user.email
     db.delete(user)
+    increment_counters(db, {USERS: -1})
     db.commit()
+    invalidate_user(email)
     return {"message": "User deleted"}
 
 
@@ -153,10 +283,11 @@ def toggle_admin(user_id: int, payload: AdminToggleInput, current_user: User = D
         raise HTTPException(status_code=400, detail="Cannot remove admin privilege from yourself")
 
     user.is_admin = bool(payload.is_admin)
-    db.add(user)
+    response = {"id": user.id, "is_admin": bool(user.is_admin)}
+    email = user.email
     db.commit()
-    db.refresh(user)
-    return {"id": user.id, "is_admin": bool(user.is_admin)}
+    invalidate_user(email)
+    return response
 
 
 @router.get("/me")
@@ -195,19 +326,22 @@ def _update_user_profile(payload: UpdateProfileInput, current_user: User, db: Se
     if phone_taken:
         raise HTTPException(status_code=400, detail="Phone number already registered")
 
+    previous_email = db_user.email
     db_user.name = name
     db_user.email = email
     db_user.phone_number = phone_number
-    db.commit()
-    db.refresh(db_user)
-
-    return {
+    # Build the response before commit expires the instance
+    response = {
         "id": db_user.id,
         "name": db_user.name,
         "email": db_user.email,
         "phone_number": db_user.phone_number,
         "is_admin": bool(db_user.is_admin)
     }
+    db.commit()
+    invalidate_user(previous_email, email)
+
+    return response
 
 
 @router.put("/me")
@@ -220,50 +354,245 @@ def update_me_post(payload: UpdateProfileInput, current_user: User = Depends(get
     return _update_user_profile(payload, current_user, db)
 
 
+# Days of per-day assessment counts returned by /admin/stats
+ADMIN_STATS_DAYS = 30
+
+
 @router.get("/admin/stats")
 def admin_stats(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     # Only admins
     if not getattr(current_user, 'is_admin', False):
         raise HTTPException(status_code=403, detail="Forbidden: admin access required")
 
-    from models.recommendations import DiabetesRecommendation
+    from models.stat_counter import (
+        RECOMMENDATIONS, RISK_RECORDS, risk_day_counter, read_counters, read_counters_with_prefix
+    )
 
-    total_users = db.query(User).count()
-    diabetes_recs = db.query(DiabetesRecommendation).count()
+    # Served from maintained counters: a fixed number of small reads however large the tables grow
+    today = datetime.utcnow().date()
+    days = [today - timedelta(days=offset) for offset in range(ADMIN_STATS_DAYS - 1, -1, -1)]
+    counters = read_counters(db, [USERS, RECOMMENDATIONS, RISK_RECORDS] + [risk_day_counter(day) for day in days])
+    risk_levels = {level: count for level, count in read_counters_with_prefix(db, "risk_level:").items() if count}
 
     return {
-        "total_users": total_users,
-        "total_recommendations": diabetes_recs,
-        "diabetes_recommendations": diabetes_recs
+        "total_users": counters[USERS],
+        "total_recommendations": counters[RECOMMENDATIONS],
+        "diabetes_recommendations": counters[RECOMMENDATIONS],
+        "total_assessments": counters[RISK_RECORDS],
+        "risk_levels": risk_levels,
+        "assessments_per_day": [
+            {"date": day.isoformat(), "count": counters[risk_day_counter(day)]} for day in days
+        ],
     }
 
 
-@router.get("/users/{user_id}/recommendations")
-def get_user_recommendations(user_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get("/admin/db-pool")
+def db_pool_stats(current_user: User = Depends(get_current_user)):
+    # Only admins
+    if not getattr(current_user, 'is_admin', False):
+        raise HTTPException(status_code=403, detail="Forbidden: admin access required")
+
+    from database import engine, async_engine, pool_stats
+
+    stats = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        stats["async"] = pool_stats(async_engine.sync_engine)
+    return stats
+
+
+@router.get("/admin/cache-stats")
+def cache_stats(current_user: User = Depends(get_current_user)):
     # Only admins
     if not getattr(current_user, 'is_admin', False):
         raise HTTPException(status_code=403, detail="Forbidden: admin access required")
 
-    from models.recommendations import DiabetesRecommendation
-
-    dia_rows = db.query(DiabetesRecommendation).filter(DiabetesRecommendation.user_id == user_id).order_by(DiabetesRecommendation.created_at.desc()).all()
-
-    def serialize(rows):
-        out = []
-        for r in rows:
-            try:
-                created = r.created_at.isoformat() if r.created_at else None
-            except Exception:
-                created = str(r.created_at)
-            out.append({
-                "id": r.id,
-                "risk_score": getattr(r, 'risk_score', None),
-                "risk_level": getattr(r, 'risk_level', None),
-                "recommendations": getattr(r, 'recommendations', None),
-                "created_at": created
-            })
-        return out
+    from translation import translation_cache_stats, skeleton_cache_stats
 
     return {
-        "diabetes": serialize(dia_rows)
+        "auth": auth_cache_stats(),
+        "translation": translation_cache_stats(),
+        "report_skeletons": skeleton_cache_stats(),
     }
+
+
+# ---------- ADMIN RECOMMENDATION HISTORY ----------
+DEFAULT_HISTORY_PAGE = 20
+MAX_HISTORY_PAGE = 200
+
+
+def _encode_history_cursor(created_at: datetime, rec_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{rec_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_history_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, rec_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(rec_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _get_recommendation_history(
+    db: Session,
+    user_id: int,
+    limit: int = DEFAULT_HISTORY_PAGE,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+) -> dict:
+    """
+    One page of a user's recommendation history, newest first.
+
+    Keyset-paginated on (created_at, id) over the (user_id, created_at)
+    index: pass next_cursor back to continue after the last row. With
+    summary=True the recommendation lists are not read at all.
+    """
+    from models.recommendations import DiabetesRecommendation, RecommendationSet, fill_recommendations
+
+    limit = max(1, min(limit, MAX_HISTORY_PAGE))
+    columns = [
+        DiabetesRecommendation.id,
+        DiabetesRecommendation.risk_score,
+        DiabetesRecommendation.risk_level,
+        DiabetesRecommendation.created_at,
+    ]
+    if summary:
+        query = db.query(*columns)
+    else:
+        # Shared sets are joined in; rows not yet migrated still carry their inline copy
+        query = db.query(
+            *columns,
+            DiabetesRecommendation.glucose_value,
+            func.coalesce(RecommendationSet.recommendations, DiabetesRecommendation.recommendations).label("recommendations"),
+        ).outerjoin(
+            RecommendationSet, RecommendationSet.content_hash == DiabetesRecommendation.recommendation_set_hash
+        )
+    query = query.filter(DiabetesRecommendation.user_id == user_id)
+
+    if cursor:
+        after_created, after_id = _decode_history_cursor(cursor)
+        query = query.filter(or_(
+            DiabetesRecommendation.created_at < after_created,
+            and_(DiabetesRecommendation.created_at == after_created, DiabetesRecommendation.id < after_id),
+        ))
+    query = query.order_by(DiabetesRecommendation.created_at.desc(), DiabetesRecommendation.id.desc())
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_history_cursor(rows[-1].created_at, rows[-1].id)
+
+    items = []
+    for r in rows:
+        item = {
+            "id": r.id,
+            "risk_score": r.risk_score,
+            "risk_level": r.risk_level,
+            "created_at": r.created_at.isoformat() if r.created_at else None
+        }
+        if not summary:
+            item["recommendations"] = fill_recommendations(r.recommendations, r.glucose_value)
+        items.append(item)
+
+    return {
+        "diabetes": items,
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/users/{user_id}/recommendations")
+def get_user_recommendations(
+    user_id: int,
+    limit: int = Query(DEFAULT_HISTORY_PAGE, ge=1, le=MAX_HISTORY_PAGE),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Only admins
+    if not getattr(current_user, 'is_admin', False):
+        raise HTTPException(status_code=403, detail="Forbidden: admin access required")
+
+    return _get_recommendation_history(db, user_id, limit, cursor, summary)
+
+
+# ---------- ASYNC VARIANTS (USE_ASYNC_DB) ----------
+# The handlers above only touch the session they are given, so the async
+# routes run them unchanged on the async session's connection via run_sync.
+
+@async_router.post("/register")
+async def register_async(data: RegisterInput, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: register(data, session))
+
+
+@async_router.post("/login")
+async def login_async(data: LoginInput, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: login(data, session))
+
+
+@async_router.get("/users")
+async def get_users_async(
+    limit: int = Query(DEFAULT_USERS_PAGE, ge=1, le=MAX_USERS_PAGE),
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|name|email)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(lambda session: get_users(limit, cursor, q, sort, order, current_user, session))
+
+
+@async_router.delete("/users/{user_id}")
+async def delete_user_async(user_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: delete_user(user_id, current_user, session))
+
+
+@async_router.post("/users/{user_id}/admin-toggle")
+async def toggle_admin_async(user_id: int, payload: AdminToggleInput, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: toggle_admin(user_id, payload, current_user, session))
+
+
+@async_router.get("/me")
+async def get_me_async(current_user: User = Depends(get_current_user_async)):
+    return get_me(current_user)
+
+
+@async_router.put("/me")
+async def update_me_put_async(payload: UpdateProfileInput, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: _update_user_profile(payload, current_user, session))
+
+
+@async_router.post("/me")
+async def update_me_post_async(payload: UpdateProfileInput, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: _update_user_profile(payload, current_user, session))
+
+
+@async_router.get("/admin/stats")
+async def admin_stats_async(current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(lambda session: admin_stats(current_user, session))
+
+
+@async_router.get("/admin/db-pool")
+async def db_pool_stats_async(current_user: User = Depends(get_current_user_async)):
+    return db_pool_stats(current_user)
+
+
+@async_router.get("/admin/cache-stats")
+async def cache_stats_async(current_user: User = Depends(get_current_user_async)):
+    return cache_stats(current_user)
+
+
+@async_router.get("/users/{user_id}/recommendations")
+async def get_user_recommendations_async(
+    user_id: int,
+    limit: int = Query(DEFAULT_HISTORY_PAGE, ge=1, le=MAX_HISTORY_PAGE),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(lambda session: get_user_recommendations(user_id, limit, cursor, summary, current_user, session))
@@ -0,0 +1,406 @@
+import base64
+import math
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth.auth_utils import get_db, get_current_user, get_current_user_async, get_async_db
+from models.user import User
+from models.user_metrics_rollup import RECENT_GLUCOSE_POINTS, UserMetricsRollup, locked_rollup
+
+router = APIRouter()
+async_router = APIRouter()
+
+
+def _create_user_metrics(db: Session, metrics_data: dict, user_id: int) -> dict:
+    from models.user_metrics import UserMetrics
+    
+    # Whitelist accepted fields to avoid passing unexpected keys (e.g., 'diabetes')
+    allowed_fields = {
+        'user_id', 'disease_type',
+        # diabetes fields
+        'glucose_value', 'measurement_context', 'trend', 'symptoms', 'medication_type', 'meal_type', 'diabetes_status',
+        # common fields
+        'age', 'weight_kg', 'height_cm', 'physical_activity', 'family_history'
+    }
+
+    filtered = {k: v for k, v in metrics_data.items() if k in allowed_fields}
+
+    # Force the user_id to be the authenticated user to enforce relationships
+    filtered['user_id'] = user_id
+
+    # Normalize some common types
+    if 'family_history' in filtered:
+        # Accept 0/1 or booleans
+        if isinstance(filtered['family_history'], int):
+            filtered['family_history'] = bool(filtered['family_history'])
+
+    # If disease_type not provided, attempt to infer from available keys
+    if 'disease_type' not in filtered:
+        if 'glucose_value' in filtered:
+            filtered['disease_type'] = 'diabetes'
+        else:
+            filtered['disease_type'] = 'unknown'
+
+    db_metrics = UserMetrics(**filtered)
+    db.add(db_metrics)
+    db.flush()
+    metric_id = db_metrics.metric_id
+
+    # Same transaction as the insert, so the rollup never drifts from the rows
+    locked_rollup(db, user_id, db_metrics.disease_type).apply_metric(db_metrics)
+    db.commit()
+    return {"message": "Metrics created", "metric_id": metric_id}
+
+
+# Serialized fields of GET /user-metrics, in response order
+_METRIC_BASE_FIELDS = ("metric_id", "user_id", "disease_type", "created_at", "timestamp")
+_METRIC_DIABETES_FIELDS = (
+    "glucose_value", "measurement_context", "trend", "symptoms",
+    "medication_type", "meal_type", "diabetes_status",
+)
+_METRIC_COMMON_FIELDS = ("age", "weight_kg", "height_cm", "physical_activity", "family_history")
+METRIC_FIELDS = _METRIC_BASE_FIELDS + _METRIC_DIABETES_FIELDS + _METRIC_COMMON_FIELDS
+
+DEFAULT_METRICS_PAGE = 100
+MAX_METRICS_PAGE = 1000
+
+
+def _encode_metrics_cursor(created_at: Optional[datetime], metric_id: int) -> str:
+    # Legacy rows may have no created_at; it encodes as an empty field
+    raw = f"{created_at.isoformat() if created_at else ''}|{metric_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_metrics_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, metric_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(metric_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_metrics_cursor(created_at, metric_id, after_created: Optional[datetime], after_id: int, descending: bool):
+    """
+    Rows past the cursor row in (created_at, metric_id) order, where rows
+    with no created_at count as older than any dated row.
+    """
+    if after_created is None:
+        same_key = and_(created_at.is_(None), metric_id < after_id if descending else metric_id > after_id)
+        return same_key if descending else or_(created_at.isnot(None), same_key)
+    if descending:
+        return or_(
+            created_at < after_created,
+            and_(created_at == after_created, metric_id < after_id),
+            created_at.is_(None),
+        )
+    return or_(created_at > after_created, and_(created_at == after_created, metric_id > after_id))
+
+
+def _metrics_order(db: Session, created_at, metric_id, descending: bool) -> tuple:
+    """ORDER BY for the keyset, undated rows oldest on every dialect."""
+    if descending:
+        order = (created_at.desc(), metric_id.desc())
+    else:
+        order = (created_at.asc(), metric_id.asc())
+    # MySQL and SQLite already sort NULL lowest, and MySQL has no NULLS FIRST/LAST
+    if db.get_bind().dialect.name not in ("mysql", "sqlite"):
+        order = (order[0].nulls_last() if descending else order[0].nulls_first(), order[1])
+    return order
+
+
+def _naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    # created_at is stored as naive UTC
+    if dt is not None and dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _parse_metric_fields(fields: Optional[str]) -> tuple:
+    if not fields:
+        return METRIC_FIELDS
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(METRIC_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in METRIC_FIELDS if f in requested)
+
+
+def _get_user_metrics(
+    db: Session,
+    user_id: Optional[int],
+    disease_type: Optional[str],
+    current_user_id: int,
+    limit: int = DEFAULT_METRICS_PAGE,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    order: str = "desc",
+    fields: Optional[str] = None,
+) -> tuple:
+    """
+    One page of a user's metrics, newest first unless order="asc".
+
+    Keyset-paginated on (created_at, metric_id): pass the returned cursor
+    back to continue after the last row. Legacy rows with no created_at
+    sort as the oldest. Only the columns behind `fields`
+    are selected. Returns (rows, next_cursor); next_cursor is None on the
+    last page.
+    """
+    from models.user_metrics import UserMetrics
+    
+    # Ensure the caller is only fetching their own metrics (unless user_id is omitted)
+    if user_id is None:
+        user_id = current_user_id
+    elif user_id != current_user_id:
+        raise HTTPException(status_code=403, detail="Forbidden: cannot access other user's metrics")
+
+    wanted = _parse_metric_fields(fields)
+    limit = max(1, min(limit, MAX_METRICS_PAGE))
+
+    # Keyset and disease gating columns are always read; the rest only on request
+    column_names = ["metric_id", "created_at", "disease_type"]
+    column_names += [f for f in wanted if f not in column_names and f != "timestamp"]
+    query = db.query(*(getattr(UserMetrics, name) for name in column_names)).filter(UserMetrics.user_id == user_id)
+    if disease_type:
+        query = query.filter(UserMetrics.disease_type == disease_type)
+    if since is not None:
+        query = query.filter(UserMetrics.created_at >= _naive_utc(since))
+    if until is not None:
+        query = query.filter(UserMetrics.created_at < _naive_utc(until))
+
+    descending = order == "desc"
+    if cursor:
+        after_created, after_id = _decode_metrics_cursor(cursor)
+        query = query.filter(_after_metrics_cursor(
+            UserMetrics.created_at, UserMetrics.metric_id, _naive_utc(after_created), after_id, descending
+        ))
+    query = query.order_by(*_metrics_order(db, UserMetrics.created_at, UserMetrics.metric_id, descending))
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_metrics_cursor(rows[-1].created_at, rows[-1].metric_id)
+
+    diabetes_fields = set(_METRIC_DIABETES_FIELDS)
+    result = []
+    for m in rows:
+        # Ensure created_at is serialized consistently (ISO string) and provide an epoch timestamp (ms)
+        created_at_iso = None
+        created_at_ts = None
+        if m.created_at:
+            # Assume stored datetimes are UTC (naive). Make timezone-aware UTC before serializing.
+            dt = m.created_at
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            created_at_iso = dt.isoformat()
+            # milliseconds since epoch
+            created_at_ts = int(dt.timestamp() * 1000)
+
+        metric_dict = {}
+        for name in wanted:
+            # Disease-specific fields only apply to diabetes rows
+            if name in diabetes_fields and m.disease_type != "diabetes":
+                continue
+            if name == "created_at":
+                metric_dict[name] = created_at_iso
+            elif name == "timestamp":
+                metric_dict[name] = created_at_ts
+            else:
+                metric_dict[name] = getattr(m, name)
+        result.append(metric_dict)
+    
+    return result, next_cursor
+
+
+def _iso_utc(dt: Optional[datetime]) -> Optional[str]:
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+def _bmi(weight_kg, height_cm) -> Optional[float]:
+    if not weight_kg or not height_cm:
+        return None
+    return round(weight_kg / (height_cm / 100) ** 2, 1)
+
+
+def _summary_payload(readings: int, avg_glucose: Optional[float], latest, trend: list) -> dict:
+    """
+    Dashboard payload from pre-aggregated values. `latest` carries the
+    newest entry's glucose/weight/height/status/created_at; `trend` is the
+    last few glucose readings as (glucose, created_at, weight_kg, height_cm),
+    oldest first.
+    """
+    # Whole mg/dL, rounding halves up like the dashboard always has
+    avg_glucose = int(math.floor(float(avg_glucose) + 0.5)) if readings else None
+    # ADAG estimate from mean glucose
+    hba1c = round((avg_glucose + 46.7) / 28.7, 1) if avg_glucose is not None else None
+
+    return {
+        "readings": readings,
+        "latest_at": _iso_utc(latest["created_at"]) if latest else None,
+        "latest_glucose": latest["glucose_value"] if latest else None,
+        "avg_glucose": avg_glucose,
+        "hba1c": hba1c,
+        "diabetes_status": latest["diabetes_status"] if latest else None,
+        "weight_kg": latest["weight_kg"] if latest else None,
+        "height_cm": latest["height_cm"] if latest else None,
+        "bmi": _bmi(latest["weight_kg"], latest["height_cm"]) if latest else None,
+        # Oldest first, ready to plot
+        "glucose_trend": [
+            {"glucose": glucose, "date": _iso_utc(created_at), "bmi": _bmi(weight_kg, height_cm)}
+            for glucose, created_at, weight_kg, height_cm in trend
+        ],
+    }
+
+
+def _summary_from_rollup(rollup: UserMetricsRollup) -> dict:
+    latest = {
+        "glucose_value": rollup.latest_glucose,
+        "weight_kg": rollup.latest_weight_kg,
+        "height_cm": rollup.latest_height_cm,
+        "diabetes_status": rollup.latest_diabetes_status,
+        "created_at": rollup.latest_metric_at,
+    }
+    trend = [
+        (point["glucose"], datetime.fromisoformat(point["created_at"]) if point["created_at"] else None,
+         point["weight_kg"], point["height_cm"])
+        for point in rollup.recent_glucose or []
+    ]
+    readings = rollup.glucose_count or 0
+    avg_glucose = rollup.glucose_sum / readings if readings else None
+    return _summary_payload(readings, avg_glucose, latest, trend)
+
+
+def _summary_from_metrics(db: Session, user_id: int) -> dict:
+    """Same payload aggregated from user_metrics, for users with no rollup yet."""
+    from models.user_metrics import UserMetrics
+
+    diabetes_rows = (UserMetrics.user_id == user_id, UserMetrics.disease_type == "diabetes")
+
+    readings, avg_glucose = db.query(
+        func.count(UserMetrics.glucose_value), func.avg(UserMetrics.glucose_value)
+    ).filter(*diabetes_rows).one()
+
+    latest = db.query(
+        UserMetrics.glucose_value,
+        UserMetrics.weight_kg,
+        UserMetrics.height_cm,
+        UserMetrics.diabetes_status,
+        UserMetrics.created_at,
+    ).filter(*diabetes_rows).order_by(UserMetrics.created_at.desc(), UserMetrics.metric_id.desc()).first()
+
+    recent = db.query(
+        UserMetrics.glucose_value, UserMetrics.created_at, UserMetrics.weight_kg, UserMetrics.height_cm
+    ).filter(*diabetes_rows, UserMetrics.glucose_value.isnot(None)).order_by(
+        UserMetrics.created_at.desc(), UserMetrics.metric_id.desc()
+    ).limit(RECENT_GLUCOSE_POINTS).all()
+
+    return _summary_payload(readings, avg_glucose, latest._asdict() if latest else None, list(reversed(recent)))
+
+
+def _get_dashboard_summary(db: Session, user_id: int) -> dict:
+    """
+    Aggregates behind the health dashboard, in a payload that stays the
+    same size however long the user's history is: latest and average
+    glucose, estimated HbA1c, BMI from the latest entry, the last few
+    glucose readings for the trend chart, the risk score trend and the
+    number of risk assessments. Served from the user's rollup row; users
+    whose rollup has not been built yet are aggregated from user_metrics
+    and diabetes_risk_records.
+    """
+    rollup = db.get(UserMetricsRollup, (user_id, "diabetes"))
+    if rollup is not None and rollup.metric_count:
+        summary = _summary_from_rollup(rollup)
+    else:
+        summary = _summary_from_metrics(db, user_id)
+
+    summary["risk"] = None
+    if rollup is not None and rollup.total_assessments:
+        summary["risk"] = rollup.to_metrics_input().model_dump(mode="json", exclude={"user_id", "disease_type"})
+
+    if rollup is not None:
+        summary["total_assessments"] = rollup.total_assessments or 0
+    else:
+        from models.diabetes_db_model import DiabetesRiskRecord
+
+        summary["total_assessments"] = db.query(func.count(DiabetesRiskRecord.record_id)).filter(
+            DiabetesRiskRecord.user_id == user_id
+        ).scalar()
+    return summary
+
+
+@router.post("/user-metrics")
+def create_user_metrics(metrics_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _create_user_metrics(db, metrics_data, current_user.id)
+
+
+@router.get("/user-metrics")
+def get_user_metrics(
+    response: Response,
+    user_id: int = None,
+    disease_type: str = None,
+    limit: int = Query(DEFAULT_METRICS_PAGE, ge=1, le=MAX_METRICS_PAGE),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    metrics, next_cursor = _get_user_metrics(db, user_id, disease_type, current_user.id, limit, cursor, since, until, order, fields)
+    # The body stays a plain list; the next page is advertised in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return metrics
+
+
+@router.get("/dashboard-summary")
+def get_dashboard_summary(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _get_dashboard_summary(db, current_user.id)
+
+
+# ---------- ASYNC VARIANTS (USE_ASYNC_DB) ----------
+
+@async_router.post("/user-metrics")
+async def create_user_metrics_async(metrics_data: dict, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_create_user_metrics, metrics_data, user_id)
+
+
+@async_router.get("/user-metrics")
+async def get_user_metrics_async(
+    response: Response,
+    user_id: int = None,
+    disease_type: str = None,
+    limit: int = Query(DEFAULT_METRICS_PAGE, ge=1, le=MAX_METRICS_PAGE),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    current_user_id = current_user.id
+    metrics, next_cursor = await db.run_sync(
+        _get_user_metrics, user_id, disease_type, current_user_id, limit, cursor, since, until, order, fields
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return metrics
+
+
+@async_router.get("/dashboard-summary")
+async def get_dashboard_summary_async(current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_get_dashboard_summary, user_id)
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth.auth_utils import get_db, get_current_user, get_current_user_async, get_async_db
+from models.user import User
+
+router = APIRouter()
+async_router = APIRouter()
+
+
+def _add_diabetes_recommendations(db: Session, risk_data: dict, user_id: int, lang: str = "en") -> dict:
+    """Generate recommendations and add their history row; the caller commits."""
+    from recommendations.diabetes_recommendations import diabetes_recommendation_skeleton, generate_diabetes_recommendations
+    from models.recommendations import DiabetesRecommendation, store_recommendation_set
+    from models.stat_counter import RECOMMENDATIONS, increment_counters
+    from translation.catalog import served_language
+
+    # History is stored in English; the response uses the pre-translated catalog
+    recommendations = generate_diabetes_recommendations(risk_data, lang)
+
+    # Store in database: the English sentences with {glucose_value} left open
+    # are shared by every reading in the same bucket; the value goes on the row
+    skeleton, glucose_value = diabetes_recommendation_skeleton(risk_data)
+    db_recommendation = DiabetesRecommendation(
+        user_id=user_id,
+        risk_score=risk_data.get("risk_score", 0),
+        risk_level=risk_data.get("risk_level", "Unknown"),
+        recommendation_set_hash=store_recommendation_set(db, list(skeleton.texts)),
+        glucose_value=glucose_value
+    )
+    db.add(db_recommendation)
+    increment_counters(db, {RECOMMENDATIONS: 1})
+
+    return {
+        "risk_score": risk_data.get("risk_score"),
+        "risk_level": risk_data.get("risk_level"),
+        "recommendations": recommendations,
+        "lang": served_language(lang)
+    }
+
+
+def _create_diabetes_recommendations(db: Session, risk_data: dict, user_id: int, lang: str = "en") -> dict:
+    response = _add_diabetes_recommendations(db, risk_data, user_id, lang)
+    db.commit()
+    return response
+
+
+@router.post("/diabetes-recommendations")
+def get_diabetes_recommendations(risk_data: dict, lang: str = "en", current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _create_diabetes_recommendations(db, risk_data, current_user.id, lang)
+
+
+# ---------- ASYNC VARIANTS (USE_ASYNC_DB) ----------
+
+@async_router.post("/diabetes-recommendations")
+async def get_diabetes_recommendations_async(risk_data: dict, lang: str = "en", current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_create_diabetes_recommendations, risk_data, user_id, lang)
@@ -1,16 +1,184 @@
+from datetime import datetime
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from models.diabetes_model import RiskInput
 from risk_calculator.diabetes_risk_calculator import calculate_risk_score
-from auth.auth_utils import get_current_user
+from risk_calculator.batch_risk_calculator import calculate_risk_scores, expand_risk_results, RISK_INPUT_FIELDS
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth.auth_utils import get_db, get_current_user, get_current_user_async, get_async_db
 from models.user import User
+from models.user_metrics_rollup import locked_rollup
+from models.stat_counter import increment_counters, risk_record_deltas
 
 router = APIRouter()
+async_router = APIRouter()
 
-@router.post("/diabetes-risk")
-def calculate_risk(data: RiskInput, current_user: User = Depends(get_current_user)):
-    from database import SessionLocal
+
+def _score_record(record) -> dict:
+    return calculate_risk_score(
+        glucose_value=record.glucose_value,
+        measurement_context=record.measurement_context,
+        trend=record.trend,
+        symptoms=record.symptoms,
+        medication_type=record.medication_type,
+        meal_type=record.meal_type,
+        diabetes_status=record.diabetes_status,
+        age=record.age,
+        weight_kg=record.weight_kg,
+        height_cm=record.height_cm,
+        family_history=record.family_history,
+        physical_activity=record.physical_activity
+    )
+
+
+def _build_record(data: RiskInput, result: dict, user_id: int, **extra):
+    from models.diabetes_db_model import DiabetesRiskRecord
+
+    return DiabetesRiskRecord(
+        user_id=user_id,
+        glucose_value=data.glucose_value,
+        measurement_context=data.measurement_context,
+        trend=data.trend,
+        symptoms=data.symptoms,
+        medication_type=data.medication_type,
+        meal_type=data.meal_type,
+        age=data.age,
+        weight_kg=data.weight_kg,
+        height_cm=data.height_cm,
+        bmi=result["derived_metrics"]["bmi"],
+        bmi_category=result["derived_metrics"]["bmi_category"],
+        diabetes_status=data.diabetes_status,
+        family_history=data.family_history,
+        physical_activity=data.physical_activity,
+        risk_score=result["risk_score"],
+        risk_level=result["risk_level"],
+        **result["breakdown"],
+        **result["percentage_breakdown"],
+        **extra
+    )
+
+
+def _stored_result(record) -> dict:
+    """
+    Rebuild the parts of a risk result that comparisons need from the
+    columns persisted on a DiabetesRiskRecord. Rows written before the
+    breakdown columns existed (and not yet backfilled) are rescored.
+    """
+    if record.immediate_glycemic_percentage is None:
+        return _score_record(record)
+    return {
+        "risk_score": record.risk_score,
+        "risk_level": record.risk_level,
+        "derived_metrics": {
+            "bmi": record.bmi,
+            "bmi_category": record.bmi_category
+        },
+        "breakdown": {
+            "immediate_glycemic_risk": record.immediate_glycemic_risk,
+            "treatment_symptom_risk": record.treatment_symptom_risk,
+            "baseline_vulnerability_risk": record.baseline_vulnerability_risk
+        },
+        "percentage_breakdown": {
+            "immediate_glycemic_percentage": record.immediate_glycemic_percentage,
+            "treatment_symptom_percentage": record.treatment_symptom_percentage,
+            "baseline_vulnerability_percentage": record.baseline_vulnerability_percentage
+        }
+    }
+
+
+def _build_comparison(prev_record, prev_result: dict, curr_record, result: dict) -> dict:
+    """
+    Explain how `curr_record` moved relative to `prev_record`.
+
+    Both records only need the risk input attributes plus `record_id` and
+    `created_at` on the previous one, so persisted rows and not-yet-committed
+    batch items can be compared the same way.
+    """
+    # Compute delta and direction
+    prev_score = prev_result.get("risk_score", 0)
+    curr_score = result.get("risk_score", 0)
+    delta = curr_score - prev_score
+    direction = "no_change"
+    if delta > 0:
+        direction = "increased"
+    elif delta < 0:
+        direction = "decreased"
+
+    # Compare percentage breakdowns to find largest contributor to change
+    curr_pct = result.get("percentage_breakdown", {})
+    prev_pct = prev_result.get("percentage_breakdown", {})
+    pct_diffs = {}
+    for k in ["immediate_glycemic_percentage", "treatment_symptom_percentage", "baseline_vulnerability_percentage"]:
+        pct_diffs[k] = (curr_pct.get(k, 0) - prev_pct.get(k, 0))
+
+    # Pick the component with largest absolute change
+    top_component = max(pct_diffs.keys(), key=lambda x: abs(pct_diffs[x])) if pct_diffs else None
+
+    # Build human-readable reason bullets
+    reasons = []
+    # 1) top component summary
+    comp_map = {
+        "immediate_glycemic_percentage": "blood glucose factors",
+        "treatment_symptom_percentage": "treatment & symptoms",
+        "baseline_vulnerability_percentage": "baseline vulnerability"
+    }
+    if top_component:
+        diff_val = round(pct_diffs[top_component], 1)
+        if diff_val > 0:
+            reasons.append(f"Primary driver: {comp_map.get(top_component, top_component)} increased by {diff_val} percentage points compared to the previous assessment.")
+        elif diff_val < 0:
+            reasons.append(f"Primary driver: {comp_map.get(top_component, top_component)} decreased by {abs(diff_val)} percentage points compared to the previous assessment.")
+
+    # 2) Specific input-level changes
+    # Glucose
+    try:
+        prev_gl = prev_record.glucose_value
+        curr_gl = curr_record.glucose_value
+        if prev_gl is not None and curr_gl is not None and curr_gl != prev_gl:
+            if curr_gl > prev_gl:
+                reasons.append(f"Your blood glucose rose from {prev_gl} to {curr_gl} mg/dL which increases immediate glycemic risk.")
+            else:
+                reasons.append(f"Your blood glucose fell from {prev_gl} to {curr_gl} mg/dL which reduces immediate glycemic risk.")
+    except Exception:
+        pass
+
+    # Trend, symptoms, medication, meal_type
+    for attr in ["trend", "symptoms", "medication_type", "meal_type", "physical_activity"]:
+        try:
+            prev_val = getattr(prev_record, attr)
+            curr_val = getattr(curr_record, attr)
+            if prev_val != curr_val:
+                reasons.append(f"{attr.replace('_', ' ').capitalize()} changed from '{prev_val}' to '{curr_val}', affecting risk.")
+        except Exception:
+            continue
+
+    # BMI change
+    try:
+        prev_bmi = prev_result.get("derived_metrics", {}).get("bmi")
+        curr_bmi = result.get("derived_metrics", {}).get("bmi")
+        if prev_bmi and curr_bmi and round(prev_bmi,1) != round(curr_bmi,1):
+            if curr_bmi > prev_bmi:
+                reasons.append(f"BMI increased from {prev_bmi} to {curr_bmi}, which raises baseline vulnerability.")
+            else:
+                reasons.append(f"BMI decreased from {prev_bmi} to {curr_bmi}, which reduces baseline vulnerability.")
+    except Exception:
+        pass
+
+    return {
+        "previous_record_id": prev_record.record_id,
+        "previous_created_at": prev_record.created_at.isoformat() if prev_record.created_at else None,
+        "previous_risk_score": prev_score,
+        "current_risk_score": curr_score,
+        "delta": delta,
+        "direction": direction,
+        "reasons": reasons
+    }
+
+def _record_risk(db: Session, data: RiskInput, user_id: int) -> dict:
+    """Score `data` and add its record (and rollup update); the caller commits."""
     from models.diabetes_db_model import DiabetesRiskRecord
-    
+
     # Calculate risk score
     result = calculate_risk_score(
         glucose_value=data.glucose_value,
@@ -26,145 +194,146 @@ def calculate_risk(data: RiskInput, current_user: User = Depends(get_current_use
         family_history=data.family_history,
         physical_activity=data.physical_activity
     )
-    
-    # Store in database
-    db = SessionLocal()
+
+    # Previous record is read first so the whole request stays in one
+    # transaction on one connection (commit releases it back to the pool)
+    prev_record = None
     try:
-        # Persist with the authenticated user's id to enforce ownership
-        db_record = DiabetesRiskRecord(
-            user_id=current_user.id,
-            glucose_value=data.glucose_value,
-            measurement_context=data.measurement_context,
-            trend=data.trend,
-            symptoms=data.symptoms,
-            medication_type=data.medication_type,
-            meal_type=data.meal_type,
-            age=data.age,
-            weight_kg=data.weight_kg,
-            height_cm=data.height_cm,
-            bmi=result["derived_metrics"]["bmi"],
-            bmi_category=result["derived_metrics"]["bmi_category"],
-            diabetes_status=data.diabetes_status,
-            family_history=data.family_history,
-            physical_activity=data.physical_activity,
-            risk_score=result["risk_score"],
-            risk_level=result["risk_level"]
-        )
-        db.add(db_record)
-        db.commit()
-        db.refresh(db_record)
-    finally:
-        db.close()
-    
+        prev_record = db.query(DiabetesRiskRecord).filter(
+            DiabetesRiskRecord.user_id == user_id
+        ).order_by(DiabetesRiskRecord.created_at.desc(), DiabetesRiskRecord.record_id.desc()).first()
+    except Exception:
+        pass
+
+    # Persist with the authenticated user's id to enforce ownership
+    db_record = _build_record(data, result, user_id)
+    db.add(db_record)
+    db.flush()
+
     result["record_id"] = db_record.record_id
+    locked_rollup(db, user_id, "diabetes").apply_assessment(db_record)
+    increment_counters(db, risk_record_deltas([db_record]))
 
     # --- Comparison with previous record (if exists) ---
     try:
-        prev_record = db.query(DiabetesRiskRecord).filter(
-            DiabetesRiskRecord.user_id == current_user.id,
-            DiabetesRiskRecord.record_id != db_record.record_id
-        ).order_by(DiabetesRiskRecord.created_at.desc()).first()
-
         if prev_record:
-            # Recompute risk for previous record using stored snapshot
-            prev_result = calculate_risk_score(
-                glucose_value=prev_record.glucose_value,
-                measurement_context=prev_record.measurement_context,
-                trend=prev_record.trend,
-                symptoms=prev_record.symptoms,
-                medication_type=prev_record.medication_type,
-                meal_type=prev_record.meal_type,
-                diabetes_status=prev_record.diabetes_status,
-                age=prev_record.age,
-                weight_kg=prev_record.weight_kg,
-                height_cm=prev_record.height_cm,
-                family_history=prev_record.family_history,
-                physical_activity=prev_record.physical_activity
-            )
-
-            # Compute delta and direction
-            prev_score = prev_result.get("risk_score", 0)
-            curr_score = result.get("risk_score", 0)
-            delta = curr_score - prev_score
-            direction = "no_change"
-            if delta > 0:
-                direction = "increased"
-            elif delta < 0:
-                direction = "decreased"
-
-            # Compare percentage breakdowns to find largest contributor to change
-            curr_pct = result.get("percentage_breakdown", {})
-            prev_pct = prev_result.get("percentage_breakdown", {})
-            pct_diffs = {}
-            for k in ["immediate_glycemic_percentage", "treatment_symptom_percentage", "baseline_vulnerability_percentage"]:
-                pct_diffs[k] = (curr_pct.get(k, 0) - prev_pct.get(k, 0))
-
-            # Pick the component with largest absolute change
-            top_component = max(pct_diffs.keys(), key=lambda x: abs(pct_diffs[x])) if pct_diffs else None
-
-            # Build human-readable reason bullets
-            reasons = []
-            # 1) top component summary
-            comp_map = {
-                "immediate_glycemic_percentage": "blood glucose factors",
-                "treatment_symptom_percentage": "treatment & symptoms",
-                "baseline_vulnerability_percentage": "baseline vulnerability"
-            }
-            if top_component:
-                diff_val = round(pct_diffs[top_component], 1)
-                if diff_val > 0:
-                    reasons.append(f"Primary driver: {comp_map.get(top_component, top_component)} increased by {diff_val} percentage points compared to the previous assessment.")
-                elif diff_val < 0:
-                    reasons.append(f"Primary driver: {comp_map.get(top_component, top_component)} decreased by {abs(diff_val)} percentage points compared to the previous assessment.")
-
-            # 2) Specific input-level changes
-            # Glucose
-            try:
-                prev_gl = prev_record.glucose_value
-                curr_gl = db_record.glucose_value
-                if prev_gl is not None and curr_gl is not None and curr_gl != prev_gl:
-                    if curr_gl > prev_gl:
-                        reasons.append(f"Your blood glucose rose from {prev_gl} to {curr_gl} mg/dL which increases immediate glycemic risk.")
-                    else:
-                        reasons.append(f"Your blood glucose fell from {prev_gl} to {curr_gl} mg/dL which reduces immediate glycemic risk.")
-            except Exception:
-                pass
+            prev_result = _stored_result(prev_record)
+            result["comparison"] = _build_comparison(prev_record, prev_result, db_record, result)
+    except Exception:
+        # Comparison is optional; failures shouldn't block the main response
+        pass
+
+    return result
+
+
+def _calculate_risk(db: Session, data: RiskInput, user_id: int) -> dict:
+    result = _record_risk(db, data, user_id)
+    db.commit()
+    return result
+
+
+def _assess_diabetes(db: Session, data: RiskInput, user_id: int, lang: str = "en") -> dict:
+    """
+    Score, explain and recommend in one request: the engines share the
+    in-memory risk result, and the risk record, rollup update and
+    recommendation row are committed together.
+    """
+    from ExplanableAI.diabetes_explanation_ai import generate_explanation, generate_summary
+    from api.recommendation_routes import _add_diabetes_recommendations
+
+    result = _record_risk(db, data, user_id)
+    result["summary"] = generate_summary(result, lang)
+    result["explanation"] = generate_explanation(result, lang)
+    recommendations = _add_diabetes_recommendations(db, result, user_id, lang)
+    result["recommendations"] = recommendations["recommendations"]
+    # English when `lang` has no built catalog; the client translates those at runtime
+    result["lang"] = recommendations["lang"]
+
+    db.commit()
+
+    return result
+
+
+# Upper bound on a single kiosk sync; larger uploads should be split client-side
+MAX_BATCH_SIZE = 500
+
+
+def _calculate_risk_batch(db: Session, items: List[RiskInput], user_id: int) -> dict:
+    from models.diabetes_db_model import DiabetesRiskRecord
 
-            # Trend, symptoms, medication, meal_type
-            for attr in ["trend", "symptoms", "medication_type", "meal_type", "physical_activity"]:
-                try:
-                    prev_val = getattr(prev_record, attr)
-                    curr_val = getattr(db_record, attr)
-                    if prev_val != curr_val:
-                        reasons.append(f"{attr.replace('_', ' ').capitalize()} changed from '{prev_val}' to '{curr_val}', affecting risk.")
-                except Exception:
-                    continue
-
-            # BMI change
+    if not items:
+        raise HTTPException(status_code=400, detail="At least one assessment is required")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds limit of {MAX_BATCH_SIZE}")
+
+    # Score every item in one vectorized pass
+    columns = {field: [getattr(item, field) for item in items] for field in RISK_INPUT_FIELDS}
+    results = expand_risk_results(columns, calculate_risk_scores(columns))
+
+    # Latest stored record is the baseline for the first item in the batch
+    prev_record = db.query(DiabetesRiskRecord).filter(
+        DiabetesRiskRecord.user_id == user_id
+    ).order_by(DiabetesRiskRecord.created_at.desc(), DiabetesRiskRecord.record_id.desc()).first()
+    prev_result = _stored_result(prev_record) if prev_record else None
+
+    created_at = datetime.utcnow()
+    records = [
+        _build_record(item, result, user_id, created_at=created_at)
+        for item, result in zip(items, results)
+    ]
+    db.add_all(records)
+    # Flush assigns primary keys so comparisons can be built before commit
+    db.flush()
+
+    rollup = locked_rollup(db, user_id, "diabetes")
+    for record, result in zip(records, results):
+        result["record_id"] = record.record_id
+        rollup.apply_assessment(record)
+        if prev_record is not None:
             try:
-                prev_bmi = prev_result.get("derived_metrics", {}).get("bmi")
-                curr_bmi = result.get("derived_metrics", {}).get("bmi")
-                if prev_bmi and curr_bmi and round(prev_bmi,1) != round(curr_bmi,1):
-                    if curr_bmi > prev_bmi:
-                        reasons.append(f"BMI increased from {prev_bmi} to {curr_bmi}, which raises baseline vulnerability.")
-                    else:
-                        reasons.append(f"BMI decreased from {prev_bmi} to {curr_bmi}, which reduces baseline vulnerability.")
+                result["comparison"] = _build_comparison(prev_record, prev_result, record, result)
             except Exception:
                 pass
+        prev_record, prev_result = record, result
+
+    increment_counters(db, risk_record_deltas(records))
+    db.commit()
+
+    return {"count": len(results), "results": results}
+
+
+@router.post("/diabetes-risk")
+def calculate_risk(data: RiskInput, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _calculate_risk(db, data, current_user.id)
+
+
+@router.post("/diabetes-assessment")
+def assess_diabetes(data: RiskInput, lang: str = "en", current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _assess_diabetes(db, data, current_user.id, lang)
+
+
+@router.post("/diabetes-risk/batch")
+def calculate_risk_batch(items: List[RiskInput], current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    return _calculate_risk_batch(db, items, current_user.id)
+
+
+# ---------- ASYNC VARIANTS (USE_ASYNC_DB) ----------
+# Same handlers run on the async session's connection via run_sync, so the
+# event loop is never blocked on the database round-trip.
+
+@async_router.post("/diabetes-risk")
+async def calculate_risk_async(data: RiskInput, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_calculate_risk, data, user_id)
+
+
+@async_router.post("/diabetes-assessment")
+async def assess_diabetes_async(data: RiskInput, lang: str = "en", current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_assess_diabetes, data, user_id, lang)
 
-            comparison = {
-                "previous_record_id": prev_record.record_id,
-                "previous_created_at": prev_record.created_at.isoformat() if prev_record.created_at else None,
-                "previous_risk_score": prev_score,
-                "current_risk_score": curr_score,
-                "delta": delta,
-                "direction": direction,
-                "reasons": reasons
-            }
-
-            result["comparison"] = comparison
-    except Exception:
-        # Comparison is optional; failures shouldn't block the main response
-        pass
 
-    return result
\ No newline at end of file
+@async_router.post("/diabetes-risk/batch")
+async def calculate_risk_batch_async(items: List[RiskInput], current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    user_id = current_user.id
+    return await db.run_sync(_calculate_risk_batch, items, user_id)
@@ -1,21 +1,35 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from deep_translator import GoogleTranslator
+from typing import Annotated
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.orm import Session
+import settings
+from auth.auth_utils import get_db
+from translation import translate_texts as translate_cached
+from translation.service import SOURCE_LANG
 
 router = APIRouter()
 
 class TranslateRequest(BaseModel):
-    texts: list[str]
+    texts: list[Annotated[str, Field(max_length=settings.TRANSLATE_MAX_TEXT_LENGTH)]] = Field(
+        ..., max_length=settings.TRANSLATE_MAX_TEXTS
+    )
     target_lang: str
 
+    @field_validator("target_lang")
+    @classmethod
+    def supported_language(cls, value: str) -> str:
+        # Becomes part of the translation_cache key, so only known codes get that far
+        if value != SOURCE_LANG and value not in settings.TRANSLATION_LANGUAGES:
+            raise ValueError(f"Unsupported target language: {value!r}")
+        return value
+
+# Plain `def`: cache lookups and upstream calls block, so this runs on the threadpool
 @router.post("/translate")
-async def translate_texts(request: TranslateRequest):
+def translate_texts(request: TranslateRequest, db: Session = Depends(get_db)):
     try:
-        translations = []
-        translator = GoogleTranslator(source='en', target=request.target_lang)
-        for text in request.texts:
-            result = translator.translate(text)
-            translations.append(result)
-        return {"translations": translations}
+        translations, error = translate_cached(db, request.texts, request.target_lang)
     except Exception as e:
         return {"error": str(e), "translations": request.texts}
+    if error:
+        return {"error": error, "translations": translations}
+    return {"translations": translations}
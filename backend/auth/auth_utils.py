@@ -4,11 +4,15 @@ from datetime import datetime, timedelta
 from jose import jwt
 import hashlib
 import secrets
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import Generator
-from database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncGenerator, Generator, NamedTuple
+from cache import TTLCache
+from database import SessionLocal, AsyncSessionLocal
 from models.user import User
 
 SECRET_KEY = "supersecretkey"   # move to .env later
@@ -39,6 +43,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 
 def get_db() -> Generator[Session, None, None]:
+    """
+    Request-scoped session. FastAPI caches dependencies per request, so
+    get_current_user and the route body share this one session and the
+    request checks out a single pooled connection.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -46,7 +55,56 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ---------- AUTHENTICATED USER CACHE ----------
+# Per-process caches in front of token decoding and the users lookup.
+# Writes to a user's profile or role call invalidate_user(); other workers
+# pick the change up when USER_CACHE_TTL_SECONDS runs out.
+
+USER_CACHE_TTL_SECONDS = 60
+
+# sha256(token) -> subject, kept until the token's own expiry
+_token_claims_cache = TTLCache(maxsize=10000)
+# email -> CachedUser
+_user_cache = TTLCache(maxsize=10000, ttl=USER_CACHE_TTL_SECONDS)
+
+
+class CachedUser(NamedTuple):
+    """Detached, read-only view of a User row; safe to share across requests."""
+    id: int
+    name: str
+    email: str
+    phone_number: str
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(user.id, user.name, user.email, user.phone_number, bool(user.is_admin))
+
+
+def invalidate_user(*emails: str):
+    for email in emails:
+        if email:
+            _user_cache.pop(email)
+
+
+def auth_cache_stats() -> dict:
+    return {
+        "token_claims": _token_claims_cache.stats(),
+        "users": _user_cache.stats()
+    }
+
+
+def _token_subject(token: str) -> str:
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    email = _token_claims_cache.get(token_key)
+    if email is not None:
+        return email
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -55,8 +113,38 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        _token_claims_cache.set(token_key, email, ttl=expires_in)
+    return email
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CachedUser:
+    email = _token_subject(token)
+
+    cached = _user_cache.get(email)
+    if cached is not None:
+        return cached
+
     user = db.query(User).filter(User.email == email).first()
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
-    
\ No newline at end of file
+    cached = CachedUser.from_user(user)
+    _user_cache.set(email, cached)
+    return cached
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> CachedUser:
+    email = _token_subject(token)
+
+    cached = _user_cache.get(email)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    cached = CachedUser.from_user(user)
+    _user_cache.set(email, cached)
+    return cached
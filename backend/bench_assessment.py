@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Benchmark: POST /diabetes-assessment vs. the three-call assessment flow
+#
+# The old flow posts /diabetes-risk, then sends its result back to
+# /explain-diabetes and /diabetes-recommendations; the combined endpoint
+# does the same work in one request and one transaction. Runs against a
+# throwaway SQLite file (or the database given by --database-url) and
+# reports median and p95 per-assessment latency for each flow.
+#
+#   python bench_assessment.py
+#   python bench_assessment.py --repeat 500 --lang ta
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+RISK_PAYLOAD = {
+    "user_id": 1,
+    "glucose_value": 150,
+    "measurement_context": "fasting",
+    "trend": "stable",
+    "symptoms": "mild",
+    "medication_type": "oral",
+    "meal_type": "balanced",
+    "physical_activity": "sometimes",
+    "diabetes_status": "type2",
+    "age": 50,
+    "weight_kg": 80,
+    "height_cm": 170,
+    "family_history": True,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def timed(fn, repeat):
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_assessment.db")
+    os.environ["USE_ASYNC_DB"] = "false"
+
+    from fastapi.testclient import TestClient
+    import main as app_main
+
+    client = TestClient(app_main.app)
+    credentials = {"email": "bench-assessment@aiassistant.in", "password": "secret1"}
+    client.post("/register", json={"name": "Bench", "phone_number": "900000016", **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"lang": args.lang}
+
+    def payload(i):
+        # Vary the reading so successive assessments are not identical
+        return {**RISK_PAYLOAD, "glucose_value": 90 + i % 160}
+
+    def three_calls(i):
+        risk = client.post("/diabetes-risk", json=payload(i), headers=headers).json()
+        client.post("/explain-diabetes", json=risk, params=params, headers=headers).raise_for_status()
+        client.post("/diabetes-recommendations", json=risk, params=params, headers=headers).raise_for_status()
+
+    def combined(i):
+        client.post("/diabetes-assessment", json=payload(i), params=params, headers=headers).raise_for_status()
+
+    # Warm caches (auth, report skeletons) so both flows are measured hot
+    three_calls(0)
+    combined(0)
+
+    old_median, old_p95 = timed(three_calls, args.repeat)
+    new_median, new_p95 = timed(combined, args.repeat)
+    print(f"three calls          median {old_median:7.2f} ms   p95 {old_p95:7.2f} ms")
+    print(f"/diabetes-assessment median {new_median:7.2f} ms   p95 {new_p95:7.2f} ms")
+    print(f"speedup {old_median / new_median:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+# Benchmark: scalar calculate_risk_score loop vs. vectorized batch scorer
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from risk_calculator.diabetes_risk_calculator import calculate_risk_score
+from risk_calculator.batch_risk_calculator import calculate_risk_scores, RISK_INPUT_FIELDS
+from test_batch_risk_calc import random_inputs
+
+
+def bench(n):
+    inputs = random_inputs(n)
+    rows = [
+        {field: inputs[field][i].item() for field in RISK_INPUT_FIELDS}
+        for i in range(n)
+    ]
+
+    start = time.perf_counter()
+    for row in rows:
+        calculate_risk_score(**row)
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    calculate_risk_scores(inputs)
+    batch_s = time.perf_counter() - start
+
+    print(f"{n:>9,} rows | scalar {scalar_s:8.3f}s | batch {batch_s:8.3f}s | speedup {scalar_s / batch_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    for n in (10_000, 100_000, 1_000_000):
+        bench(n)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+# Benchmark: /dashboard-summary vs. downloading the full metrics history
+#
+# Seeds one user per history length into a throwaway SQLite file (or the
+# database given by --database-url), builds their rollups, and compares
+# response size and latency of the summary endpoint with paging through
+# every GET /user-metrics row, which is what the dashboard used to do.
+#
+#   python bench_dashboard_summary.py
+#   python bench_dashboard_summary.py --sizes 100 10000 --repeat 20
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def seed_metrics(engine, user_id, n):
+    from sqlalchemy import insert
+    from models.user_metrics import UserMetrics
+
+    start = datetime.utcnow() - timedelta(minutes=5 * n)
+    rows = [
+        {
+            "user_id": user_id,
+            "disease_type": "diabetes",
+            "glucose_value": random.uniform(70, 250),
+            "measurement_context": random.choice(["fasting", "post-meal"]),
+            "diabetes_status": "type2",
+            "age": 50,
+            "weight_kg": 80.0,
+            "height_cm": 170.0,
+            "physical_activity": "sometimes",
+            "family_history": True,
+            "created_at": start + timedelta(minutes=5 * i),
+        }
+        for i in range(n)
+    ]
+    with engine.begin() as conn:
+        for offset in range(0, n, 10_000):
+            conn.execute(insert(UserMetrics), rows[offset:offset + 10_000])
+
+
+def timed(fn, repeat):
+    timings, size = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return size, statistics.median(timings)
+
+
+def main():
+    args = parse_args()
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench_dashboard.db")
+    os.environ["USE_ASYNC_DB"] = "false"
+
+    from fastapi.testclient import TestClient
+    import main as app_main
+    from database import engine
+    from jobs.rebuild_metrics_rollup import rebuild_metrics_rollup
+
+    client = TestClient(app_main.app)
+
+    for n in args.sizes:
+        credentials = {"email": f"bench{n}@aiassistant.in", "password": "secret1"}
+        client.post("/register", json={"name": "Bench", "phone_number": f"9{n:09d}", **credentials})
+        login = client.post("/login", json=credentials).json()
+        headers = {"Authorization": f"Bearer {login['access_token']}"}
+        seed_metrics(engine, login["user"]["id"], n)
+        # Bulk-seeded rows bypass the API, so build the user's rollup once
+        rebuild_metrics_rollup(login["user"]["id"])
+
+        def summary():
+            response = client.get("/dashboard-summary", headers=headers)
+            return len(response.content)
+
+        def full_history():
+            size, cursor = 0, None
+            while True:
+                params = {"limit": 1000, **({"cursor": cursor} if cursor else {})}
+                response = client.get("/user-metrics", params=params, headers=headers)
+                size += len(response.content)
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    return size
+
+        summary_bytes, summary_ms = timed(summary, args.repeat)
+        history_bytes, history_ms = timed(full_history, max(1, args.repeat // 5))
+        print(
+            f"{n:>8,} rows | summary {summary_bytes:>7,} B {summary_ms:8.2f} ms"
+            f" | full history {history_bytes:>12,} B {history_ms:9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Load benchmark: sync (threadpool) vs. async (USE_ASYNC_DB) database routes.
+#
+# Starts the API under uvicorn once per mode against the same database
+# stand-in (a throwaway SQLite file unless --database-url points at MySQL),
+# then fires concurrent authenticated requests and reports throughput and
+# latency percentiles.
+#
+#   python bench_db_modes.py --requests 2000 --concurrency 64
+#   python bench_db_modes.py --database-url mysql+pymysql://root:pw@localhost:3306/bench_db
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RISK_PAYLOAD = {
+    "user_id": 1,
+    "glucose_value": 150,
+    "measurement_context": "fasting",
+    "trend": "stable",
+    "symptoms": "mild",
+    "medication_type": "oral",
+    "meal_type": "balanced",
+    "physical_activity": "sometimes",
+    "diabetes_status": "type2",
+    "age": 50,
+    "weight_kg": 80,
+    "height_cm": 170,
+    "family_history": True,
+}
+
+
+def start_server(database_url, use_async, port):
+    env = dict(os.environ, DATABASE_URL=database_url, USE_ASYNC_DB="true" if use_async else "false")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_up(client):
+    for _ in range(100):
+        try:
+            await client.get("/")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def authenticate(client):
+    credentials = {"email": "bench@example.com", "password": "benchmark"}
+    await client.post("/register", json={"name": "Bench", "phone_number": "00000000", **credentials})
+    response = await client.post("/login", json=credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_load(client, headers, total, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            # Alternate a write-heavy and a read-heavy endpoint
+            if i % 2:
+                response = await client.post("/diabetes-risk", json=RISK_PAYLOAD, headers=headers)
+            else:
+                response = await client.get("/me", headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+async def bench_mode(database_url, use_async, port, total, concurrency):
+    server = start_server(database_url, use_async, port)
+    try:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_until_up(client)
+            headers = await authenticate(client)
+            await run_load(client, headers, min(100, total), concurrency)  # warm-up
+            return await run_load(client, headers, total, concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async database modes under load")
+    parser.add_argument("--database-url", help="sync SQLAlchemy URL; defaults to a temporary SQLite file")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, use_async in (("sync ", False), ("async", True)):
+            database_url = args.database_url or f"sqlite:///{os.path.join(tmp, label.strip() + '.db')}"
+            stats = asyncio.run(bench_mode(database_url, use_async, args.port, args.requests, args.concurrency))
+            print(f"{label} | {stats['rps']:8.1f} req/s | p50 {stats['p50_ms']:7.1f} ms | p95 {stats['p95_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
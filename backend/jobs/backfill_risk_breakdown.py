@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill stored risk breakdowns on diabetes_risk_records.
+
+Rows created before the sub-score / percentage columns existed have them
+set to NULL. This job rescores those rows from their stored snapshot with
+the vectorized scorer, one primary-key range at a time, and writes the
+results back with bulk UPDATEs.
+
+Run from the backend directory:
+    python -m jobs.backfill_risk_breakdown [--batch-size 5000]
+"""
+
+import argparse
+
+from sqlalchemy import update
+
+from database import SessionLocal
+from models.diabetes_db_model import DiabetesRiskRecord
+from risk_calculator.batch_risk_calculator import calculate_risk_scores, RISK_INPUT_FIELDS
+
+BREAKDOWN_COLUMNS = (
+    "immediate_glycemic_risk",
+    "treatment_symptom_risk",
+    "baseline_vulnerability_risk",
+    "immediate_glycemic_percentage",
+    "treatment_symptom_percentage",
+    "baseline_vulnerability_percentage",
+)
+
+
+def backfill_risk_breakdown(batch_size: int = 5000) -> int:
+    """Fill breakdown columns for every record missing them. Returns rows updated."""
+    selected = [getattr(DiabetesRiskRecord, field) for field in RISK_INPUT_FIELDS]
+    updated = 0
+    last_id = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.query(DiabetesRiskRecord.record_id, *selected).filter(
+                DiabetesRiskRecord.record_id > last_id,
+                DiabetesRiskRecord.immediate_glycemic_percentage.is_(None)
+            ).order_by(DiabetesRiskRecord.record_id).limit(batch_size).all()
+            if not rows:
+                break
+
+            columns = {field: [getattr(row, field) for row in rows] for field in RISK_INPUT_FIELDS}
+            scores = calculate_risk_scores(columns)
+
+            db.execute(update(DiabetesRiskRecord), [
+                {"record_id": row.record_id, **{column: scores[column][i].item() for column in BREAKDOWN_COLUMNS}}
+                for i, row in enumerate(rows)
+            ])
+            db.commit()
+
+            updated += len(rows)
+            last_id = rows[-1].record_id
+            print(f"Backfilled {updated} records (up to record_id {last_id})")
+    finally:
+        db.close()
+
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    total = backfill_risk_breakdown(args.batch_size)
+    print(f"Done: {total} records backfilled")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pre-translate the report message catalog into each supported language.
+
+Reads translation/catalogs/en.json and writes translation/catalogs/<lang>.json.
+Only messages that are new or whose English template changed since the
+last build are sent upstream; {placeholders} are swapped for opaque tokens
+before translation and restored afterwards. Messages whose tokens do not
+survive translation are left out (they render in English) and reported.
+
+Run from the backend directory:
+    python -m jobs.build_translation_catalog [--languages ta hi] [--backend google] [--force]
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import settings
+from translation.backends import BACKENDS
+from translation.catalog import catalog_path, source_templates
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+# Tolerates the spacing some providers insert around underscores
+_TOKEN = re.compile(r"_\s*_\s*(\d+)\s*_\s*_")
+
+
+def protect(template: str):
+    """Swap {placeholders} for __0__, __1__, ... Returns (text, placeholder names)."""
+    names = []
+
+    def swap(match):
+        names.append(match.group(1))
+        return f"__{len(names) - 1}__"
+
+    return _PLACEHOLDER.sub(swap, template), names
+
+
+def restore(text: str, names: list):
+    """Put placeholders back; None if any token was lost or duplicated."""
+    found = [int(i) for i in _TOKEN.findall(text)]
+    if sorted(found) != list(range(len(names))):
+        return None
+    return _TOKEN.sub(lambda match: "{" + names[int(match.group(1))] + "}", text)
+
+
+def build_catalog(lang: str, backend, force: bool = False, workers: int = settings.TRANSLATION_MAX_WORKERS) -> dict:
+    """Bring one language's catalog up to date. Returns counts for the report."""
+    sources = source_templates()
+    path = catalog_path(lang)
+    existing = {}
+    if os.path.exists(path) and not force:
+        with open(path, encoding="utf-8") as f:
+            existing = json.load(f)
+
+    catalog = {
+        message_id: entry for message_id, entry in existing.items()
+        if sources.get(message_id) == entry.get("source")
+    }
+    todo = [message_id for message_id in sources if message_id not in catalog]
+
+    def translate(message_id):
+        text, names = protect(sources[message_id])
+        return restore(backend.translate(text, lang), names)
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for message_id, translated in zip(todo, pool.map(translate, todo)):
+            if translated is None:
+                failed.append(message_id)
+            else:
+                catalog[message_id] = {"source": sources[message_id], "text": translated}
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(catalog.items())), f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+    return {"reused": len(sources) - len(todo), "translated": len(todo) - len(failed), "failed": failed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--languages", nargs="+", default=settings.CATALOG_LANGUAGES)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=settings.TRANSLATION_BACKEND)
+    parser.add_argument("--force", action="store_true", help="retranslate every message")
+    args = parser.parse_args()
+
+    backend = BACKENDS[args.backend]()
+    for lang in args.languages:
+        report = build_catalog(lang, backend, args.force)
+        print(f"{lang}: {report['translated']} translated, {report['reused']} reused, {len(report['failed'])} failed")
+        for message_id in report["failed"]:
+            print(f"  placeholders lost, left in English: {message_id}")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Move inline recommendation lists into shared recommendation_sets rows.
+
+Each diabetes_recommendations row still holding its own JSON copy is
+pointed at a shared recommendation set (created on first sight) and its
+inline copy is cleared. The glucose reading written into the glucose
+sentence is moved to the row's glucose_value and the sentence stored with
+{glucose_value} open, so readings in the same bucket share one set. Rows
+are processed in primary-key batches; a report of the bytes saved is
+printed at the end. Safe to run while the API is writing sets.
+
+Run from the backend directory:
+    python -m jobs.migrate_recommendation_sets [--batch-size 5000]
+"""
+
+import argparse
+import json
+import re
+
+from sqlalchemy import update
+
+from database import SessionLocal
+from models.recommendations import (
+    GLUCOSE_PLACEHOLDER, DiabetesRecommendation, RecommendationSet, recommendation_set_hash, store_recommendation_set,
+)
+from translation.catalog import source_templates
+
+# Stored per row in place of the inline list: the hash and the glucose value
+REFERENCE_BYTES = 64 + 8
+
+
+def _glucose_patterns() -> list:
+    """A regex per English template with {glucose_value}, capturing the value it was filled with."""
+    patterns = []
+    for template in source_templates().values():
+        if GLUCOSE_PLACEHOLDER in template:
+            before, after = template.split(GLUCOSE_PLACEHOLDER, 1)
+            patterns.append(re.compile(re.escape(before) + r"(\d+(?:\.\d+)?)" + re.escape(after) + "$"))
+    return patterns
+
+
+def skeleton_of(recommendations: list, patterns: list):
+    """
+    (sentences with {glucose_value} reopened, glucose value), or the list
+    unchanged and None when no sentence carries a value that fills back
+    identically.
+    """
+    for i, text in enumerate(recommendations):
+        for pattern in patterns:
+            match = pattern.match(text)
+            if match and str(float(match.group(1))) == match.group(1):
+                opened = text[:match.start(1)] + GLUCOSE_PLACEHOLDER + text[match.end(1):]
+                return recommendations[:i] + [opened] + recommendations[i + 1:], float(match.group(1))
+    return recommendations, None
+
+
+def _json_bytes(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def migrate_recommendation_sets(batch_size: int = 5000) -> dict:
+    """Migrate every row with an inline list. Returns the bytes-saved report."""
+    report = {"rows": 0, "sets_created": 0, "inline_bytes": 0, "set_bytes": 0, "reference_bytes": 0}
+    patterns = _glucose_patterns()
+    last_id = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.query(DiabetesRecommendation.id, DiabetesRecommendation.recommendations).filter(
+                DiabetesRecommendation.id > last_id,
+                DiabetesRecommendation.recommendation_set_hash.is_(None),
+                DiabetesRecommendation.recommendations.isnot(None)
+            ).order_by(DiabetesRecommendation.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            hashes, changes = {}, []
+            for row in rows:
+                skeleton, glucose_value = skeleton_of(row.recommendations, patterns)
+                content_hash = recommendation_set_hash(skeleton)
+                hashes.setdefault(content_hash, skeleton)
+                changes.append({
+                    "id": row.id, "recommendation_set_hash": content_hash,
+                    "glucose_value": glucose_value, "recommendations": None,
+                })
+            existing = {
+                h for (h,) in db.query(RecommendationSet.content_hash).filter(
+                    RecommendationSet.content_hash.in_(list(hashes))
+                )
+            }
+            new_sets = [recs for h, recs in hashes.items() if h not in existing]
+            for recs in new_sets:
+                # Savepoint per set: the API may store the same set concurrently
+                store_recommendation_set(db, recs)
+
+            db.execute(update(DiabetesRecommendation), changes)
+            db.commit()
+
+            report["rows"] += len(rows)
+            report["sets_created"] += len(new_sets)
+            report["inline_bytes"] += sum(_json_bytes(row.recommendations) for row in rows)
+            report["set_bytes"] += sum(_json_bytes(recs) for recs in new_sets)
+            report["reference_bytes"] += REFERENCE_BYTES * len(rows)
+            last_id = rows[-1].id
+            print(f"Migrated {report['rows']} rows into {report['sets_created']} new sets (up to id {last_id})")
+    finally:
+        db.close()
+
+    report["bytes_saved"] = report["inline_bytes"] - report["set_bytes"] - report["reference_bytes"]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    report = migrate_recommendation_sets(args.batch_size)
+    print(
+        f"Done: {report['rows']} rows, {report['sets_created']} sets created. "
+        f"Inline JSON {report['inline_bytes']:,} B -> sets {report['set_bytes']:,} B "
+        f"+ references {report['reference_bytes']:,} B; saved {report['bytes_saved']:,} B"
+    )
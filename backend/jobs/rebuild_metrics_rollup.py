@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Rebuild user_metrics_rollups from user_metrics and diabetes_risk_records.
+
+The API keeps rollups current on every insert; run this once after
+deploying the table (to cover history written before it existed) or
+whenever a rollup is suspected to have drifted. Users are processed in
+primary-key batches: sums and counts come from GROUP BY queries, the
+latest rows from short per-user index lookups.
+
+Safe to run against live traffic: each batch first locks the rollup rows
+it will write (SELECT ... FOR UPDATE, creating missing ones the way the
+API does), then aggregates and updates them in place in the same
+transaction. API inserts for those users wait on the lock and apply
+their increment on top of the rebuilt values, so none is lost.
+
+Run from the backend directory:
+    python -m jobs.rebuild_metrics_rollup [--user-id 42] [--batch-size 500]
+"""
+
+import argparse
+
+from sqlalchemy import func
+
+from database import SessionLocal
+from models.user import User
+from models.user_metrics import UserMetrics
+from models.diabetes_db_model import DiabetesRiskRecord
+from models.user_metrics_rollup import RECENT_GLUCOSE_POINTS, UserMetricsRollup, locked_rollup
+
+# Columns recomputed by the rebuild (everything but the key and timestamp)
+_ROLLUP_FIELDS = [
+    column.key for column in UserMetricsRollup.__table__.columns
+    if not column.primary_key and column.key != "updated_at"
+]
+
+
+def _empty_rollup(user_id: int, disease_type: str) -> UserMetricsRollup:
+    return UserMetricsRollup(
+        user_id=user_id, disease_type=disease_type,
+        metric_count=0, glucose_count=0, glucose_sum=0.0,
+        total_assessments=0, risk_score_sum=0,
+    )
+
+
+def _metric_rollups(db, user_ids: list) -> dict:
+    rollups = {}
+    totals = db.query(
+        UserMetrics.user_id,
+        UserMetrics.disease_type,
+        func.count(UserMetrics.metric_id),
+        func.count(UserMetrics.glucose_value),
+        func.coalesce(func.sum(UserMetrics.glucose_value), 0.0),
+    ).filter(UserMetrics.user_id.in_(user_ids)).group_by(UserMetrics.user_id, UserMetrics.disease_type)
+
+    for user_id, disease_type, metric_count, glucose_count, glucose_sum in totals:
+        rollup = _empty_rollup(user_id, disease_type)
+        rows = (UserMetrics.user_id == user_id, UserMetrics.disease_type == disease_type)
+        newest_first = (UserMetrics.created_at.desc(), UserMetrics.metric_id.desc())
+
+        latest = db.query(UserMetrics).filter(*rows).order_by(*newest_first).first()
+        recent = db.query(UserMetrics).filter(*rows, UserMetrics.glucose_value.isnot(None)).order_by(
+            *newest_first
+        ).limit(RECENT_GLUCOSE_POINTS).all()
+
+        # Replaying the recent readings oldest first leaves the trend window
+        # and latest_* exactly as incremental updates would; counts are then
+        # restored from the totals
+        for metric in reversed(recent):
+            rollup.apply_metric(metric)
+        if latest.glucose_value is None:
+            rollup.apply_metric(latest)
+        rollup.metric_count, rollup.glucose_count, rollup.glucose_sum = metric_count, glucose_count, float(glucose_sum)
+        rollups[(user_id, disease_type)] = rollup
+    return rollups
+
+
+def _apply_risk_totals(db, user_ids: list, rollups: dict):
+    totals = db.query(
+        DiabetesRiskRecord.user_id,
+        func.count(DiabetesRiskRecord.record_id),
+        func.coalesce(func.sum(DiabetesRiskRecord.risk_score), 0),
+    ).filter(DiabetesRiskRecord.user_id.in_(user_ids)).group_by(DiabetesRiskRecord.user_id)
+
+    for user_id, assessments, score_sum in totals:
+        rollup = rollups.get((user_id, "diabetes"))
+        if rollup is None:
+            rollup = rollups[(user_id, "diabetes")] = _empty_rollup(user_id, "diabetes")
+        last_two = db.query(DiabetesRiskRecord).filter(DiabetesRiskRecord.user_id == user_id).order_by(
+            DiabetesRiskRecord.created_at.desc(), DiabetesRiskRecord.record_id.desc()
+        ).limit(2).all()
+        for record in reversed(last_two):
+            rollup.apply_assessment(record)
+        rollup.total_assessments, rollup.risk_score_sum = assessments, int(score_sum)
+
+
+def _source_keys(db, user_ids: list) -> set:
+    """(user, disease) pairs of these users that have metrics or assessments to roll up."""
+    keys = set(db.query(UserMetrics.user_id, UserMetrics.disease_type).filter(
+        UserMetrics.user_id.in_(user_ids)
+    ).distinct())
+    # Risk records always roll up under "diabetes"
+    assessed = db.query(DiabetesRiskRecord.user_id).filter(DiabetesRiskRecord.user_id.in_(user_ids)).distinct()
+    keys.update((user_id, "diabetes") for user_id, in assessed)
+    return keys
+
+
+def _lock_rollups(db, user_ids: list, source_keys: set) -> list:
+    """
+    Lock the existing rollup rows of `user_ids` plus those of `source_keys`,
+    creating missing ones, in (user, disease) order. Must run before the
+    transaction's first plain read so the aggregates see everything
+    committed before the locks.
+    """
+    existing = db.query(UserMetricsRollup).filter(UserMetricsRollup.user_id.in_(user_ids)).order_by(
+        UserMetricsRollup.user_id, UserMetricsRollup.disease_type
+    ).with_for_update().all()
+    locked = {(rollup.user_id, rollup.disease_type): rollup for rollup in existing}
+
+    for user_id, disease_type in sorted(source_keys - set(locked)):
+        locked[(user_id, disease_type)] = locked_rollup(db, user_id, disease_type)
+    return [locked[key] for key in sorted(locked)]
+
+
+def rebuild_metrics_rollup(user_id: int = None, batch_size: int = 500) -> int:
+    """Recompute rollups for one user or every user. Returns rollup rows written."""
+    written = 0
+    last_id = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            query = db.query(User.id).filter(User.id > last_id)
+            if user_id is not None:
+                query = query.filter(User.id == user_id)
+            user_ids = [row.id for row in query.order_by(User.id).limit(batch_size)]
+            if not user_ids:
+                break
+            source_keys = _source_keys(db, user_ids)
+            # End the read snapshot; the rebuild transaction starts with its locks
+            db.commit()
+
+            locked = _lock_rollups(db, user_ids, source_keys)
+            rollups = _metric_rollups(db, user_ids)
+            _apply_risk_totals(db, user_ids, rollups)
+
+            for row in locked:
+                rebuilt = rollups.get((row.user_id, row.disease_type))
+                if rebuilt is None:
+                    # Nothing left to roll up; the row is locked, so no increment is lost
+                    db.delete(row)
+                    continue
+                for field in _ROLLUP_FIELDS:
+                    setattr(row, field, getattr(rebuilt, field))
+            db.commit()
+
+            written += sum((row.user_id, row.disease_type) in rollups for row in locked)
+            last_id = user_ids[-1]
+            print(f"Rebuilt {written} rollups (up to user id {last_id})")
+    finally:
+        db.close()
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    total = rebuild_metrics_rollup(args.user_id, args.batch_size)
+    print(f"Done: {total} rollups rebuilt")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Reconcile stat_counters with the tables they count.
+
+The API changes counters in the same transaction as every insert and
+delete; run this once after deploying the table (to count rows written
+before it existed) and then periodically, e.g. nightly, to repair any
+drift from rows written outside the API. True counts come from one
+GROUP BY per table; the difference from each counter's current value is
+applied as an increment, so writes racing with the job are not lost.
+
+Run from the backend directory:
+    python -m jobs.reconcile_stat_counters [--dry-run]
+"""
+
+import argparse
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import func
+
+from database import SessionLocal
+from models.user import User
+from models.recommendations import DiabetesRecommendation
+from models.diabetes_db_model import DiabetesRiskRecord
+from models.stat_counter import (
+    RECOMMENDATIONS, RISK_RECORDS, USERS, StatCounter,
+    increment_counters, risk_day_counter, risk_level_counter,
+)
+
+# Corrections go to one fixed shard
+RECONCILE_SHARD = 0
+
+
+def _true_counts(db) -> Counter:
+    counts = Counter()
+    counts[USERS] = db.query(func.count(User.id)).scalar()
+    counts[RECOMMENDATIONS] = db.query(func.count(DiabetesRecommendation.id)).scalar()
+    counts[RISK_RECORDS] = db.query(func.count(DiabetesRiskRecord.record_id)).scalar()
+
+    by_level = db.query(DiabetesRiskRecord.risk_level, func.count(DiabetesRiskRecord.record_id)).group_by(
+        DiabetesRiskRecord.risk_level
+    )
+    for risk_level, count in by_level:
+        counts[risk_level_counter(risk_level)] += count
+
+    day = func.date(DiabetesRiskRecord.created_at)
+    by_day = db.query(day, func.count(DiabetesRiskRecord.record_id)).filter(
+        DiabetesRiskRecord.created_at.isnot(None)
+    ).group_by(day)
+    for value, count in by_day:
+        # SQLite returns DATE() as text, MySQL as a date
+        value = date.fromisoformat(value) if isinstance(value, str) else value
+        counts[risk_day_counter(value)] += count
+    return counts
+
+
+def reconcile_stat_counters(dry_run: bool = False) -> dict:
+    """Bring every counter to its true value. Returns {counter name: correction applied}."""
+    db = SessionLocal()
+    try:
+        counts = _true_counts(db)
+        current = {
+            name: int(value or 0)
+            for name, value in db.query(StatCounter.name, func.sum(StatCounter.value)).group_by(StatCounter.name)
+        }
+        corrections = {
+            name: counts.get(name, 0) - current.get(name, 0)
+            for name in set(counts) | set(current)
+            if counts.get(name, 0) != current.get(name, 0)
+        }
+        if corrections and not dry_run:
+            increment_counters(db, corrections, shard=RECONCILE_SHARD)
+            db.commit()
+        return corrections
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report drift without correcting it")
+    args = parser.parse_args()
+    corrections = reconcile_stat_counters(args.dry_run)
+    for name, delta in sorted(corrections.items()):
+        print(f"{name}: {delta:+d}")
+    print(f"Done: {len(corrections)} counters {'drifted' if args.dry_run else 'corrected'}")
@@ -1,13 +1,17 @@
+import logging
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text, inspect
-from database import engine, Base, SessionLocal
-from api import auth_router, risk_router
+from sqlalchemy.orm import Session
+from database import engine, Base, USE_ASYNC_DB
+from api import auth_router, risk_router, metrics_router, recommendation_router
+from api import async_auth_router, async_risk_router, async_metrics_router, async_recommendation_router
 from api.translation_routes import router as translation_router
-from auth.auth_utils import get_current_user
+from auth.auth_utils import get_db, get_current_user
 from models.user import User
 from ExplanableAI.diabetes_explanation_ai import generate_explanation
-from datetime import timezone
+
+logger = logging.getLogger(__name__)
 
 # ---------- APP ----------
 app = FastAPI(
@@ -25,6 +29,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ---------- CREATE TABLES ----------
@@ -52,11 +57,161 @@ def ensure_user_phone_schema():
         pass
 
 
+def _add_missing_columns(table: str, columns: dict):
+    """Add any of `columns` ({name: SQL type}) that `table` does not have yet."""
+    existing = {col["name"] for col in inspect(engine).get_columns(table)}
+    for name, ddl in columns.items():
+        if name not in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _add_missing_index(table: str, name: str, columns: str):
+    indexes = {idx.get("name") for idx in inspect(engine).get_indexes(table)}
+    if name not in indexes:
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX {name} ON {table} ({columns})"))
+
+
+def _drop_not_null(table: str, column: str, mysql_type: str):
+    """Make `column` nullable on MySQL, SQLite and PostgreSQL-style databases."""
+    columns = {col["name"]: col for col in inspect(engine).get_columns(table)}
+    if columns[column]["nullable"]:
+        return
+    if engine.dialect.name == "sqlite":
+        _rebuild_sqlite_table(table)
+        return
+    if engine.dialect.name == "mysql":
+        ddl = f"ALTER TABLE {table} MODIFY {column} {mysql_type} NULL"
+    else:
+        ddl = f"ALTER TABLE {table} ALTER COLUMN {column} DROP NOT NULL"
+    with engine.begin() as conn:
+        conn.execute(text(ddl))
+
+
+def _widen_float_columns(table: str, names):
+    """MySQL only: turn single-precision FLOAT `names` of `table` into DOUBLE."""
+    columns = {col["name"]: col for col in inspect(engine).get_columns(table)}
+    for name in names:
+        if type(columns[name]["type"]).__name__.upper() == "FLOAT":
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} MODIFY {name} DOUBLE NULL"))
+
+
+def _rebuild_sqlite_table(table: str):
+    """SQLite cannot change a column's constraints in place: recreate `table` from its model and copy the rows."""
+    model_table = Base.metadata.tables[table]
+    inspector = inspect(engine)
+    copied = ", ".join(col["name"] for col in inspector.get_columns(table) if col["name"] in model_table.c)
+    with engine.begin() as conn:
+        # Index names stay with the renamed table; free them for the new one
+        for index in inspector.get_indexes(table):
+            conn.execute(text(f"DROP INDEX {index['name']}"))
+        conn.execute(text(f"ALTER TABLE {table} RENAME TO {table}_old"))
+        model_table.create(conn)
+        conn.execute(text(f"INSERT INTO {table} ({copied}) SELECT {copied} FROM {table}_old"))
+        conn.execute(text(f"DROP TABLE {table}_old"))
+
+
+def _schema_step(description: str, step, *args):
+    """
+    Run one schema guard step. A failure is logged and does not stop the
+    remaining steps or app boot; request-time errors will still surface.
+    """
+    try:
+        step(*args)
+    except Exception:
+        logger.exception("Schema guard step failed: %s", description)
+
+
+def ensure_user_search_schema():
+    """Schema guard for the users.name index behind the admin listing's search and sort."""
+    _schema_step("index users.name", _add_missing_index, "users", "ix_users_name", "name")
+
+
+def ensure_risk_record_schema():
+    """
+    Schema guard for diabetes_risk_records: stored risk breakdown columns
+    (filled for old rows by `python -m jobs.backfill_risk_breakdown`) and
+    the (user_id, created_at) index used by previous-record lookups.
+    Percentages are double precision; MySQL columns added earlier as
+    single-precision FLOAT are widened.
+    """
+    percentage_columns = (
+        "immediate_glycemic_percentage", "treatment_symptom_percentage", "baseline_vulnerability_percentage",
+    )
+    _schema_step("add risk breakdown columns", _add_missing_columns, "diabetes_risk_records", {
+        "immediate_glycemic_risk": "INTEGER NULL",
+        "treatment_symptom_risk": "INTEGER NULL",
+        "baseline_vulnerability_risk": "INTEGER NULL",
+        **{name: "DOUBLE PRECISION NULL" for name in percentage_columns},
+    })
+    if engine.dialect.name == "mysql":
+        # PostgreSQL FLOAT and SQLite REAL are already 8 bytes
+        _schema_step("widen risk percentages to DOUBLE", _widen_float_columns, "diabetes_risk_records", percentage_columns)
+    _schema_step(
+        "index diabetes_risk_records (user_id, created_at)",
+        _add_missing_index, "diabetes_risk_records", "ix_diabetes_risk_records_user_created", "user_id, created_at",
+    )
+
+
+def ensure_user_metrics_schema():
+    """Schema guard for the user_metrics indexes behind paginated GET /user-metrics."""
+    _schema_step(
+        "index user_metrics (user_id, disease_type, created_at)",
+        _add_missing_index, "user_metrics", "ix_user_metrics_user_disease_created", "user_id, disease_type, created_at",
+    )
+    _schema_step(
+        "index user_metrics (user_id, created_at, metric_id)",
+        _add_missing_index, "user_metrics", "ix_user_metrics_user_created_id", "user_id, created_at, metric_id",
+    )
+
+
+def ensure_recommendation_schema():
+    """
+    Schema guard for diabetes_recommendations: the recommendation set
+    reference, a nullable inline copy (emptied by
+    `python -m jobs.migrate_recommendation_sets`) and the (user_id,
+    created_at) index behind paginated history. Rows that only reference a
+    set store NULL inline, so the legacy NOT NULL is dropped on every dialect.
+    """
+    _schema_step(
+        "index diabetes_recommendations (user_id, created_at)",
+        _add_missing_index, "diabetes_recommendations", "ix_diabetes_recommendations_user_created", "user_id, created_at",
+    )
+    _schema_step("add recommendation set columns", _add_missing_columns, "diabetes_recommendations", {
+        "recommendation_set_hash": "VARCHAR(64) NULL",
+        "glucose_value": "DOUBLE PRECISION NULL",
+    })
+    _schema_step(
+        "index diabetes_recommendations.recommendation_set_hash",
+        _add_missing_index, "diabetes_recommendations",
+        "ix_diabetes_recommendations_recommendation_set_hash", "recommendation_set_hash",
+    )
+    _schema_step(
+        "drop NOT NULL on diabetes_recommendations.recommendations",
+        _drop_not_null, "diabetes_recommendations", "recommendations", "JSON",
+    )
+
+
 ensure_user_phone_schema()
+ensure_user_search_schema()
+ensure_risk_record_schema()
+ensure_user_metrics_schema()
+ensure_recommendation_schema()
 
 # ---------- INCLUDE ROUTERS ----------
-app.include_router(auth_router, tags=["Authentication"])
-app.include_router(risk_router, tags=["Risk Calculation"])
+# USE_ASYNC_DB swaps in async handlers for every database-backed router
+if USE_ASYNC_DB:
+    app.include_router(async_auth_router, tags=["Authentication"])
+    app.include_router(async_risk_router, tags=["Risk Calculation"])
+    app.include_router(async_metrics_router, tags=["User Metrics"])
+    app.include_router(async_recommendation_router, tags=["Recommendations"])
+else:
+    app.include_router(auth_router, tags=["Authentication"])
+    app.include_router(risk_router, tags=["Risk Calculation"])
+    app.include_router(metrics_router, tags=["User Metrics"])
+    app.include_router(recommendation_router, tags=["Recommendations"])
 app.include_router(translation_router, tags=["Translation"])
 
 # ---------- ROOT & HEALTH CHECK ----------
@@ -65,166 +220,24 @@ def root():
     return {"status": "Backend is running"}
 
 @app.get("/db-test")
-def test_database():
+def test_database(db: Session = Depends(get_db)):
     try:
-        db = SessionLocal()
         result = db.execute(text("SELECT 1 as test"))
-        db.close()
         return {"status": "Database connected successfully", "test_query": "OK"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
     
 @app.post("/explain-diabetes")
-def explain_risk(risk_data: dict):
+def explain_risk(risk_data: dict, lang: str = "en"):
     from ExplanableAI.diabetes_explanation_ai import generate_explanation, generate_summary
+    from translation.catalog import served_language
     
-    explanation = generate_explanation(risk_data)
-    summary = generate_summary(risk_data)
+    # Rendered from the pre-translated message catalog; no translation calls here
+    explanation = generate_explanation(risk_data, lang)
+    summary = generate_summary(risk_data, lang)
     return {
         "risk_level": risk_data.get("risk_level"),
         "summary": summary,
-        "explanation": explanation
+        "explanation": explanation,
+        "lang": served_language(lang)
     }
-
-
-
-@app.post("/diabetes-recommendations")
-def get_diabetes_recommendations(risk_data: dict, current_user: User = Depends(get_current_user)):
-    from recommendations.diabetes_recommendations import generate_diabetes_recommendations
-    from models.recommendations import DiabetesRecommendation
-    
-    recommendations = generate_diabetes_recommendations(risk_data)
-    
-    # Store in database
-    db = SessionLocal()
-    try:
-        db_recommendation = DiabetesRecommendation(
-            user_id=current_user.id,
-            risk_score=risk_data.get("risk_score", 0),
-            risk_level=risk_data.get("risk_level", "Unknown"),
-            recommendations=recommendations
-        )
-        db.add(db_recommendation)
-        db.commit()
-        db.refresh(db_recommendation)
-    finally:
-        db.close()
-    
-    return {
-        "risk_score": risk_data.get("risk_score"),
-        "risk_level": risk_data.get("risk_level"),
-        "recommendations": recommendations
-    }
-
-
-
-@app.post("/user-metrics")
-def create_user_metrics(metrics_data: dict, current_user: User = Depends(get_current_user)):
-    from models.user_metrics import UserMetrics
-    
-    db = SessionLocal()
-    try:
-        # Whitelist accepted fields to avoid passing unexpected keys (e.g., 'diabetes')
-        allowed_fields = {
-            'user_id', 'disease_type',
-            # diabetes fields
-            'glucose_value', 'measurement_context', 'trend', 'symptoms', 'medication_type', 'meal_type', 'diabetes_status',
-            # common fields
-            'age', 'weight_kg', 'height_cm', 'physical_activity', 'family_history'
-        }
-
-        filtered = {k: v for k, v in metrics_data.items() if k in allowed_fields}
-
-        # Force the user_id to be the authenticated user to enforce relationships
-        filtered['user_id'] = current_user.id
-
-        # Normalize some common types
-        if 'family_history' in filtered:
-            # Accept 0/1 or booleans
-            if isinstance(filtered['family_history'], int):
-                filtered['family_history'] = bool(filtered['family_history'])
-
-        # If disease_type not provided, attempt to infer from available keys
-        if 'disease_type' not in filtered:
-            if 'glucose_value' in filtered:
-                filtered['disease_type'] = 'diabetes'
-            else:
-                filtered['disease_type'] = 'unknown'
-
-        db_metrics = UserMetrics(**filtered)
-        db.add(db_metrics)
-        db.commit()
-        db.refresh(db_metrics)
-        return {"message": "Metrics created", "metric_id": db_metrics.metric_id}
-    finally:
-        db.close()
-
-@app.get("/user-metrics")
-def get_user_metrics(user_id: int = None, disease_type: str = None, current_user: User = Depends(get_current_user)):
-    from models.user_metrics import UserMetrics
-    
-    db = SessionLocal()
-    try:
-        # Ensure the caller is only fetching their own metrics (unless user_id is omitted)
-        if user_id is None:
-            user_id = current_user.id
-        elif user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Forbidden: cannot access other user's metrics")
-
-        query = db.query(UserMetrics).filter(UserMetrics.user_id == user_id)
-        if disease_type:
-            query = query.filter(UserMetrics.disease_type == disease_type)
-        
-        metrics = query.all()
-        result = []
-        for m in metrics:
-            # Ensure created_at is serialized consistently (ISO string) and provide an epoch timestamp (ms)
-            created_at_iso = None
-            created_at_ts = None
-            if getattr(m, 'created_at', None):
-                try:
-                    # Assume stored datetimes are UTC (naive). Make timezone-aware UTC before serializing.
-                    dt = m.created_at
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    created_at_iso = dt.isoformat()
-                    # milliseconds since epoch
-                    created_at_ts = int(dt.timestamp() * 1000)
-                except Exception:
-                    # Fallback to str if unexpected type
-                    created_at_iso = str(m.created_at)
-
-            metric_dict = {
-                "metric_id": m.metric_id,
-                "user_id": m.user_id,
-                "disease_type": m.disease_type,
-                "created_at": created_at_iso,
-                "timestamp": created_at_ts
-            }
-            
-            # Add disease-specific fields
-            if m.disease_type == "diabetes":
-                metric_dict.update({
-                    "glucose_value": m.glucose_value,
-                    "measurement_context": m.measurement_context,
-                    "trend": m.trend,
-                    "symptoms": m.symptoms,
-                    "medication_type": m.medication_type,
-                    "meal_type": m.meal_type,
-                    "diabetes_status": m.diabetes_status
-                })
-            
-            # Add common fields
-            metric_dict.update({
-                "age": m.age,
-                "weight_kg": m.weight_kg,
-                "height_cm": m.height_cm,
-                "physical_activity": m.physical_activity,
-                "family_history": m.family_history
-            })
-            
-            result.append(metric_dict)
-        
-        return result
-    finally:
-        db.close()
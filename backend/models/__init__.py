@@ -1,6 +1,7 @@
 from .user import User
-from .recommendations import DiabetesRecommendation
+from .recommendations import DiabetesRecommendation, RecommendationSet
 from .diabetes_db_model import DiabetesRiskRecord
 from .user_metrics import UserMetrics
 from .user_metrics_model import UserMetricsInput
-
+from .user_metrics_rollup import UserMetricsRollup
+from .stat_counter import StatCounter
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Index
 from datetime import datetime
 from database import Base
 
 
 class DiabetesRiskRecord(Base):
     __tablename__ = "diabetes_risk_records"
+    __table_args__ = (
+        # Serves the "latest / previous record for a user" lookups
+        Index("ix_diabetes_risk_records_user_created", "user_id", "created_at"),
+    )
 
     # Primary key
     record_id = Column(Integer, primary_key=True, index=True)
@@ -36,5 +40,14 @@ class DiabetesRiskRecord(Base):
     risk_score = Column(Integer)
     risk_level = Column(String(20))              # Low / Moderate / High / Critical
 
+    # -------- Stored breakdown (nullable until backfilled) --------
+    immediate_glycemic_risk = Column(Integer)
+    treatment_symptom_risk = Column(Integer)
+    baseline_vulnerability_risk = Column(Integer)
+    # Double precision: a bare Float is a 4-byte FLOAT on MySQL and would not round-trip
+    immediate_glycemic_percentage = Column(Float(precision=53))
+    treatment_symptom_percentage = Column(Float(precision=53))
+    baseline_vulnerability_percentage = Column(Float(precision=53))
+
     # Timestamp
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,14 +1,70 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+import hashlib
+import json
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from database import Base
 
+
+# The only per-reading value in recommendation texts; sets keep it as a placeholder
+GLUCOSE_PLACEHOLDER = "{glucose_value}"
+
+
+class RecommendationSet(Base):
+    """
+    One distinct list of recommendation sentences, stored once and shared
+    by hash. Sentences keep {glucose_value} open, so every reading in the
+    same recommendation bucket shares a set; the value is on the row.
+    """
+    __tablename__ = "recommendation_sets"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256 of the canonical JSON
+    recommendations = Column(JSON, nullable=False)  # Array of strings
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class DiabetesRecommendation(Base):
     __tablename__ = "diabetes_recommendations"
+    __table_args__ = (
+        # Serves the newest-first history pages for a user
+        Index("ix_diabetes_recommendations_user_created", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     # Optional link to user (nullable for backward compatibility)
     user_id = Column(Integer, nullable=True, index=True)
     risk_score = Column(Integer, nullable=False)
     risk_level = Column(String(50), nullable=False)
-    recommendations = Column(JSON, nullable=False)  # Array of strings
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    recommendation_set_hash = Column(String(64), ForeignKey("recommendation_sets.content_hash"), nullable=True, index=True)
+    # Fills {glucose_value} in the referenced set's sentences
+    glucose_value = Column(Float(precision=53), nullable=True)
+    # Legacy inline copy; NULL once the row points at a recommendation set
+    # (see `python -m jobs.migrate_recommendation_sets`)
+    recommendations = Column(JSON(none_as_null=True), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+def fill_recommendations(recommendations: list, glucose_value) -> list:
+    """A stored set's sentences with the row's glucose value put back in."""
+    if not recommendations or glucose_value is None:
+        return recommendations
+    return [text.replace(GLUCOSE_PLACEHOLDER, str(glucose_value)) for text in recommendations]
+
+
+def recommendation_set_hash(recommendations: list) -> str:
+    canonical = json.dumps(recommendations, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def store_recommendation_set(db, recommendations: list) -> str:
+    """Content hash of `recommendations`, inserting the set if it is new."""
+    content_hash = recommendation_set_hash(recommendations)
+    if db.get(RecommendationSet, content_hash) is not None:
+        return content_hash
+    try:
+        with db.begin_nested():
+            db.add(RecommendationSet(content_hash=content_hash, recommendations=recommendations))
+    except IntegrityError:
+        # A concurrent request stored the same set first
+        pass
+    return content_hash
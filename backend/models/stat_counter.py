@@ -0,0 +1,89 @@
+import random
+from collections import Counter
+from datetime import date, datetime
+
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime, func, update
+from sqlalchemy.exc import IntegrityError
+
+import settings
+from database import Base
+
+# ---------- COUNTER NAMES ----------
+USERS = "users"
+RECOMMENDATIONS = "recommendations"
+RISK_RECORDS = "risk_records"
+
+
+def risk_level_counter(risk_level: str) -> str:
+    return f"risk_level:{risk_level}"
+
+
+def risk_day_counter(day: date) -> str:
+    return f"risk_records:day:{day.isoformat()}"
+
+
+class StatCounter(Base):
+    """
+    Running row counts behind /admin/stats, changed in the same transaction
+    as the rows they count. Each counter is split over a few shards that
+    writers pick at random, so concurrent inserts do not all queue on one
+    row lock; a counter's value is the sum of its shards. Reconcile with
+    `python -m jobs.reconcile_stat_counters`.
+    """
+    __tablename__ = "stat_counters"
+
+    name = Column(String(64), primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def increment_counters(db, deltas: dict, shard: int = None):
+    """Add `deltas` ({counter name: change}) to one shard; the caller commits."""
+    if shard is None:
+        shard = random.randrange(settings.STAT_COUNTER_SHARDS)
+    # Sorted so concurrent transactions lock counter rows in the same order
+    for name, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        bump = update(StatCounter).where(
+            StatCounter.name == name, StatCounter.shard == shard
+        ).values(value=StatCounter.value + delta).execution_options(synchronize_session=False)
+        if db.execute(bump).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(StatCounter(name=name, shard=shard, value=delta))
+        except IntegrityError:
+            # A concurrent transaction created this shard first
+            db.execute(bump)
+
+
+def risk_record_deltas(records) -> Counter:
+    """Counter changes for inserting `records` (flushed DiabetesRiskRecords)."""
+    deltas = Counter()
+    for record in records:
+        deltas[RISK_RECORDS] += 1
+        deltas[risk_level_counter(record.risk_level)] += 1
+        created_at = record.created_at or datetime.utcnow()
+        deltas[risk_day_counter(created_at.date())] += 1
+    return deltas
+
+
+def read_counters(db, names) -> dict:
+    """Current value of each counter in `names` (0 when never incremented)."""
+    names = list(names)
+    values = dict.fromkeys(names, 0)
+    rows = db.query(StatCounter.name, func.sum(StatCounter.value)).filter(
+        StatCounter.name.in_(names)
+    ).group_by(StatCounter.name)
+    for name, value in rows:
+        values[name] = int(value or 0)
+    return values
+
+
+def read_counters_with_prefix(db, prefix: str) -> dict:
+    rows = db.query(StatCounter.name, func.sum(StatCounter.value)).filter(
+        StatCounter.name.like(prefix + "%")
+    ).group_by(StatCounter.name)
+    return {name[len(prefix):]: int(value or 0) for name, value in rows}
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, Text, DateTime
+from datetime import datetime
+from database import Base
+
+
+class TranslationCacheEntry(Base):
+    """Upstream translations, keyed by target language and SHA-256 of the English text."""
+    __tablename__ = "translation_cache"
+
+    target_lang = Column(String(10), primary_key=True)
+    text_hash = Column(String(64), primary_key=True)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
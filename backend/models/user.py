@@ -17,7 +17,8 @@ class User(Base):
 
     # ---------- PRIMARY IDENTIFIERS ----------
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False)
+    # Indexed for the admin listing's name prefix search and sort
+    name = Column(String(100), nullable=False, index=True)
     email = Column(String(150), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     phone_number = Column(String(20), unique=True, index=True, nullable=False)
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from datetime import datetime
 from database import Base
 
 
 class UserMetrics(Base):
     __tablename__ = "user_metrics"
+    __table_args__ = (
+        # Back keyset pagination of GET /user-metrics with and without a
+        # disease_type filter; metric_id breaks created_at ties
+        Index("ix_user_metrics_user_disease_created", "user_id", "disease_type", "created_at"),
+        Index("ix_user_metrics_user_created_id", "user_id", "created_at", "metric_id"),
+    )
 
     metric_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,132 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from database import Base
+
+# Glucose readings kept on the rollup for the dashboard trend chart
+RECENT_GLUCOSE_POINTS = 7
+
+
+class UserMetricsRollup(Base):
+    """
+    Running aggregates per (user, disease), updated in the same transaction
+    as every user_metrics / diabetes_risk_records insert so readers never
+    scan raw history. Rebuild with `python -m jobs.rebuild_metrics_rollup`.
+    """
+    __tablename__ = "user_metrics_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    disease_type = Column(String(20), primary_key=True)
+
+    # ---- From user_metrics ----
+    metric_count = Column(Integer, nullable=False, default=0)
+    glucose_count = Column(Integer, nullable=False, default=0)
+    glucose_sum = Column(Float, nullable=False, default=0.0)
+    latest_glucose = Column(Float, nullable=True)
+    latest_weight_kg = Column(Float, nullable=True)
+    latest_height_cm = Column(Float, nullable=True)
+    latest_diabetes_status = Column(String(20), nullable=True)
+    latest_metric_at = Column(DateTime, nullable=True)
+    recent_glucose = Column(JSON, nullable=True)  # [{"glucose", "created_at", "weight_kg", "height_cm"}], oldest first
+
+    # ---- From diabetes_risk_records ----
+    total_assessments = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Integer, nullable=False, default=0)
+    latest_risk_score = Column(Integer, nullable=True)
+    previous_risk_score = Column(Integer, nullable=True)
+    latest_risk_level = Column(String(20), nullable=True)
+    last_assessed_at = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def apply_metric(self, metric):
+        """Fold one newly inserted UserMetrics row into the aggregates."""
+        self.metric_count = (self.metric_count or 0) + 1
+        self.latest_weight_kg = metric.weight_kg
+        self.latest_height_cm = metric.height_cm
+        self.latest_diabetes_status = metric.diabetes_status
+        self.latest_glucose = metric.glucose_value
+        self.latest_metric_at = metric.created_at
+        if metric.glucose_value is not None:
+            self.glucose_count = (self.glucose_count or 0) + 1
+            self.glucose_sum = (self.glucose_sum or 0.0) + metric.glucose_value
+            point = {
+                "glucose": float(metric.glucose_value),
+                "created_at": metric.created_at.isoformat() if metric.created_at else None,
+                "weight_kg": metric.weight_kg,
+                "height_cm": metric.height_cm,
+            }
+            # Reassign rather than mutate so the JSON column is flagged dirty
+            self.recent_glucose = ((self.recent_glucose or []) + [point])[-RECENT_GLUCOSE_POINTS:]
+
+    def apply_assessment(self, record):
+        """Fold one newly inserted DiabetesRiskRecord into the aggregates."""
+        self.total_assessments = (self.total_assessments or 0) + 1
+        self.risk_score_sum = (self.risk_score_sum or 0) + (record.risk_score or 0)
+        self.previous_risk_score = self.latest_risk_score
+        self.latest_risk_score = record.risk_score
+        self.latest_risk_level = record.risk_level
+        self.last_assessed_at = record.created_at
+
+    @property
+    def average_risk_score(self):
+        if not self.total_assessments:
+            return None
+        return round(self.risk_score_sum / self.total_assessments, 1)
+
+    @property
+    def risk_change(self):
+        if self.latest_risk_score is None or self.previous_risk_score is None:
+            return None
+        return self.latest_risk_score - self.previous_risk_score
+
+    @property
+    def trend_direction(self) -> str:
+        # Higher risk scores are worse
+        change = self.risk_change
+        if not change:
+            return "stable"
+        return "worsening" if change > 0 else "improving"
+
+    def to_metrics_input(self):
+        from .user_metrics_model import UserMetricsInput
+
+        return UserMetricsInput(
+            user_id=self.user_id,
+            disease_type=self.disease_type,
+            latest_risk_score=self.latest_risk_score or 0,
+            previous_risk_score=self.previous_risk_score,
+            average_risk_score=self.average_risk_score,
+            risk_change=self.risk_change,
+            trend_direction=self.trend_direction,
+            total_assessments=self.total_assessments or 0,
+            last_assessed_at=self.last_assessed_at,
+        )
+
+
+def locked_rollup(db, user_id: int, disease_type: str) -> UserMetricsRollup:
+    """
+    The caller's rollup row, locked for update until the transaction ends
+    and created on first use. Concurrent first inserts for the same user
+    settle on whichever row commits first.
+    """
+    def fetch():
+        return db.query(UserMetricsRollup).filter(
+            UserMetricsRollup.user_id == user_id,
+            UserMetricsRollup.disease_type == disease_type
+        ).with_for_update().one_or_none()
+
+    rollup = fetch()
+    if rollup is not None:
+        return rollup
+    try:
+        with db.begin_nested():
+            rollup = UserMetricsRollup(
+                user_id=user_id, disease_type=disease_type,
+                metric_count=0, glucose_count=0, glucose_sum=0.0,
+                total_assessments=0, risk_score_sum=0,
+            )
+            db.add(rollup)
+        return rollup
+    except IntegrityError:
+        return fetch()
@@ -1,106 +1,123 @@
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+from translation.catalog import Message, Skeleton, render_skeleton
 
-def generate_diabetes_recommendations(risk_data: Dict) -> List[str]:
 
-    recommendations = []
-    risk_level = risk_data.get("risk_level", "Unknown")
-    attribution = risk_data.get("attribution", {})
+class RecommendationBucket(NamedTuple):
+    """Everything the recommendation text depends on except the glucose value itself."""
+    glucose_finding: Optional[str]   # fasting_high / post_meal_spike / above_ideal / None
+    trend: Optional[str]
+    excess_weight: bool
+    physical_activity: Optional[str]
+    family_history: bool
+    risk_level: str                  # high / moderate / low
 
-    # ============================================================
-    # IMMEDIATE GLYCEMIC CONTRIBUTORS
-    # ============================================================
+
+def recommendation_bucket(risk_data: Dict) -> RecommendationBucket:
+    attribution = risk_data.get("attribution", {})
+    risk_level = risk_data.get("risk_level", "Unknown")
 
     glycemic = attribution.get("immediate_glycemic", {})
     glucose_value = glycemic.get("glucose_value")
     glucose_context = glycemic.get("glucose_context")
-    trend = glycemic.get("trend")
 
+    glucose_finding = None
     if glucose_value is not None:
         if glucose_context == "fasting" and glucose_value >= 126:
-            recommendations.append(
-                f"Your fasting glucose is {glucose_value} mg/dL, which is high. Please follow a strict low-glycemic meal pattern and regular glucose checks."
-            )
+            glucose_finding = "fasting_high"
         elif glucose_context == "post-meal" and glucose_value >= 180:
-            recommendations.append(
-                f"Your post-meal glucose is {glucose_value} mg/dL, which indicates a post-food spike. Reduce refined carbohydrates and keep portions controlled."
-            )
+            glucose_finding = "post_meal_spike"
         elif glucose_value >= 100:
-            recommendations.append(
-                f"Your glucose is {glucose_value} mg/dL, slightly above ideal. Early lifestyle correction can prevent progression."
-            )
-
-    if trend == "worsening":
-        recommendations.append(
-            "Your glucose trend is worsening. Please repeat readings consistently and review treatment with your doctor."
-        )
-    elif trend == "stable":
-        recommendations.append(
-            "Your glucose trend is stable. Continue the same routine and improve meal quality to bring readings closer to target."
-        )
-    elif trend == "improving":
-        recommendations.append(
-            "Your glucose trend is improving. Continue the current plan and keep monitoring."
-        )
+            glucose_finding = "above_ideal"
+
+    baseline = attribution.get("baseline", {})
+
+    if risk_level in ["High Risk", "Critical Risk"]:
+        risk_group = "high"
+    elif risk_level == "Moderate Risk":
+        risk_group = "moderate"
+    else:
+        risk_group = "low"
+
+    return RecommendationBucket(
+        glucose_finding=glucose_finding,
+        trend=glycemic.get("trend"),
+        excess_weight=baseline.get("bmi_category") in ["overweight", "obese"],
+        physical_activity=baseline.get("physical_activity"),
+        family_history=bool(baseline.get("family_history")),
+        risk_level=risk_group,
+    )
+
+
+def diabetes_recommendation_messages(bucket: RecommendationBucket) -> List[Message]:
+    """Recommendations for one bucket as catalog messages, in display order ({glucose_value} left open)."""
+
+    messages = []
+
+    # ============================================================
+    # IMMEDIATE GLYCEMIC CONTRIBUTORS
+    # ============================================================
+
+    if bucket.glucose_finding == "fasting_high":
+        messages.append(Message("recommendation.glucose.fasting_high"))
+    elif bucket.glucose_finding == "post_meal_spike":
+        messages.append(Message("recommendation.glucose.post_meal_spike"))
+    elif bucket.glucose_finding == "above_ideal":
+        messages.append(Message("recommendation.glucose.above_ideal"))
+
+    if bucket.trend == "worsening":
+        messages.append(Message("recommendation.trend.worsening"))
+    elif bucket.trend == "stable":
+        messages.append(Message("recommendation.trend.stable"))
+    elif bucket.trend == "improving":
+        messages.append(Message("recommendation.trend.improving"))
 
     # ============================================================
     # BASELINE CONTRIBUTORS
     # ============================================================
 
-    baseline = attribution.get("baseline", {})
+    if bucket.excess_weight:
+        messages.append(Message("recommendation.weight.reduce"))
 
-    if baseline.get("bmi_category") in ["overweight", "obese"]:
-        recommendations.append(
-            "Weight reduction can improve sugar control. A practical target is 5-10% weight loss over time under medical guidance."
-        )
-
-    if baseline.get("physical_activity") == "never":
-        recommendations.append(
-            "Begin regular activity: at least 30 minutes of brisk walking on most days (about 150 minutes/week), if medically safe for you."
-        )
-    elif baseline.get("physical_activity") == "sometimes":
-        recommendations.append(
-            "Make activity consistent: 30 minutes/day for 5 days/week, plus a short 10-15 minute walk after meals."
-        )
-
-    if baseline.get("family_history"):
-        recommendations.append(
-            "Family history increases your risk. Regular follow-up blood sugar testing is very important even when symptoms are mild."
-        )
+    if bucket.physical_activity == "never":
+        messages.append(Message("recommendation.activity.never"))
+    elif bucket.physical_activity == "sometimes":
+        messages.append(Message("recommendation.activity.sometimes"))
+
+    if bucket.family_history:
+        messages.append(Message("recommendation.family_history"))
 
     # ============================================================
     # DIETARY ADVICE (DOCTOR-STYLE, PRACTICAL)
     # ============================================================
-    recommendations.append(
-        "Diet advice: Use the plate method in each meal (1/2 non-starchy vegetables, 1/4 lean protein, 1/4 whole grains). Prefer oats, dal/beans, whole wheat, brown rice, nuts, and seeds."
-    )
-    recommendations.append(
-        "Fruits suitable for diabetes (portion-controlled): apple, pear, guava, orange, sweet lime, berries, kiwi, papaya, and pomegranate seeds. Take whole fruit, not juice."
-    )
-    recommendations.append(
-        "Portion advice: one small fruit at a time (or about 1 cup cut fruit). Avoid fruit juices, sweetened drinks, and frequent sweets."
-    )
+    messages.append(Message("recommendation.diet.plate_method"))
+    messages.append(Message("recommendation.diet.fruits"))
+    messages.append(Message("recommendation.diet.portions"))
 
     # ============================================================
     # RISK LEVEL GUIDANCE
     # ============================================================
 
-    if risk_level in ["High Risk", "Critical Risk"]:
-        recommendations.append(
-            "Your diabetes risk is high. Please schedule a doctor review soon for personalized treatment, medication adjustment, and complication screening."
-        )
-    elif risk_level == "Moderate Risk":
-        recommendations.append(
-            "You are at moderate risk. With consistent food, activity, and follow-up, risk progression can often be reduced."
-        )
+    if bucket.risk_level == "high":
+        messages.append(Message("recommendation.risk.high"))
+    elif bucket.risk_level == "moderate":
+        messages.append(Message("recommendation.risk.moderate"))
     else:
-        recommendations.append(
-            "Your current risk is low. Continue healthy routines and periodic monitoring."
-        )
+        messages.append(Message("recommendation.risk.low"))
 
-    recommendations.append(
-        "Ask your doctor about periodic HbA1c, kidney function, lipid profile, eye check, and foot check as part of long-term diabetes safety."
-    )
+    messages.append(Message("recommendation.screening"))
+
+    return messages
+
+
+def diabetes_recommendation_skeleton(risk_data: Dict, lang: str = "en") -> Tuple[Skeleton, Optional[float]]:
+    """Rendered recommendations with {glucose_value} still open, and the value that fills it."""
+    bucket = recommendation_bucket(risk_data)
+    skeleton = render_skeleton(("recommendations", bucket), lang, lambda: diabetes_recommendation_messages(bucket))
+    glucose_value = risk_data.get("attribution", {}).get("immediate_glycemic", {}).get("glucose_value")
+    return skeleton, glucose_value
 
 
-    return recommendations
+def generate_diabetes_recommendations(risk_data: Dict, lang: str = "en") -> List[str]:
+    skeleton, glucose_value = diabetes_recommendation_skeleton(risk_data, lang)
+    return skeleton.fill(glucose_value=glucose_value)
@@ -0,0 +1,211 @@
+from functools import lru_cache
+from typing import Dict, Any, List, Mapping
+
+import numpy as np
+
+from risk_calculator.risk_rules import get_rules
+
+
+# ============================================================
+# BATCH RISK SCORE CALCULATOR
+# ============================================================
+#
+# Columnar counterpart of `calculate_risk_score`. Takes one array per
+# input (a dict of arrays or a pandas DataFrame) and scores every row in
+# a handful of vectorized passes over the same compiled rule table.
+# Outputs are bit-for-bit identical to the scalar function, row by row.
+
+RISK_INPUT_FIELDS = (
+    "glucose_value",
+    "measurement_context",
+    "trend",
+    "symptoms",
+    "medication_type",
+    "meal_type",
+    "diabetes_status",
+    "age",
+    "weight_kg",
+    "height_cm",
+    "family_history",
+    "physical_activity",
+)
+
+
+@lru_cache(maxsize=4)
+def _percent_table(size: int) -> np.ndarray:
+    # Sub-scores and the capped total are small integers, so every
+    # possible `round(value / total * 100, 1)` can be precomputed with the
+    # exact same Python expression the scalar calculator uses.
+    table = np.zeros((size, size), dtype=np.float64)
+    for total in range(1, size):
+        for value in range(size):
+            table[value, total] = round((value / total) * 100, 1)
+    return table
+
+
+def _round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    # np.round scales, rounds and divides, which can disagree with the
+    # correctly-rounded builtin `round` when the scaled value sits on a .5
+    # boundary. Those rows are rare, so they are re-rounded in Python.
+    rounded = np.round(values, ndigits)
+    scaled = values * (10 ** ndigits)
+    ambiguous = np.abs((scaled - np.floor(scaled)) - 0.5) < 1e-6
+    if ambiguous.any():
+        rounded[ambiguous] = [round(float(v), ndigits) for v in values[ambiguous]]
+    return rounded
+
+
+def calculate_risk_scores(data: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Score many patients at once.
+
+    `data` maps each name in RISK_INPUT_FIELDS to an array-like of equal
+    length (a pandas DataFrame works as-is). Returns a dict of arrays
+    holding the risk score, level, BMI, BMI category, the three sub-scores
+    and their percentage breakdown.
+    """
+    rules = get_rules()
+
+    glucose = np.asarray(data["glucose_value"], dtype=np.float64)
+    context = np.asarray(data["measurement_context"]).astype(str)
+    age = np.asarray(data["age"])
+    weight = np.asarray(data["weight_kg"], dtype=np.float64)
+    height = np.asarray(data["height_cm"], dtype=np.float64)
+    family_history = np.asarray(data["family_history"]).astype(bool)
+
+    # ============================================================
+    # 1️⃣ IMMEDIATE GLYCEMIC RISK
+    # ============================================================
+
+    default_table = rules.glucose_table(rules.default_glucose_context)
+    glucose_points = default_table.point_array[default_table.index_array(glucose)]
+    for name, table in rules.glucose.items():
+        if table is not default_table:
+            in_context = context == name
+            glucose_points[in_context] = table.point_array[table.index_array(glucose[in_context])]
+
+    trend_points = rules.trend.lookup_array(data["trend"])
+
+    immediate_glycemic_risk = glucose_points + trend_points
+
+    # ============================================================
+    # 2️⃣ TREATMENT & SYMPTOMS
+    # ============================================================
+
+    symptom_points = rules.symptoms.lookup_array(data["symptoms"])
+    medication_points = rules.medication_type.lookup_array(data["medication_type"])
+    meal_points = rules.meal_type.lookup_array(data["meal_type"])
+
+    treatment_symptom_risk = symptom_points + medication_points + meal_points
+
+    # ============================================================
+    # 3️⃣ BASELINE VULNERABILITY
+    # ============================================================
+
+    diabetes_points = rules.diabetes_status.lookup_array(data["diabetes_status"])
+
+    age_points = rules.age.point_array[rules.age.index_array(age)]
+
+    height_m = np.maximum(height / 100, 0.1)
+    bmi = weight / (height_m ** 2)
+
+    bmi_index = rules.bmi.index_array(bmi)
+    bmi_points = rules.bmi.point_array[bmi_index]
+
+    family_points = np.where(family_history, rules.family_history_points, 0)
+
+    activity_points = rules.physical_activity.lookup_array(data["physical_activity"])
+
+    baseline_risk = (
+        diabetes_points +
+        age_points +
+        bmi_points +
+        family_points +
+        activity_points
+    )
+
+    total_score = np.minimum(
+        immediate_glycemic_risk + treatment_symptom_risk + baseline_risk, rules.max_score
+    )
+
+    # ============================================================
+    # RISK LEVEL CLASSIFICATION
+    # ============================================================
+
+    level_index = rules.risk_levels.index_array(total_score)
+
+    largest = max(
+        [rules.max_score] + [int(part.max()) for part in (immediate_glycemic_risk, treatment_symptom_risk, baseline_risk) if part.size]
+    )
+    percent_table = _percent_table(largest + 1)
+
+    return {
+        "risk_score": total_score,
+        "risk_level": rules.risk_levels.label_array[level_index],
+        "bmi": _round_like_python(bmi, 2),
+        "bmi_category": rules.bmi.label_array[bmi_index],
+        "immediate_glycemic_risk": immediate_glycemic_risk,
+        "treatment_symptom_risk": treatment_symptom_risk,
+        "baseline_vulnerability_risk": baseline_risk,
+        "immediate_glycemic_percentage": percent_table[immediate_glycemic_risk, total_score],
+        "treatment_symptom_percentage": percent_table[treatment_symptom_risk, total_score],
+        "baseline_vulnerability_percentage": percent_table[baseline_risk, total_score],
+    }
+
+
+def _native(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def expand_risk_results(data: Mapping[str, Any], scores: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Turn the columnar output of `calculate_risk_scores` back into one
+    dict per row, shaped exactly like `calculate_risk_score`'s return value.
+    """
+    results = []
+    for i in range(len(scores["risk_score"])):
+        row = {field: _native(data[field][i]) for field in RISK_INPUT_FIELDS}
+        total_score = int(scores["risk_score"][i])
+        bmi_category = str(scores["bmi_category"][i])
+
+        def percent(key):
+            return float(scores[key][i]) if total_score > 0 else 0
+
+        results.append({
+            "risk_score": total_score,
+            "risk_level": str(scores["risk_level"][i]),
+            "derived_metrics": {
+                "bmi": float(scores["bmi"][i]),
+                "bmi_category": bmi_category
+            },
+            "breakdown": {
+                "immediate_glycemic_risk": int(scores["immediate_glycemic_risk"][i]),
+                "treatment_symptom_risk": int(scores["treatment_symptom_risk"][i]),
+                "baseline_vulnerability_risk": int(scores["baseline_vulnerability_risk"][i])
+            },
+            "percentage_breakdown": {
+                "immediate_glycemic_percentage": percent("immediate_glycemic_percentage"),
+                "treatment_symptom_percentage": percent("treatment_symptom_percentage"),
+                "baseline_vulnerability_percentage": percent("baseline_vulnerability_percentage")
+            },
+            "attribution": {
+                "immediate_glycemic": {
+                    "glucose_context": row["measurement_context"],
+                    "glucose_value": row["glucose_value"],
+                    "trend": row["trend"]
+                },
+                "treatment_symptoms": {
+                    "symptoms": row["symptoms"],
+                    "medication": row["medication_type"],
+                    "meal_type": row["meal_type"]
+                },
+                "baseline": {
+                    "diabetes_status": row["diabetes_status"],
+                    "age": row["age"],
+                    "bmi_category": bmi_category,
+                    "family_history": row["family_history"],
+                    "physical_activity": row["physical_activity"]
+                }
+            }
+        })
+    return results
@@ -1,5 +1,7 @@
 from typing import Dict, Any
 
+from risk_calculator.risk_rules import get_rules
+
 
 # ============================================================
 # RISK SCORE CALCULATOR
@@ -20,36 +22,17 @@ def calculate_risk_score(
     physical_activity: str      # "active", "sometimes", "never"
 ) -> Dict[str, Any]:
 
+    rules = get_rules()
     total_score = 0
 
     # ============================================================
     # 1️⃣ IMMEDIATE GLYCEMIC RISK
     # ============================================================
 
-    if measurement_context == "fasting":
-        if glucose_value < 100:
-            glucose_points = 0
-        elif glucose_value <= 125:
-            glucose_points = 8
-        elif glucose_value <= 160:
-            glucose_points = 15
-        else:
-            glucose_points = 25
-    else:  # post-meal
-        if glucose_value < 140:
-            glucose_points = 0
-        elif glucose_value <= 180:
-            glucose_points = 8
-        elif glucose_value <= 250:
-            glucose_points = 15
-        else:
-            glucose_points = 25
-
-    trend_points = {
-        "improving": 0,
-        "stable": 5,
-        "worsening": 15
-    }.get(trend, 5)
+    glucose_table = rules.glucose_table(measurement_context)
+    glucose_points = glucose_table.points[glucose_table.index(glucose_value)]
+
+    trend_points = rules.trend.lookup(trend)
 
     immediate_glycemic_risk = glucose_points + trend_points
     total_score += immediate_glycemic_risk
@@ -59,23 +42,9 @@ def calculate_risk_score(
     # 2️⃣ TREATMENT & SYMPTOMS
     # ============================================================
 
-    symptom_points = {
-        "none": 0,
-        "mild": 8,
-        "severe": 15
-    }.get(symptoms, 0)
-
-    medication_points = {
-        "none": 0,
-        "oral": 5,
-        "insulin": 10
-    }.get(medication_type, 0)
-
-    meal_points = {
-        "low-carb": 0,
-        "balanced": 2,
-        "high-carb": 5
-    }.get(meal_type, 2)
+    symptom_points = rules.symptoms.lookup(symptoms)
+    medication_points = rules.medication_type.lookup(medication_type)
+    meal_points = rules.meal_type.lookup(meal_type)
 
     treatment_symptom_risk = symptom_points + medication_points + meal_points
     total_score += treatment_symptom_risk
@@ -85,39 +54,21 @@ def calculate_risk_score(
     # 3️⃣ BASELINE VULNERABILITY
     # ============================================================
 
-    diabetes_points = {
-        "non-diabetic": 0,
-        "prediabetic": 4,
-        "type2": 7,
-        "type1": 10
-    }.get(diabetes_status, 0)
+    diabetes_points = rules.diabetes_status.lookup(diabetes_status)
 
-    age_points = 0 if age < 30 else (2 if age <= 45 else 5)
+    age_points = rules.age.points[rules.age.index(age)]
 
     # ---- BMI Calculation (Safe) ----
     height_m = max(height_cm / 100, 0.1)
     bmi = weight_kg / (height_m ** 2)
 
-    if bmi < 18.5:
-        bmi_points = 0
-        bmi_category = "underweight"
-    elif bmi < 25:
-        bmi_points = 0
-        bmi_category = "normal"
-    elif bmi < 30:
-        bmi_points = 2
-        bmi_category = "overweight"
-    else:
-        bmi_points = 5
-        bmi_category = "obese"
-
-    family_points = 5 if family_history else 0
-
-    activity_points = {
-        "active": 0,
-        "sometimes": 2,
-        "never": 5
-    }.get(physical_activity, 2)
+    bmi_band = rules.bmi.index(bmi)
+    bmi_points = rules.bmi.points[bmi_band]
+    bmi_category = rules.bmi.labels[bmi_band]
+
+    family_points = rules.family_history_points if family_history else 0
+
+    activity_points = rules.physical_activity.lookup(physical_activity)
 
     baseline_risk = (
         diabetes_points +
@@ -129,22 +80,15 @@ def calculate_risk_score(
 
     total_score += baseline_risk
 
-    # Cap at 100
-    total_score = min(total_score, 100)
+    # Cap at the table's maximum (100)
+    total_score = min(total_score, rules.max_score)
 
 
     # ============================================================
     # RISK LEVEL CLASSIFICATION
     # ============================================================
 
-    if total_score <= 25:
-        risk_level = "Low Risk"
-    elif total_score <= 50:
-        risk_level = "Moderate Risk"
-    elif total_score <= 75:
-        risk_level = "High Risk"
-    else:
-        risk_level = "Critical Risk"
+    risk_level = rules.risk_level(total_score)
 
 
     # ============================================================
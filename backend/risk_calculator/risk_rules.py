@@ -0,0 +1,175 @@
+from bisect import bisect_right
+from math import inf, nextafter
+from typing import Dict, Any, List
+
+import numpy as np
+
+
+# ============================================================
+# DIABETES RISK RULE TABLE
+# ============================================================
+#
+# Every point value used by the risk calculator lives here. Banded rules
+# list their bands in ascending order; each band is either
+#   {"below": x}  -> value <  x
+#   {"up_to": x}  -> value <= x
+#   {}            -> everything above the previous band (last band only)
+# Categorical rules map an input value to points, with a default for
+# anything unrecognised.
+#
+# The table is compiled once at import into bisect edges and
+# integer-coded lookup arrays (see CompiledRules); the scalar scorer,
+# the batch scorer and the explanation engine all read from that.
+
+DIABETES_RISK_RULES: Dict[str, Any] = {
+    "version": "2024.1",
+
+    # ---- 1️⃣ Immediate glycemic risk ----
+    "glucose": {
+        # Any context other than the listed ones is scored as post-meal
+        "default_context": "post-meal",
+        "contexts": {
+            "fasting": [
+                {"below": 100, "points": 0, "band": "normal"},
+                {"up_to": 125, "points": 8, "band": "prediabetes"},
+                {"up_to": 160, "points": 15, "band": "diabetes"},
+                {"points": 25, "band": "diabetes"},
+            ],
+            "post-meal": [
+                {"below": 140, "points": 0, "band": "normal"},
+                {"up_to": 180, "points": 8, "band": "elevated"},
+                {"up_to": 250, "points": 15, "band": "high"},
+                {"points": 25, "band": "high"},
+            ],
+        },
+    },
+    "trend": {"points": {"improving": 0, "stable": 5, "worsening": 15}, "default": 5},
+
+    # ---- 2️⃣ Treatment & symptoms ----
+    "symptoms": {"points": {"none": 0, "mild": 8, "severe": 15}, "default": 0},
+    "medication_type": {"points": {"none": 0, "oral": 5, "insulin": 10}, "default": 0},
+    "meal_type": {"points": {"low-carb": 0, "balanced": 2, "high-carb": 5}, "default": 2},
+
+    # ---- 3️⃣ Baseline vulnerability ----
+    "diabetes_status": {
+        "points": {"non-diabetic": 0, "prediabetic": 4, "type2": 7, "type1": 10},
+        "default": 0,
+    },
+    "age": [
+        {"below": 30, "points": 0},
+        {"up_to": 45, "points": 2},
+        {"points": 5},
+    ],
+    "bmi": [
+        {"below": 18.5, "points": 0, "band": "underweight"},
+        {"below": 25, "points": 0, "band": "normal"},
+        {"below": 30, "points": 2, "band": "overweight"},
+        {"points": 5, "band": "obese"},
+    ],
+    "family_history": {"points": 5},
+    "physical_activity": {"points": {"active": 0, "sometimes": 2, "never": 5}, "default": 2},
+
+    # ---- Totals ----
+    "max_score": 100,
+    "risk_levels": [
+        {"up_to": 25, "band": "Low Risk"},
+        {"up_to": 50, "band": "Moderate Risk"},
+        {"up_to": 75, "band": "High Risk"},
+        {"band": "Critical Risk"},
+    ],
+}
+
+
+class BandTable:
+    """Ascending bands compiled to exclusive upper edges for bisect / searchsorted."""
+
+    def __init__(self, bands: List[Dict[str, Any]]):
+        edges = []
+        for band in bands[:-1]:
+            if "below" in band:
+                edges.append(float(band["below"]))
+            else:
+                # value <= x is value < the next float above x
+                edges.append(nextafter(float(band["up_to"]), inf))
+        self.edges = tuple(edges)
+        self.points = tuple(band.get("points", 0) for band in bands)
+        self.labels = tuple(band.get("band") for band in bands)
+        self.edge_array = np.array(self.edges, dtype=np.float64)
+        self.point_array = np.array(self.points, dtype=np.int64)
+        self.label_array = np.array(self.labels, dtype=object)
+
+    def index(self, value) -> int:
+        return bisect_right(self.edges, value)
+
+    def index_array(self, values: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.edge_array, values, side="right")
+
+
+class CategoryTable:
+    """Categorical points, integer-coded against a sorted vocabulary for arrays."""
+
+    def __init__(self, rule: Dict[str, Any]):
+        self.points = dict(rule["points"])
+        self.default = rule["default"]
+        vocabulary = sorted(self.points)
+        self.vocabulary = np.array(vocabulary)
+        self.point_array = np.array([self.points[v] for v in vocabulary], dtype=np.int64)
+
+    def lookup(self, value) -> int:
+        return self.points.get(value, self.default)
+
+    def lookup_array(self, values) -> np.ndarray:
+        values = np.asarray(values).astype(str)
+        codes = np.minimum(np.searchsorted(self.vocabulary, values), len(self.vocabulary) - 1)
+        known = self.vocabulary[codes] == values
+        return np.where(known, self.point_array[codes], self.default)
+
+
+class CompiledRules:
+    def __init__(self, table: Dict[str, Any]):
+        self.version = table["version"]
+
+        glucose = table["glucose"]
+        self.glucose = {context: BandTable(bands) for context, bands in glucose["contexts"].items()}
+        self.default_glucose_context = glucose["default_context"]
+
+        self.trend = CategoryTable(table["trend"])
+        self.symptoms = CategoryTable(table["symptoms"])
+        self.medication_type = CategoryTable(table["medication_type"])
+        self.meal_type = CategoryTable(table["meal_type"])
+        self.diabetes_status = CategoryTable(table["diabetes_status"])
+        self.physical_activity = CategoryTable(table["physical_activity"])
+
+        self.age = BandTable(table["age"])
+        self.bmi = BandTable(table["bmi"])
+        self.family_history_points = table["family_history"]["points"]
+
+        self.max_score = table["max_score"]
+        self.risk_levels = BandTable(table["risk_levels"])
+
+    def resolve_glucose_context(self, context: str) -> str:
+        return context if context in self.glucose else self.default_glucose_context
+
+    def glucose_table(self, context: str) -> BandTable:
+        return self.glucose[self.resolve_glucose_context(context)]
+
+    def glucose_band(self, context: str, glucose_value: float) -> str:
+        table = self.glucose_table(context)
+        return table.labels[table.index(glucose_value)]
+
+    def risk_level(self, risk_score: float) -> str:
+        return self.risk_levels.labels[self.risk_levels.index(risk_score)]
+
+
+_active_rules = CompiledRules(DIABETES_RISK_RULES)
+
+
+def get_rules() -> CompiledRules:
+    return _active_rules
+
+
+def load_rules(table: Dict[str, Any]) -> CompiledRules:
+    """Compile `table` and make it the rule set used by all scorers."""
+    global _active_rules
+    _active_rules = CompiledRules(table)
+    return _active_rules
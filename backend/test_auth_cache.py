@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# get_current_user serves repeat requests from the in-process caches and
+# drops a user's entry when their profile or role changes.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "auth_cache.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from auth.auth_utils import auth_cache_stats
+
+client = TestClient(main.app)
+
+
+def login(email, phone_number):
+    credentials = {"email": email, "password": "secret1"}
+    client.post("/register", json={"name": "Cache", "phone_number": phone_number, **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_repeat_requests_hit_cache():
+    headers = login("cache@example.com", "66666666")
+    client.get("/me", headers=headers)
+    before = auth_cache_stats()
+    for _ in range(5):
+        assert client.get("/me", headers=headers).status_code == 200
+    after = auth_cache_stats()
+    assert after["users"]["hits"] - before["users"]["hits"] == 5
+    assert after["token_claims"]["hits"] - before["token_claims"]["hits"] == 5
+    assert after["users"]["misses"] == before["users"]["misses"]
+
+
+def test_admin_toggle_invalidates_cached_user():
+    admin = login("cache-admin@aiassistant.in", "77777777")
+    headers = login("cache-user@example.com", "88888888")
+    me = client.get("/me", headers=headers).json()
+    assert me["is_admin"] is False
+
+    client.post(f"/users/{me['id']}/admin-toggle", json={"is_admin": True}, headers=admin)
+    assert client.get("/me", headers=headers).json()["is_admin"] is True
+
+
+if __name__ == "__main__":
+    test_repeat_requests_hit_cache()
+    test_admin_toggle_invalidates_cached_user()
+    print("Auth cache hits and invalidation behave as expected")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Parity test: batch scorer must match calculate_risk_score row by row
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from risk_calculator.diabetes_risk_calculator import calculate_risk_score
+from risk_calculator.batch_risk_calculator import calculate_risk_scores, expand_risk_results, RISK_INPUT_FIELDS
+
+
+def random_inputs(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return {
+        # Integer glucose values hit every band boundary exactly
+        "glucose_value": np.concatenate([
+            rng.integers(60, 320, n // 2).astype(float),
+            rng.uniform(60, 320, n - n // 2),
+        ]),
+        "measurement_context": rng.choice(["fasting", "post-meal", "random"], n),
+        "trend": rng.choice(["improving", "stable", "worsening", "unknown"], n),
+        "symptoms": rng.choice(["none", "mild", "severe", "other"], n),
+        "medication_type": rng.choice(["none", "oral", "insulin", "other"], n),
+        "meal_type": rng.choice(["low-carb", "balanced", "high-carb", "other"], n),
+        "diabetes_status": rng.choice(["non-diabetic", "prediabetic", "type2", "type1", "other"], n),
+        "age": rng.integers(18, 90, n),
+        "weight_kg": np.round(rng.uniform(35, 160, n), 1),
+        "height_cm": np.round(rng.uniform(140, 205, n), 1),
+        "family_history": rng.integers(0, 2, n).astype(bool),
+        "physical_activity": rng.choice(["active", "sometimes", "never", "other"], n),
+    }
+
+
+def scalar_row(inputs, i):
+    kwargs = {field: inputs[field][i] for field in RISK_INPUT_FIELDS}
+    kwargs = {k: (v.item() if hasattr(v, "item") else v) for k, v in kwargs.items()}
+    return calculate_risk_score(**kwargs)
+
+
+def test_batch_matches_scalar():
+    inputs = random_inputs(20000)
+    batch = calculate_risk_scores(inputs)
+
+    for i in range(len(inputs["glucose_value"])):
+        expected = scalar_row(inputs, i)
+        assert batch["risk_score"][i] == expected["risk_score"], i
+        assert batch["risk_level"][i] == expected["risk_level"], i
+        assert batch["bmi"][i] == expected["derived_metrics"]["bmi"], i
+        assert batch["bmi_category"][i] == expected["derived_metrics"]["bmi_category"], i
+        for key, value in expected["breakdown"].items():
+            assert batch[key][i] == value, (i, key)
+        for key, value in expected["percentage_breakdown"].items():
+            assert batch[key][i] == value, (i, key)
+
+
+def test_batch_accepts_plain_lists():
+    # Columns as the API builds them: Python lists of Python scalars
+    inputs = random_inputs(500, seed=11)
+    from_arrays = calculate_risk_scores(inputs)
+    from_lists = calculate_risk_scores({field: values.tolist() for field, values in inputs.items()})
+    for key, values in from_arrays.items():
+        assert list(values) == list(from_lists[key]), key
+
+
+def test_expanded_results_match_scalar():
+    inputs = random_inputs(2000, seed=3)
+    rows = expand_risk_results(inputs, calculate_risk_scores(inputs))
+    for i, row in enumerate(rows):
+        assert row == scalar_row(inputs, i), i
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_batch_accepts_plain_lists()
+    test_expanded_results_match_scalar()
+    print("Batch scorer matches scalar scorer")
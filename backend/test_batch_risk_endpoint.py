@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# POST /diabetes-risk/batch answers exactly what posting each item to
+# /diabetes-risk in turn would (scores, breakdowns and comparisons with the
+# previous item), stores the records in input order and enforces
+# MAX_BATCH_SIZE.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "batch_risk_endpoint.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from api.risk_routes import MAX_BATCH_SIZE
+from database import SessionLocal
+from models.diabetes_db_model import DiabetesRiskRecord
+from models.user import User
+from test_batch_risk_calc import random_inputs
+from risk_calculator.batch_risk_calculator import RISK_INPUT_FIELDS
+
+client = TestClient(main.app)
+
+
+def auth_headers(email: str, phone: str):
+    credentials = {"email": email, "password": "secret1"}
+    client.post("/register", json={"name": "Batch", "phone_number": phone, **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def payloads(n: int, seed: int) -> list:
+    inputs = random_inputs(n, seed=seed)
+    return [
+        {"user_id": 1, **{field: inputs[field][i].item() for field in RISK_INPUT_FIELDS}}
+        for i in range(n)
+    ]
+
+
+def stored_glucose(email: str) -> list:
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        return [g for g, in db.query(DiabetesRiskRecord.glucose_value).filter(
+            DiabetesRiskRecord.user_id == user_id
+        ).order_by(DiabetesRiskRecord.created_at, DiabetesRiskRecord.record_id)]
+    finally:
+        db.close()
+
+
+def without_ids(result: dict) -> dict:
+    # Record ids and timestamps differ between the two users
+    result = dict(result)
+    result.pop("record_id")
+    if "comparison" in result:
+        result["comparison"] = {
+            k: v for k, v in result["comparison"].items() if k not in ("previous_record_id", "previous_created_at")
+        }
+    return result
+
+
+def test_batch_matches_single_requests_in_order():
+    items = payloads(40, seed=5)
+    single_headers = auth_headers("batch-single@aiassistant.in", "66000000")
+    batch_headers = auth_headers("batch-many@aiassistant.in", "66000001")
+
+    singles = []
+    for item in items:
+        response = client.post("/diabetes-risk", json=item, headers=single_headers)
+        assert response.status_code == 200, response.text
+        singles.append(response.json())
+
+    response = client.post("/diabetes-risk/batch", json=items, headers=batch_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["count"] == len(items)
+    assert "comparison" not in body["results"][0]
+    assert [without_ids(r) for r in body["results"]] == [without_ids(r) for r in singles]
+
+    # Saved in input order, each comparison pointing at the item before it
+    assert stored_glucose("batch-many@aiassistant.in") == [item["glucose_value"] for item in items]
+    ids = [r["record_id"] for r in body["results"]]
+    assert ids == sorted(ids)
+    assert [r["comparison"]["previous_record_id"] for r in body["results"][1:]] == ids[:-1]
+
+
+def test_batch_size_limits():
+    headers = auth_headers("batch-limits@aiassistant.in", "66000002")
+
+    response = client.post("/diabetes-risk/batch", json=payloads(MAX_BATCH_SIZE + 1, seed=9), headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Batch size exceeds limit of {MAX_BATCH_SIZE}"
+
+    response = client.post("/diabetes-risk/batch", json=[], headers=headers)
+    assert response.status_code == 400
+    assert stored_glucose("batch-limits@aiassistant.in") == []
+
+    response = client.post("/diabetes-risk/batch", json=payloads(MAX_BATCH_SIZE, seed=9), headers=headers)
+    assert response.status_code == 200 and response.json()["count"] == MAX_BATCH_SIZE
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_requests_in_order()
+    test_batch_size_limits()
+    print("Batch risk endpoint tests passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# GET /dashboard-summary returns what the health dashboard used to compute
+# in the browser from the user's full metrics history: latest and average
+# glucose, HbA1c estimate, BMI, the last seven glucose readings and the
+# number of risk assessments. These users have no rollup row, so the
+# summary is aggregated from user_metrics in SQL.
+import math
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "dashboard_summary.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal
+from models.diabetes_db_model import DiabetesRiskRecord
+from models.user import User
+from models.user_metrics import UserMetrics
+from models.user_metrics_rollup import UserMetricsRollup
+
+client = TestClient(main.app)
+
+START = datetime(2024, 3, 1, 7, 30)
+# Averages to 142.5: the dashboard rounds halves up (143), not to even
+GLUCOSE = [98, 252, 131, 176, 112, 143, 120, 188, 95, 160, 134, 101]
+
+
+def auth_headers(email: str, phone: str):
+    credentials = {"email": email, "password": "secret1"}
+    client.post("/register", json={"name": "Summary", "phone_number": phone, **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_history(email: str):
+    """Diabetes readings out of insertion order, two other-disease rows and three risk records, without a rollup."""
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+        if db.query(UserMetrics).filter(UserMetrics.user_id == user_id).count():
+            return
+        for i, glucose in enumerate(GLUCOSE):
+            db.add(UserMetrics(
+                user_id=user_id, disease_type="diabetes", glucose_value=glucose,
+                weight_kg=70 + i * 1.3, height_cm=165 + i % 3, diabetes_status="type2" if i % 2 else "prediabetic",
+                # Even rows are dated in reverse, so created_at order is not id order
+                created_at=START + timedelta(days=i if i % 2 else 30 - i),
+            ))
+        db.add_all(
+            UserMetrics(user_id=user_id, disease_type="heart", weight_kg=90, height_cm=180, created_at=START + timedelta(days=60))
+            for _ in range(2)
+        )
+        db.add_all(
+            DiabetesRiskRecord(user_id=user_id, glucose_value=140, risk_score=score, risk_level="Moderate Risk",
+                               created_at=START + timedelta(days=i))
+            for i, score in enumerate((30, 55, 48))
+        )
+        db.commit()
+        assert db.get(UserMetricsRollup, (user_id, "diabetes")) is None
+    finally:
+        db.close()
+
+
+def client_side_summary(metrics: list) -> dict:
+    """Port of the dashboard's former in-browser aggregation over GET /user-metrics."""
+    diabetes = [m for m in metrics if m["disease_type"] == "diabetes"]
+    newest_first = sorted(diabetes, key=lambda m: m["timestamp"] or 0, reverse=True)
+    latest = newest_first[0] if newest_first else None
+
+    def bmi(m):
+        return round(m["weight_kg"] / (m["height_cm"] / 100) ** 2, 1) if m["weight_kg"] and m["height_cm"] else None
+
+    trend = [
+        {"glucose": float(m["glucose_value"]), "date": m["created_at"], "bmi": bmi(m)}
+        for m in reversed(newest_first[:7]) if m["glucose_value"] is not None
+    ]
+    values = [m["glucose_value"] for m in diabetes if m["glucose_value"] is not None]
+    # Math.round
+    avg = math.floor(sum(values) / len(values) + 0.5) if values else None
+    return {
+        "readings": len(values),
+        "latest_glucose": latest["glucose_value"] if latest else None,
+        "avg_glucose": avg,
+        "hba1c": round((avg + 46.7) / 28.7, 1) if avg is not None else None,
+        "weight_kg": latest["weight_kg"] if latest else None,
+        "height_cm": latest["height_cm"] if latest else None,
+        "diabetes_status": latest["diabetes_status"] if latest else None,
+        "bmi": bmi(latest) if latest else None,
+        "glucose_trend": trend,
+    }
+
+
+def test_summary_matches_client_side_computation():
+    headers = auth_headers("summary@aiassistant.in", "64000000")
+    seed_history("summary@aiassistant.in")
+
+    metrics = client.get("/user-metrics", params={"limit": 1000}, headers=headers).json()
+    summary = client.get("/dashboard-summary", headers=headers).json()
+
+    expected = client_side_summary(metrics)
+    assert expected["avg_glucose"] == 143 and len(expected["glucose_trend"]) == 7
+    for key, value in expected.items():
+        assert summary[key] == value, (key, summary[key], value)
+    assert summary["latest_at"] == max(m["created_at"] for m in metrics if m["disease_type"] == "diabetes")
+    assert summary["total_assessments"] == 3
+    # No rollup row, so no risk trend either
+    assert summary["risk"] is None
+
+
+def test_summary_for_user_without_history():
+    headers = auth_headers("summary-empty@aiassistant.in", "64000001")
+
+    summary = client.get("/dashboard-summary", headers=headers).json()
+    assert summary == {
+        "readings": 0, "latest_at": None, "latest_glucose": None, "avg_glucose": None, "hba1c": None,
+        "diabetes_status": None, "weight_kg": None, "height_cm": None, "bmi": None,
+        "glucose_trend": [], "risk": None, "total_assessments": 0,
+    }
+
+
+if __name__ == "__main__":
+    test_summary_matches_client_side_computation()
+    test_summary_for_user_without_history()
+    print("Dashboard summary tests passed")
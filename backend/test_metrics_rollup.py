@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+# The per-user rollup is kept current by every insert endpoint, a rebuild
+# from raw rows reproduces it exactly, /dashboard-summary is served from it,
+# and users without a rollup row get the same summary from SQL aggregates.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "metrics_rollup.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal
+from jobs.rebuild_metrics_rollup import _ROLLUP_FIELDS, rebuild_metrics_rollup
+from models.diabetes_db_model import DiabetesRiskRecord
+from models.user import User
+from models.user_metrics import UserMetrics
+from models.user_metrics_rollup import UserMetricsRollup
+
+client = TestClient(main.app)
+
+EMAIL = "rollup@aiassistant.in"
+
+RISK_PAYLOAD = {
+    "user_id": 1, "glucose_value": 150, "measurement_context": "fasting", "trend": "stable", "symptoms": "mild",
+    "medication_type": "oral", "meal_type": "balanced", "physical_activity": "sometimes",
+    "diabetes_status": "type2", "age": 50, "weight_kg": 80, "height_cm": 170, "family_history": True,
+}
+
+
+def auth_headers():
+    credentials = {"email": EMAIL, "password": "secret1"}
+    client.post("/register", json={"name": "Rollup", "phone_number": "65000000", **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def user_id() -> int:
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == EMAIL).scalar()
+    finally:
+        db.close()
+
+
+def rollup_rows(uid: int) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.query(UserMetricsRollup).filter(UserMetricsRollup.user_id == uid).all()
+        return {row.disease_type: {field: getattr(row, field) for field in _ROLLUP_FIELDS} for row in rows}
+    finally:
+        db.close()
+
+
+def seed_through_api(headers):
+    if client.get("/user-metrics", params={"limit": 1}, headers=headers).json():
+        return
+    for i, glucose in enumerate([110, 182, None, 95, 240, 131, 156, 120, 99, 205]):
+        metric = {"disease_type": "diabetes", "weight_kg": 70 + i, "height_cm": 168, "diabetes_status": "type2"}
+        if glucose is not None:
+            metric["glucose_value"] = glucose
+        assert client.post("/user-metrics", json=metric, headers=headers).status_code == 200
+    client.post("/user-metrics", json={"disease_type": "heart", "weight_kg": 91, "height_cm": 180}, headers=headers)
+
+    for glucose in (150, 210):
+        assert client.post("/diabetes-risk", json={**RISK_PAYLOAD, "glucose_value": glucose}, headers=headers).status_code == 200
+    batch = [{**RISK_PAYLOAD, "glucose_value": glucose} for glucose in (90, 260, 175)]
+    assert client.post("/diabetes-risk/batch", json=batch, headers=headers).status_code == 200
+
+
+def test_inserts_keep_rollup_equal_to_raw_rows():
+    headers = auth_headers()
+    seed_through_api(headers)
+    uid = user_id()
+
+    db = SessionLocal()
+    try:
+        metrics = db.query(UserMetrics).filter(UserMetrics.user_id == uid, UserMetrics.disease_type == "diabetes").order_by(
+            UserMetrics.created_at, UserMetrics.metric_id
+        ).all()
+        records = db.query(DiabetesRiskRecord).filter(DiabetesRiskRecord.user_id == uid).order_by(
+            DiabetesRiskRecord.created_at, DiabetesRiskRecord.record_id
+        ).all()
+        glucose = [m.glucose_value for m in metrics if m.glucose_value is not None]
+        expected = {
+            "metric_count": len(metrics),
+            "glucose_count": len(glucose),
+            "glucose_sum": sum(glucose),
+            "latest_glucose": metrics[-1].glucose_value,
+            "latest_weight_kg": metrics[-1].weight_kg,
+            "latest_metric_at": metrics[-1].created_at,
+            "recent_glucose": glucose[-7:],
+            "total_assessments": len(records),
+            "risk_score_sum": sum(r.risk_score for r in records),
+            "latest_risk_score": records[-1].risk_score,
+            "previous_risk_score": records[-2].risk_score,
+        }
+    finally:
+        db.close()
+
+    rollups = rollup_rows(uid)
+    assert set(rollups) == {"diabetes", "heart"}
+    diabetes = dict(rollups["diabetes"], recent_glucose=[p["glucose"] for p in rollups["diabetes"]["recent_glucose"]])
+    for key, value in expected.items():
+        assert diabetes[key] == value, (key, diabetes[key], value)
+    assert rollups["heart"]["metric_count"] == 1 and rollups["heart"]["total_assessments"] == 0
+
+
+def test_rebuild_reproduces_rollup_and_summary():
+    headers = auth_headers()
+    seed_through_api(headers)
+    uid = user_id()
+
+    incremental = rollup_rows(uid)
+    summary = client.get("/dashboard-summary", headers=headers).json()
+
+    assert rebuild_metrics_rollup(uid) == 2
+    assert rollup_rows(uid) == incremental
+    assert client.get("/dashboard-summary", headers=headers).json() == summary
+
+
+def test_summary_reads_rollup_row():
+    headers = auth_headers()
+    seed_through_api(headers)
+    uid = user_id()
+    summary = client.get("/dashboard-summary", headers=headers).json()
+    assert summary["readings"] == 9 and summary["total_assessments"] == 5
+    assert summary["risk"]["total_assessments"] == 5
+
+    # A change made only to the rollup shows up in the summary
+    db = SessionLocal()
+    try:
+        db.query(UserMetricsRollup).filter(
+            UserMetricsRollup.user_id == uid, UserMetricsRollup.disease_type == "diabetes"
+        ).update({"latest_glucose": 999.0, "glucose_sum": UserMetricsRollup.glucose_sum + 9})
+        db.commit()
+    finally:
+        db.close()
+    try:
+        tampered = client.get("/dashboard-summary", headers=headers).json()
+        assert tampered["latest_glucose"] == 999.0
+        assert tampered["avg_glucose"] == summary["avg_glucose"] + 1
+    finally:
+        rebuild_metrics_rollup(uid)
+    assert client.get("/dashboard-summary", headers=headers).json() == summary
+
+
+def test_sql_fallback_without_rollup_row():
+    headers = auth_headers()
+    seed_through_api(headers)
+    uid = user_id()
+    from_rollup = client.get("/dashboard-summary", headers=headers).json()
+
+    db = SessionLocal()
+    try:
+        db.query(UserMetricsRollup).filter(UserMetricsRollup.user_id == uid).delete()
+        db.commit()
+    finally:
+        db.close()
+    try:
+        from_sql = client.get("/dashboard-summary", headers=headers).json()
+        # The risk trend is only kept on the rollup
+        assert from_sql.pop("risk") is None
+        from_rollup.pop("risk")
+        assert from_sql == from_rollup
+    finally:
+        rebuild_metrics_rollup(uid)
+
+
+if __name__ == "__main__":
+    test_inserts_keep_rollup_equal_to_raw_rows()
+    test_rebuild_reproduces_rollup_and_summary()
+    test_summary_reads_rollup_row()
+    test_sql_fallback_without_rollup_row()
+    print("Metrics rollup tests passed")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+# GET /users/{id}/recommendations pages newest first with a keyset cursor,
+# reads both shared recommendation sets and legacy inline lists, and omits
+# the lists in summary mode.
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "recommendation_history.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from sqlalchemy import inspect, text
+
+from database import SessionLocal, engine
+from models.recommendations import DiabetesRecommendation, RecommendationSet, store_recommendation_set
+from jobs.migrate_recommendation_sets import migrate_recommendation_sets
+from risk_calculator.diabetes_risk_calculator import calculate_risk_score
+
+client = TestClient(main.app)
+
+
+def admin_headers():
+    credentials = {"email": "history@aiassistant.in", "password": "secret1"}
+    client.post("/register", json={"name": "History", "phone_number": "62000000", **credentials})
+    login = client.post("/login", json=credentials).json()
+    return login["user"]["id"], {"Authorization": f"Bearer {login['access_token']}"}
+
+
+def seed_history(user_id, n=45):
+    db = SessionLocal()
+    try:
+        db.query(DiabetesRecommendation).filter(DiabetesRecommendation.user_id == user_id).delete()
+        start = datetime(2026, 1, 1)
+        for i in range(n):
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            if i % 3 == 0:
+                stored = {"recommendations": [f"legacy {i}"]}
+            else:
+                stored = {"recommendation_set_hash": store_recommendation_set(db, [f"shared {i % 4}"])}
+            db.add(DiabetesRecommendation(
+                user_id=user_id, risk_score=i, risk_level="Low Risk",
+                created_at=start + timedelta(minutes=i // 2), **stored
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def all_pages(user_id, headers, **params):
+    items, cursor = [], None
+    while True:
+        response = client.get(
+            f"/users/{user_id}/recommendations",
+            params={"limit": 10, **params, **({"cursor": cursor} if cursor else {})},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        body = response.json()
+        items += body["diabetes"]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items
+
+
+def test_pages_newest_first():
+    user_id, headers = admin_headers()
+    seed_history(user_id)
+    items = all_pages(user_id, headers)
+    assert [item["risk_score"] for item in items] == list(range(44, -1, -1))
+    assert items[0]["recommendations"] == ["shared 0"]     # 44: shared set
+    assert items[2]["recommendations"] == ["legacy 42"]    # 42: inline copy
+
+
+def test_summary_mode_omits_lists():
+    user_id, headers = admin_headers()
+    seed_history(user_id)
+    items = all_pages(user_id, headers, summary=True)
+    assert len(items) == 45
+    assert all("recommendations" not in item for item in items)
+
+
+def test_bad_cursor_rejected():
+    user_id, headers = admin_headers()
+    response = client.get(f"/users/{user_id}/recommendations", params={"cursor": "zz"}, headers=headers)
+    assert response.status_code == 400
+
+
+def risk_result(glucose_value):
+    return calculate_risk_score(
+        glucose_value=glucose_value, measurement_context="fasting", trend="stable", symptoms="mild",
+        medication_type="oral", meal_type="balanced", diabetes_status="type2", age=50,
+        weight_kg=80, height_cm=170, family_history=True, physical_activity="sometimes",
+    )
+
+
+def history_lists(user_id, headers):
+    return [item["recommendations"] for item in all_pages(user_id, headers)]
+
+
+def test_readings_in_one_bucket_share_a_set():
+    user_id, headers = admin_headers()
+    seed_history(user_id, n=0)
+    responses = [
+        client.post("/diabetes-recommendations", json=risk_result(glucose), headers=headers).json()
+        for glucose in (150.0, 172.5)
+    ]
+    assert "150.0 mg/dL" in responses[0]["recommendations"][0]
+    assert "172.5 mg/dL" in responses[1]["recommendations"][0]
+
+    db = SessionLocal()
+    try:
+        rows = db.query(DiabetesRecommendation).filter(DiabetesRecommendation.user_id == user_id).all()
+        assert len({row.recommendation_set_hash for row in rows}) == 1
+        assert sorted(row.glucose_value for row in rows) == [150.0, 172.5]
+        stored = db.get(RecommendationSet, rows[0].recommendation_set_hash).recommendations
+        assert "{glucose_value}" in stored[0]
+    finally:
+        db.close()
+
+    # History fills each row's own reading back in
+    assert history_lists(user_id, headers) == [r["recommendations"] for r in reversed(responses)]
+
+
+def test_migration_reopens_glucose_sentences():
+    user_id, headers = admin_headers()
+    seed_history(user_id, n=0)
+    from recommendations.diabetes_recommendations import generate_diabetes_recommendations
+
+    legacy = [generate_diabetes_recommendations(risk_result(glucose)) for glucose in (140.0, 190.0)]
+    db = SessionLocal()
+    try:
+        for i, recommendations in enumerate(legacy):
+            db.add(DiabetesRecommendation(
+                user_id=user_id, risk_score=i, risk_level="High Risk",
+                recommendations=recommendations, created_at=datetime(2026, 2, 1, 0, i),
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+    report = migrate_recommendation_sets()
+    assert report["rows"] >= 2
+    db = SessionLocal()
+    try:
+        rows = db.query(DiabetesRecommendation).filter(DiabetesRecommendation.user_id == user_id).all()
+        assert len({row.recommendation_set_hash for row in rows}) == 1
+        assert all(row.recommendations is None for row in rows)
+    finally:
+        db.close()
+    assert history_lists(user_id, headers) == list(reversed(legacy))
+
+
+def test_schema_guard_relaxes_legacy_not_null():
+    # A table created before recommendation sets existed, with one old row
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE diabetes_recommendations"))
+        conn.execute(text(
+            "CREATE TABLE diabetes_recommendations (id INTEGER PRIMARY KEY, user_id INTEGER, "
+            "risk_score INTEGER NOT NULL, risk_level VARCHAR(50) NOT NULL, "
+            "recommendations JSON NOT NULL, created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO diabetes_recommendations (user_id, risk_score, risk_level, recommendations) "
+            "VALUES (1, 40, 'Moderate Risk', '[\"legacy\"]')"
+        ))
+
+    main.ensure_recommendation_schema()
+
+    columns = {col["name"]: col for col in inspect(engine).get_columns("diabetes_recommendations")}
+    assert columns["recommendations"]["nullable"] and "recommendation_set_hash" in columns
+    indexes = {index["name"] for index in inspect(engine).get_indexes("diabetes_recommendations")}
+    assert "ix_diabetes_recommendations_user_created" in indexes
+
+    db = SessionLocal()
+    try:
+        assert [row.recommendations for row in db.query(DiabetesRecommendation)] == [["legacy"]]
+        # A set-only write, which the NOT NULL column used to reject
+        db.add(DiabetesRecommendation(
+            user_id=1, risk_score=10, risk_level="Low Risk",
+            recommendation_set_hash=store_recommendation_set(db, ["shared"]),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_pages_newest_first()
+    test_summary_mode_omits_lists()
+    test_bad_cursor_rejected()
+    test_readings_in_one_bucket_share_a_set()
+    test_migration_reopens_glucose_sentences()
+    test_schema_guard_relaxes_legacy_not_null()
+    print("Recommendation history tests passed")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# Each authenticated request may check out at most one pooled connection:
+# get_current_user and the route body share the request-scoped session
+# (requests served entirely from the auth cache need none).
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "session_scope.db")
+os.environ["USE_ASYNC_DB"] = "false"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from database import engine
+
+client = TestClient(main.app)
+
+RISK_PAYLOAD = {
+    "user_id": 1,
+    "glucose_value": 150,
+    "measurement_context": "fasting",
+    "trend": "stable",
+    "symptoms": "mild",
+    "medication_type": "oral",
+    "meal_type": "balanced",
+    "physical_activity": "sometimes",
+    "diabetes_status": "type2",
+    "age": 50,
+    "weight_kg": 80,
+    "height_cm": 170,
+    "family_history": True,
+}
+
+
+class CheckoutCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def auth_headers():
+    credentials = {"email": "scope@aiassistant.in", "password": "secret1"}
+    client.post("/register", json={"name": "Scope", "phone_number": "55555555", **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def checkouts_for(method, url, **kwargs):
+    counter = CheckoutCounter()
+    event.listen(engine, "checkout", counter)
+    try:
+        response = client.request(method, url, **kwargs)
+    finally:
+        event.remove(engine, "checkout", counter)
+    assert response.status_code == 200, (url, response.status_code, response.text)
+    return counter.count
+
+
+def test_at_most_one_connection_per_request():
+    headers = auth_headers()
+    risk = client.post("/diabetes-risk", json=RISK_PAYLOAD, headers=headers).json()
+
+    requests = [
+        ("POST", "/diabetes-risk", {"json": RISK_PAYLOAD}),
+        ("POST", "/diabetes-risk/batch", {"json": [RISK_PAYLOAD, RISK_PAYLOAD]}),
+        ("POST", "/diabetes-assessment", {"json": RISK_PAYLOAD}),
+        ("POST", "/diabetes-recommendations", {"json": risk}),
+        ("POST", "/user-metrics", {"json": {**RISK_PAYLOAD, "disease_type": "diabetes"}}),
+        ("GET", "/user-metrics", {}),
+        ("GET", "/dashboard-summary", {}),
+        ("GET", "/me", {}),
+        ("POST", "/me", {"json": {"name": "Scope", "email": "scope@aiassistant.in", "phone_number": "55555555"}}),
+        ("GET", "/users", {}),
+        ("GET", "/admin/stats", {}),
+        ("GET", "/users/1/recommendations", {}),
+    ]
+    for method, url, kwargs in requests:
+        assert checkouts_for(method, url, headers=headers, **kwargs) <= 1, (method, url)
+
+
+if __name__ == "__main__":
+    test_at_most_one_connection_per_request()
+    print("No request used more than one pooled connection")
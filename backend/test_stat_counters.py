@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# /admin/stats is served from stat_counters, which every insert and delete
+# keeps equal to the real row counts; the reconcile job repairs drift from
+# rows written outside the API.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "stat_counters.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal
+from models.user import User
+from models.diabetes_db_model import DiabetesRiskRecord
+from jobs.reconcile_stat_counters import reconcile_stat_counters
+
+client = TestClient(main.app)
+
+RISK_PAYLOAD = {
+    "user_id": 1,
+    "glucose_value": 150,
+    "measurement_context": "fasting",
+    "trend": "stable",
+    "symptoms": "mild",
+    "medication_type": "oral",
+    "meal_type": "balanced",
+    "physical_activity": "sometimes",
+    "diabetes_status": "type2",
+    "age": 50,
+    "weight_kg": 80,
+    "height_cm": 170,
+    "family_history": True,
+}
+
+
+def register(email, phone_number):
+    credentials = {"email": email, "password": "secret1"}
+    client.post("/register", json={"name": "Stats", "phone_number": phone_number, **credentials})
+    login = client.post("/login", json=credentials).json()
+    return login["user"]["id"], {"Authorization": f"Bearer {login['access_token']}"}
+
+
+def admin_stats(headers):
+    response = client.get("/admin/stats", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_counters_follow_inserts_and_deletes():
+    _, headers = register("stats-admin@aiassistant.in", "70000001")
+    other_id, _ = register("stats-user@example.com", "70000002")
+    # Other test modules may share the database and seed rows directly
+    reconcile_stat_counters()
+    before = admin_stats(headers)
+
+    client.post("/diabetes-risk", json=RISK_PAYLOAD, headers=headers)
+    client.post("/diabetes-risk/batch", json=[RISK_PAYLOAD, {**RISK_PAYLOAD, "glucose_value": 90}], headers=headers)
+    client.post("/diabetes-assessment", json=RISK_PAYLOAD, headers=headers)
+    client.delete(f"/users/{other_id}", headers=headers)
+
+    stats = admin_stats(headers)
+    assert stats["total_assessments"] == before["total_assessments"] + 4
+    assert stats["total_recommendations"] == before["total_recommendations"] + 1
+    assert stats["total_users"] == before["total_users"] - 1
+    assert len(stats["assessments_per_day"]) == 30
+    assert stats["assessments_per_day"][-1]["count"] == before["assessments_per_day"][-1]["count"] + 4
+
+    db = SessionLocal()
+    try:
+        assert stats["total_users"] == db.query(User).count()
+        assert stats["total_assessments"] == db.query(DiabetesRiskRecord).count()
+        levels = {}
+        for (risk_level,) in db.query(DiabetesRiskRecord.risk_level):
+            levels[risk_level] = levels.get(risk_level, 0) + 1
+        assert stats["risk_levels"] == levels
+    finally:
+        db.close()
+    assert reconcile_stat_counters(dry_run=True) == {}
+
+
+def test_reconcile_repairs_drift():
+    _, headers = register("stats-admin@aiassistant.in", "70000001")
+    reconcile_stat_counters()
+    before = admin_stats(headers)
+
+    # Rows written behind the API's back
+    db = SessionLocal()
+    db.add(User(name="Imported", email="imported@example.com", phone_number="70000003", hashed_password="x"))
+    db.commit()
+    db.close()
+    assert admin_stats(headers)["total_users"] == before["total_users"]
+
+    assert reconcile_stat_counters() == {"users": 1}
+    assert admin_stats(headers)["total_users"] == before["total_users"] + 1
+    assert reconcile_stat_counters() == {}
+
+
+if __name__ == "__main__":
+    test_counters_follow_inserts_and_deletes()
+    test_reconcile_repairs_drift()
+    print("Stat counter tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# /translate serves repeats from the in-memory and table caches, sends each
+# distinct miss upstream once, survives a process-level cache reset, and
+# rejects unsupported languages and oversized requests.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "translation_cache.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+import settings
+from translation import FakeTranslatorBackend, set_translator, clear_memory_cache
+
+client = TestClient(main.app)
+
+
+def translate(texts, lang="ta"):
+    response = client.post("/translate", json={"texts": texts, "target_lang": lang})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_duplicates_translated_once():
+    fake = FakeTranslatorBackend()
+    set_translator(fake)
+    body = translate(["Glucose", "BMI", "Glucose", "Glucose"])
+    assert body["translations"] == ["[ta] Glucose", "[ta] BMI", "[ta] Glucose", "[ta] Glucose"]
+    assert sorted(fake.calls) == [("BMI", "ta"), ("Glucose", "ta")]
+
+
+def test_repeats_served_from_cache():
+    fake = FakeTranslatorBackend()
+    set_translator(fake)
+    translate(["Health Dashboard", "Target"], lang="hi")
+    translate(["Health Dashboard", "Target"], lang="hi")
+    assert len(fake.calls) == 2
+
+    # A fresh process only has the table to go on
+    clear_memory_cache()
+    body = translate(["Target", "Health Dashboard"], lang="hi")
+    assert body["translations"] == ["[hi] Target", "[hi] Health Dashboard"]
+    assert len(fake.calls) == 2
+
+
+def test_failed_texts_fall_back_and_are_not_cached():
+    class Flaky(FakeTranslatorBackend):
+        def translate(self, text, target_lang):
+            if text == "Critical":
+                raise RuntimeError("upstream unavailable")
+            return super().translate(text, target_lang)
+
+    set_translator(Flaky())
+    body = translate(["Critical", "Normal"], lang="ta")
+    assert body["translations"] == ["Critical", "[ta] Normal"]
+    assert body["error"] == "upstream unavailable"
+
+    fake = FakeTranslatorBackend()
+    set_translator(fake)
+    assert translate(["Critical", "Normal"], lang="ta")["translations"] == ["[ta] Critical", "[ta] Normal"]
+    assert fake.calls == [("Critical", "ta")]
+
+
+def test_english_is_passthrough():
+    fake = FakeTranslatorBackend()
+    set_translator(fake)
+    assert translate(["Hello"], lang="en")["translations"] == ["Hello"]
+    assert fake.calls == []
+
+
+def test_request_limits():
+    set_translator(FakeTranslatorBackend())
+    for lang in ("te", "x" * 40, "../ta"):
+        response = client.post("/translate", json={"texts": ["Hello"], "target_lang": lang})
+        assert response.status_code == 422, lang
+
+    too_many = ["Hello"] * (settings.TRANSLATE_MAX_TEXTS + 1)
+    assert client.post("/translate", json={"texts": too_many, "target_lang": "ta"}).status_code == 422
+    too_long = ["x" * (settings.TRANSLATE_MAX_TEXT_LENGTH + 1)]
+    assert client.post("/translate", json={"texts": too_long, "target_lang": "ta"}).status_code == 422
+
+    at_limit = ["Hello"] * settings.TRANSLATE_MAX_TEXTS
+    assert len(translate(at_limit)["translations"]) == settings.TRANSLATE_MAX_TEXTS
+
+
+if __name__ == "__main__":
+    test_duplicates_translated_once()
+    test_repeats_served_from_cache()
+    test_failed_texts_fall_back_and_are_not_cached()
+    test_english_is_passthrough()
+    test_request_limits()
+    print("Translation cache tests passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# GET /users pages through users with a keyset cursor in every sort order,
+# searches name/email/phone prefixes (LIKE wildcards are matched literally)
+# and reports the total without a full count.
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "user_listing.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal
+from models.user import User
+
+client = TestClient(main.app)
+
+NAMES = ["Kavya", "Karthik", "Meena", "Mohan", "50%_off"]
+
+
+def admin_headers():
+    credentials = {"email": "listing@aiassistant.in", "password": "secret1"}
+    client.post("/register", json={"name": "Listing", "phone_number": "60000000", **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_users():
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.email.like("listing-%")).count():
+            return
+        db.add_all(
+            User(name=f"{NAMES[i % len(NAMES)]} {i}", email=f"listing-{i}@example.com",
+                 phone_number=f"61{i:06d}", hashed_password="x")
+            for i in range(120)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def all_pages(headers, **params):
+    ids, cursor = [], None
+    while True:
+        response = client.get("/users", params={"limit": 25, **params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids += [u["id"] for u in body["users"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            return ids, body
+
+
+def test_pages_cover_every_user_once_in_order():
+    headers = admin_headers()
+    seed_users()
+    db = SessionLocal()
+    try:
+        users = db.query(User).all()
+    finally:
+        db.close()
+
+    for sort in ("id", "name", "email"):
+        for order in ("asc", "desc"):
+            ids, _ = all_pages(headers, sort=sort, order=order)
+            key = (lambda u: u.id) if sort == "id" else (lambda u: (getattr(u, sort), u.id))
+            assert ids == [u.id for u in sorted(users, key=key, reverse=order == "desc")], (sort, order)
+
+
+def test_prefix_search():
+    headers = admin_headers()
+    seed_users()
+
+    ids, body = all_pages(headers, q="Ka", sort="name")
+    assert len(ids) == 48 and body["total"] == 48 and body["total_exact"]
+    assert all_pages(headers, q="listing-11")[1]["total"] == 11   # 11, 110-119
+    assert all_pages(headers, q="6100001")[1]["total"] == 10      # phone 61000010-61000019
+    # Wildcards in the query are literal
+    assert all_pages(headers, q="50%_")[1]["total"] == 24
+    assert all_pages(headers, q="5%")[1]["total"] == 0
+
+
+def test_cursor_must_match_sort():
+    headers = admin_headers()
+    seed_users()
+    cursor = client.get("/users", params={"sort": "name", "limit": 2}, headers=headers).json()["next_cursor"]
+    assert client.get("/users", params={"sort": "email", "cursor": cursor}, headers=headers).status_code == 400
+    assert client.get("/users", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+if __name__ == "__main__":
+    test_pages_cover_every_user_once_in_order()
+    test_prefix_search()
+    test_cursor_must_match_sort()
+    print("User listing tests passed")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# GET /user-metrics pages with an X-Next-Cursor keyset on (created_at,
+# metric_id) in both orders: ties on created_at are broken by metric_id,
+# legacy rows with no created_at come last (oldest), `fields` narrows the
+# payload and malformed cursors are rejected.
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "user_metrics_pagination.db"))
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal
+from models.user import User
+from models.user_metrics import UserMetrics
+
+client = TestClient(main.app)
+
+START = datetime(2024, 1, 1, 8, 0)
+
+
+def auth_headers():
+    credentials = {"email": "pages@aiassistant.in", "password": "secret1"}
+    client.post("/register", json={"name": "Pages", "phone_number": "63000000", **credentials})
+    token = client.post("/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def seed_metrics() -> list:
+    """23 rows for the test user, eleven sharing one created_at and two undated; metric_ids in expected desc order."""
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == "pages@aiassistant.in").scalar()
+        if not db.query(UserMetrics).filter(UserMetrics.user_id == user_id).count():
+            db.add_all(
+                UserMetrics(user_id=user_id, disease_type="diabetes", glucose_value=100 + i, weight_kg=70,
+                            created_at=START + timedelta(hours=i if i < 10 else 10))
+                for i in range(21)
+            )
+            undated = [UserMetrics(user_id=user_id, disease_type="diabetes", glucose_value=99) for _ in range(2)]
+            db.add_all(undated)
+            db.flush()
+            for metric in undated:
+                metric.created_at = None
+            db.commit()
+        rows = db.query(UserMetrics.metric_id, UserMetrics.created_at).filter(UserMetrics.user_id == user_id).all()
+    finally:
+        db.close()
+    dated = sorted((r for r in rows if r.created_at), key=lambda r: (r.created_at, r.metric_id), reverse=True)
+    undated = sorted((r for r in rows if not r.created_at), key=lambda r: r.metric_id, reverse=True)
+    return [r.metric_id for r in dated + undated]
+
+
+def all_pages(headers, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = client.get("/user-metrics", params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        ids += [m["metric_id"] for m in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+
+
+def test_cursor_round_trip_in_both_orders():
+    headers = auth_headers()
+    expected = seed_metrics()
+    assert len(expected) == 23
+
+    for limit in (1, 4, 5, 7, 23, 100):
+        ids, pages = all_pages(headers, limit=limit)
+        assert ids == expected, limit
+        assert pages == max(1, -(-len(expected) // limit)), limit
+        ids, _ = all_pages(headers, limit=limit, order="asc")
+        assert ids == list(reversed(expected)), limit
+
+
+def test_ties_on_created_at_split_across_pages():
+    headers = auth_headers()
+    expected = seed_metrics()
+
+    # The first page ends inside the run of rows sharing START + 10h
+    first = client.get("/user-metrics", params={"limit": 3}, headers=headers)
+    assert [m["metric_id"] for m in first.json()] == expected[:3]
+    assert len({m["created_at"] for m in first.json()}) == 1
+    second = client.get("/user-metrics", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+    assert [m["metric_id"] for m in second.json()] == expected[3:6]
+
+
+def test_undated_rows_page_last():
+    headers = auth_headers()
+    expected = seed_metrics()
+
+    # limit=1 puts a cursor on each undated row too
+    assert all_pages(headers, limit=1)[0] == expected
+    assert all_pages(headers, limit=1, order="asc")[0] == list(reversed(expected))
+
+    metrics = client.get("/user-metrics", params={"limit": 100}, headers=headers).json()
+    assert [m["metric_id"] for m in metrics if m["created_at"] is None] == expected[-2:]
+    assert all(m["timestamp"] is None for m in metrics[-2:])
+
+
+def test_fields_projection():
+    headers = auth_headers()
+    seed_metrics()
+
+    metrics = client.get("/user-metrics", params={"fields": "glucose_value,created_at", "limit": 2}, headers=headers).json()
+    assert [set(m) for m in metrics] == [{"created_at", "glucose_value"}] * 2
+
+    response = client.get("/user-metrics", params={"fields": "glucose_value,password"}, headers=headers)
+    assert response.status_code == 400 and "password" in response.json()["detail"]
+
+
+def test_bad_cursor_is_rejected():
+    headers = auth_headers()
+    seed_metrics()
+
+    for cursor in ("not-a-cursor", "bm90LWEtZGF0ZXwx", "MjAyNC0wMS0wMXxhYmM"):
+        response = client.get("/user-metrics", params={"cursor": cursor}, headers=headers)
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip_in_both_orders()
+    test_ties_on_created_at_split_across_pages()
+    test_undated_rows_page_last()
+    test_fields_projection()
+    test_bad_cursor_is_rejected()
+    print("User metrics pagination tests passed")
@@ -0,0 +1,3 @@
+from .backends import TranslatorBackend, GoogleTranslatorBackend, FakeTranslatorBackend
+from .catalog import Message, render, render_all, render_skeleton, skeleton_cache_stats
+from .service import translate_texts, get_translator, set_translator, translation_cache_stats, clear_memory_cache
@@ -0,0 +1,45 @@
+# translation/backends.py
+#
+# Upstream translators. A backend translates one English string at a time;
+# the service fans cache misses out over a bounded thread pool.
+
+
+class TranslatorBackend:
+    """Base class for translation providers."""
+
+    name = "base"
+
+    def translate(self, text: str, target_lang: str) -> str:
+        raise NotImplementedError
+
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    """Google Translate through deep_translator (one blocking HTTP call per text)."""
+
+    name = "google"
+
+    def translate(self, text: str, target_lang: str) -> str:
+        from deep_translator import GoogleTranslator
+
+        result = GoogleTranslator(source="en", target=target_lang).translate(text)
+        # deep_translator returns None for whitespace-only input
+        return result if result is not None else text
+
+
+class FakeTranslatorBackend(TranslatorBackend):
+    """Offline stand-in for tests and local development: tags each text with the language."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def translate(self, text: str, target_lang: str) -> str:
+        self.calls.append((text, target_lang))
+        return f"[{target_lang}] {text}"
+
+
+BACKENDS = {
+    GoogleTranslatorBackend.name: GoogleTranslatorBackend,
+    FakeTranslatorBackend.name: FakeTranslatorBackend,
+}
@@ -0,0 +1,168 @@
+# translation/catalog.py
+#
+# Message catalog for generated report text (recommendations, explanations,
+# summaries). Engines emit Message(id, params); text is rendered from the
+# catalog of the requested language, so no translation call happens at
+# request time.
+#
+#   catalogs/en.json      source templates, {placeholder} fields
+#   catalogs/<lang>.json  {id: {"source": <en template>, "text": <translation>}},
+#                         written by `python -m jobs.build_translation_catalog`
+#
+# Entries whose recorded source no longer matches the English template are
+# stale and render in English until the catalog is rebuilt. A configured
+# language whose catalog has not been built is served in English; responses
+# report the language they were rendered in so the client can fall back to
+# runtime translation.
+
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+import settings
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs")
+SOURCE_LANG = "en"
+# Language codes only ("ta", "pt-BR"): never a path
+_LANG_CODE = re.compile(r"^[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})?$")
+
+
+class Message(NamedTuple):
+    id: str
+    params: Optional[dict] = None
+
+
+def catalog_path(lang: str) -> str:
+    if not _LANG_CODE.match(lang or ""):
+        raise ValueError(f"Invalid language code: {lang!r}")
+    return os.path.join(CATALOG_DIR, f"{lang}.json")
+
+
+def served_language(lang: str) -> str:
+    """`lang` if it is English or a configured language with a built catalog, otherwise English."""
+    if lang == SOURCE_LANG or (lang in settings.CATALOG_LANGUAGES and _has_catalog(lang)):
+        return lang
+    return SOURCE_LANG
+
+
+@lru_cache(maxsize=None)
+def _has_catalog(lang: str) -> bool:
+    # Cached per language, so a missing catalog is reported once, not per request
+    if os.path.exists(catalog_path(lang)):
+        return True
+    logger.warning(
+        "No message catalog for configured language %r; serving English. "
+        "Build it with `python -m jobs.build_translation_catalog`.", lang
+    )
+    return False
+
+
+@lru_cache(maxsize=None)
+def source_templates() -> Dict[str, str]:
+    with open(catalog_path(SOURCE_LANG), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=32)
+def _templates(lang: str) -> Dict[str, str]:
+    """English templates overlaid with this language's up-to-date translations."""
+    templates = dict(source_templates())
+    if lang == SOURCE_LANG:
+        return templates
+    with open(catalog_path(lang), encoding="utf-8") as f:
+        translated = json.load(f)
+    for message_id, entry in translated.items():
+        if templates.get(message_id) == entry.get("source"):
+            templates[message_id] = entry["text"]
+    return templates
+
+
+def available_languages() -> List[str]:
+    return sorted(name[:-5] for name in os.listdir(CATALOG_DIR) if name.endswith(".json"))
+
+
+def reload_catalogs():
+    source_templates.cache_clear()
+    _templates.cache_clear()
+    _has_catalog.cache_clear()
+    _skeleton_cache.clear()
+
+
+class _KeepMissing(dict):
+    def __missing__(self, name):
+        return "{" + name + "}"
+
+
+def render(message: Message, lang: str = SOURCE_LANG) -> str:
+    """
+    Render one message; parameters that are Messages render in the same
+    language. Placeholders with no parameter are left in place for a later
+    str.format.
+    """
+    # Request-supplied codes never reach the filesystem or the caches unchecked
+    lang = served_language(lang)
+    template = _templates(lang)[message.id]
+    if not message.params:
+        # Static texts are shared, not copied, by every skeleton that uses them
+        return template if "{" not in template else template.format_map(_KeepMissing())
+    params = {
+        name: render(value, lang) if isinstance(value, Message) else value
+        for name, value in (message.params or {}).items()
+    }
+    return template.format_map(_KeepMissing(params))
+
+
+def render_all(messages: Iterable[Message], lang: str = SOURCE_LANG) -> List[str]:
+    return [render(message, lang) for message in messages]
+
+
+# ---------- RENDERED SKELETONS ----------
+# Report engines map their inputs onto a small discrete bucket key; every
+# input in a bucket yields the same messages, differing only in a few
+# interpolated numbers. The messages rendered for a (bucket, language) are
+# kept with those numeric placeholders open and filled per request.
+
+_skeleton_cache = TTLCache(maxsize=settings.REPORT_SKELETON_CACHE_SIZE)
+
+
+class Skeleton(NamedTuple):
+    texts: Tuple[str, ...]
+    open_fields: Tuple[int, ...]  # indexes of texts that still have placeholders
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message], lang: str) -> "Skeleton":
+        texts = tuple(render_all(messages, lang))
+        return cls(texts, tuple(i for i, text in enumerate(texts) if "{" in text))
+
+    def fill(self, **values) -> List[str]:
+        # Most texts are fully static; only the few with numbers are formatted
+        texts = list(self.texts)
+        for i in self.open_fields:
+            texts[i] = texts[i].format(**values)
+        return texts
+
+
+def render_skeleton(key: Hashable, lang: str, build: Callable[[], Iterable[Message]]) -> Skeleton:
+    """Rendered templates for bucket `key`; `build` produces its messages on a miss."""
+    lang = served_language(lang)
+    cache_key = (key, lang)
+    try:
+        hash(cache_key)
+    except TypeError:
+        # Malformed input (e.g. a list where a category belongs) is rendered uncached
+        return Skeleton.from_messages(build(), lang)
+    skeleton = _skeleton_cache.get(cache_key)
+    if skeleton is None:
+        skeleton = Skeleton.from_messages(build(), lang)
+        _skeleton_cache.set(cache_key, skeleton)
+    return skeleton
+
+
+def skeleton_cache_stats() -> dict:
+    return _skeleton_cache.stats()
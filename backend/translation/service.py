@@ -0,0 +1,132 @@
+# translation/service.py
+#
+# Cached, de-duplicated translation of English UI and report strings.
+#
+# Lookups go in-memory LRU -> translation_cache table -> upstream backend.
+# Only misses reach the backend, each distinct text once per request, and
+# they are translated concurrently on a bounded thread pool.
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import settings
+from cache import TTLCache
+from models.translation_cache import TranslationCacheEntry
+from .backends import BACKENDS, TranslatorBackend
+
+SOURCE_LANG = "en"
+
+# Keeps IN (...) lists well under driver parameter limits
+_DB_LOOKUP_CHUNK = 500
+
+_memory_cache = TTLCache(maxsize=settings.TRANSLATION_CACHE_SIZE)
+_executor = ThreadPoolExecutor(max_workers=settings.TRANSLATION_MAX_WORKERS, thread_name_prefix="translate")
+_backend_lock = threading.Lock()
+_backend: Optional[TranslatorBackend] = None
+
+
+def get_translator() -> TranslatorBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = BACKENDS[settings.TRANSLATION_BACKEND]()
+        return _backend
+
+
+def set_translator(backend: TranslatorBackend):
+    """Swap the upstream backend (tests use FakeTranslatorBackend)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def translation_cache_stats() -> dict:
+    return _memory_cache.stats()
+
+
+def clear_memory_cache():
+    _memory_cache.clear()
+
+
+def _load_cached(db: Session, target_lang: str, hashes: List[str]) -> dict:
+    found = {}
+    for start in range(0, len(hashes), _DB_LOOKUP_CHUNK):
+        chunk = hashes[start:start + _DB_LOOKUP_CHUNK]
+        rows = db.query(TranslationCacheEntry.text_hash, TranslationCacheEntry.translated_text).filter(
+            TranslationCacheEntry.target_lang == target_lang,
+            TranslationCacheEntry.text_hash.in_(chunk)
+        )
+        found.update(rows)
+    return found
+
+
+def _store(db: Session, target_lang: str, translated: dict, sources: dict):
+    entries = [
+        TranslationCacheEntry(target_lang=target_lang, text_hash=h, source_text=sources[h], translated_text=t)
+        for h, t in translated.items()
+    ]
+    try:
+        db.add_all(entries)
+        db.commit()
+    except IntegrityError:
+        # Another request stored some of these first; keep whatever is missing
+        db.rollback()
+        for entry in entries:
+            db.merge(entry)
+        db.commit()
+
+
+def translate_texts(db: Session, texts: List[str], target_lang: str) -> Tuple[List[str], Optional[str]]:
+    """
+    Translate `texts` from English into `target_lang`, preserving order.
+
+    Returns (translations, error). Texts the backend fails on come back
+    untranslated, are not cached, and the first failure is reported as
+    `error`.
+    """
+    if target_lang == SOURCE_LANG or not texts:
+        return list(texts), None
+
+    hashes = [text_hash(text) for text in texts]
+    # Repeated texts collapse to one lookup / upstream call
+    sources = dict(zip(hashes, texts))
+
+    translated = {}
+    for h in sources:
+        hit = _memory_cache.get((target_lang, h))
+        if hit is not None:
+            translated[h] = hit
+
+    pending = [h for h in sources if h not in translated]
+    if pending:
+        for h, t in _load_cached(db, target_lang, pending).items():
+            translated[h] = t
+            _memory_cache.set((target_lang, h), t)
+
+    misses = [h for h in sources if h not in translated]
+    error = None
+    if misses:
+        backend = get_translator()
+        futures = {h: _executor.submit(backend.translate, sources[h], target_lang) for h in misses}
+        fresh = {}
+        for h, future in futures.items():
+            try:
+                fresh[h] = future.result()
+            except Exception as e:
+                error = error or str(e)
+        for h, t in fresh.items():
+            translated[h] = t
+            _memory_cache.set((target_lang, h), t)
+        if fresh:
+            _store(db, target_lang, fresh, sources)
+
+    return [translated.get(h, text) for h, text in zip(hashes, texts)], error
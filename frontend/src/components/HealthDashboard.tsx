@@ -106,37 +106,18 @@ const HealthDashboard: React.FC = () => {
 
   const fetchHealthData = async () => {
     try {
-      const userId = user?.id || 1;
-      const response = await metricsAPI.getUserMetrics(userId);
-      const metrics = response.data || [];
-
-      // Separate diabetes metrics
-      const diabetesMetrics = metrics.filter((m: any) => m.disease_type === 'diabetes') || [];
-
-      
-
-      // Helper: sort by timestamp (ms) if available, otherwise fall back to created_at ISO string
-      const sortByDateDesc = (arr: any[]) => arr.slice().sort((a,b) => {
-        const aTs = (a && a.timestamp) ? Number(a.timestamp) : (a && a.created_at ? new Date(a.created_at).getTime() : 0);
-        const bTs = (b && b.timestamp) ? Number(b.timestamp) : (b && b.created_at ? new Date(b.created_at).getTime() : 0);
-        return bTs - aTs;
-      });
-
-      const latestDiabetes = sortByDateDesc(diabetesMetrics)[0];
-
-      // Build glucose trend with dates from last 7 diabetes entries
-      const trendData = sortByDateDesc(diabetesMetrics).slice(0, 7).reverse().map((m: any) => {
-        const bmi = m.weight_kg && m.height_cm ? (m.weight_kg / Math.pow(m.height_cm / 100, 2)).toFixed(1) : null;
-        return {
-          glucose: Number(m.glucose_value),
-          date: m.created_at || m.timestamp,
-          bmi: bmi ? Number(bmi) : null
-        };
-      }).filter((item: any) => Number.isFinite(item.glucose));
-
-      const diabetesGlucoseValues = diabetesMetrics.map((m: any) => Number(m.glucose_value)).filter((v: any) => Number.isFinite(v));
-      const glucoseAvg = diabetesGlucoseValues.length ? Math.round(diabetesGlucoseValues.reduce((a: number,b: number) => a + b, 0) / diabetesGlucoseValues.length) : null;
-      const latestGlucose = latestDiabetes ? Number(latestDiabetes.glucose_value) : (diabetesGlucoseValues.length ? diabetesGlucoseValues[0] : null);
+      const response = await metricsAPI.getDashboardSummary();
+      const summary = response.data || {};
+
+      const trendData = (summary.glucose_trend || []).map((point: any) => ({
+        glucose: Number(point.glucose),
+        date: point.date,
+        bmi: point.bmi
+      })).filter((item: any) => Number.isFinite(item.glucose));
+
+      const glucoseAvg = summary.avg_glucose ?? null;
+      const latestGlucose = summary.latest_glucose ?? null;
+      const latestDiabetes = summary.latest_at ? summary : null;
 
       // Calculate BMI from latest metrics
       const latestWeight = latestDiabetes?.weight_kg || 70;
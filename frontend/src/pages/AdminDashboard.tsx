@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { authAPI } from '../services/api';
+import { authAPI, UserListOptions } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
 
@@ -10,28 +10,35 @@ interface UserRow {
   is_admin: boolean;
 }
 
+const PAGE_SIZE = 50;
+type SortOption = 'id:asc' | 'id:desc' | 'name:asc' | 'name:desc' | 'email:asc';
+
 const AdminDashboard: React.FC = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
   const [users, setUsers] = useState<UserRow[]>([]);
   // Admin dashboard focuses only on users list
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [query, setQuery] = useState('');
-
-  useEffect(() => {
-    if (!user) return;
-    if (!user.is_admin) {
-      navigate('/dashboard');
-      return;
-    }
-    fetchUsers();
-  }, [user, navigate]);
+  const [sortOption, setSortOption] = useState<SortOption>('id:asc');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<number | null>(null);
+  const [totalExact, setTotalExact] = useState(true);
+
+  const listOptions = (cursor?: string): UserListOptions => {
+    const [sort, order] = sortOption.split(':') as [UserListOptions['sort'], UserListOptions['order']];
+    return { limit: PAGE_SIZE, q: query.trim() || undefined, sort, order, cursor };
+  };
 
   const fetchUsers = async () => {
     setLoading(true);
     try {
-      const resp = await authAPI.getUsers();
+      const resp = await authAPI.getUsers(listOptions());
       setUsers(resp.data.users || []);
+      setNextCursor(resp.data.next_cursor || null);
+      setTotal(resp.data.total ?? null);
+      setTotalExact(resp.data.total_exact !== false);
     } catch (err) {
       console.error('Failed to fetch users', err);
     } finally {
@@ -39,11 +46,38 @@ const AdminDashboard: React.FC = () => {
     }
   };
 
+  const fetchMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const resp = await authAPI.getUsers(listOptions(nextCursor));
+      setUsers(prev => [...prev, ...(resp.data.users || [])]);
+      setNextCursor(resp.data.next_cursor || null);
+    } catch (err) {
+      console.error('Failed to fetch users', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Search runs server-side; wait for typing to pause before asking
+  useEffect(() => {
+    if (!user) return;
+    if (!user.is_admin) {
+      navigate('/dashboard');
+      return;
+    }
+    const timer = setTimeout(fetchUsers, query ? 300 : 0);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user, navigate, query, sortOption]);
+
   const handleDelete = async (id: number) => {
     if (!window.confirm('Delete this user? This action cannot be undone.')) return;
     try {
       await authAPI.deleteUser(id);
       setUsers(users.filter(u => u.id !== id));
+      setTotal(t => (t === null ? t : t - 1));
     } catch (err: any) {
       console.error('Delete failed', err);
       alert(err.response?.data?.detail || 'Delete failed');
@@ -75,19 +109,31 @@ const AdminDashboard: React.FC = () => {
     {/* Top Controls */}
     <div className="admin-controls">
       <div className="admin-count">
-        Total users: <strong>{loading ? '—' : users.length}</strong>
+        {query ? 'Matching users' : 'Total users'}:{' '}
+        <strong>{loading || total === null ? '—' : `${total}${totalExact ? '' : '+'}`}</strong>
       </div>
 
       <div className="admin-search">
         <input
           className="input"
-          placeholder="Search by name or email"
+          placeholder="Search by name, email or phone (starts with)"
           value={query}
           onChange={(e) => setQuery(e.target.value)}
         />
+        <select
+          className="input"
+          value={sortOption}
+          onChange={(e) => setSortOption(e.target.value as SortOption)}
+        >
+          <option value="id:asc">Oldest first</option>
+          <option value="id:desc">Newest first</option>
+          <option value="name:asc">Name A–Z</option>
+          <option value="name:desc">Name Z–A</option>
+          <option value="email:asc">Email A–Z</option>
+        </select>
         <button className="btn btn-secondary" onClick={() => {
-          setQuery('');
-          fetchUsers();
+          if (query) setQuery('');
+          else fetchUsers();
         }}>
           Clear
         </button>
@@ -114,16 +160,7 @@ const AdminDashboard: React.FC = () => {
             </thead>
 
             <tbody>
-              {users
-                .filter(u => {
-                  if (!query) return true;
-                  const q = query.toLowerCase();
-                  return (
-                    u.name.toLowerCase().includes(q) ||
-                    u.email.toLowerCase().includes(q)
-                  );
-                })
-                .map(u => (
+              {users.map(u => (
                   <tr key={u.id}>
                     <td>{u.id}</td>
                     <td>{u.name}</td>
@@ -153,6 +190,14 @@ const AdminDashboard: React.FC = () => {
             </tbody>
           </table>
         </div>
+
+        {nextCursor && (
+          <div style={{ padding: '1rem', textAlign: 'center' }}>
+            <button className="btn btn-secondary" onClick={fetchMore} disabled={loadingMore}>
+              {loadingMore ? 'Loading…' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     )}
   </div>
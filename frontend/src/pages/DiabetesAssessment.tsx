@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { riskAPI, DiabetesRiskData, metricsAPI } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
-import { translateTexts } from '../services/translationService';
+import { translateReport, translateTexts } from '../services/translationService';
 import RiskRing from '../components/RiskRing';
 import { PieChart, Pie, Cell, Tooltip, Legend, LineChart, Line, XAxis, YAxis, CartesianGrid, ResponsiveContainer } from 'recharts';
 
@@ -143,19 +143,9 @@ const DiabetesAssessment: React.FC = () => {
     setError('');
 
     try {
-      const response = await riskAPI.calculateDiabetesRisk(formData);
-      const riskResult = response.data;
-      
-      // Fetch explanation
-      const expResponse = await riskAPI.getDiabetesExplanation(riskResult);
-      riskResult.explanation = expResponse.data.explanation;
-      riskResult.summary = expResponse.data.summary;
-      
-      // Fetch recommendations
-      const recResponse = await riskAPI.getDiabetesRecommendations(riskResult);
-      riskResult.recommendations = recResponse.data.recommendations;
-      
-      setResult(riskResult);
+      // Score, explanation and recommendations come back together
+      const response = await riskAPI.assessDiabetes(formData, language);
+      setResult(await translateReport(response.data, language));
       setShowModal(true);
 
       await metricsAPI.createMetrics({
@@ -11,7 +11,7 @@ const Profile: React.FC = () => {
     diabetesStatus: 'Unknown',
     physicalActivity: 'Unknown',
     familyHistory: false,
-    totalAssessments: 0,
+    totalAssessments: null as number | null,
     lastAssessment: null as string | null
   });
   const [editing, setEditing] = useState(false);
@@ -47,7 +47,10 @@ const Profile: React.FC = () => {
 
   const fetchProfileData = async () => {
     try {
-      const response = await metricsAPI.getUserMetrics(user?.id);
+      const [response, summary] = await Promise.all([
+        metricsAPI.getUserMetrics(user?.id, undefined, { limit: 1 }),
+        metricsAPI.getDashboardSummary()
+      ]);
       const metrics = response.data || [];
       
       if (metrics.length > 0) {
@@ -59,7 +62,8 @@ const Profile: React.FC = () => {
           diabetesStatus: latest.diabetes_status || 'Unknown',
           physicalActivity: latest.physical_activity || 'Unknown',
           familyHistory: latest.family_history || false,
-          totalAssessments: metrics.length,
+          // Counted server-side; null (shown as unknown) if the summary has no count
+          totalAssessments: summary.data?.total_assessments ?? null,
           lastAssessment: latest.created_at
         });
       }
@@ -243,7 +247,7 @@ const Profile: React.FC = () => {
         <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(250px, 1fr))', gap: '1.5rem' }}>
           <div className="profile-field">
             <label>Total Assessments</label>
-            <div className="profile-value">{profileData.totalAssessments}</div>
+            <div className="profile-value">{profileData.totalAssessments ?? '—'}</div>
           </div>
           <div className="profile-field">
             <label>Last Assessment</label>
@@ -2,12 +2,17 @@ import React, { useState, useEffect } from 'react';
 import { metricsAPI } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 
+// Oldest first, like the page has always listed them; later pages append newer rows
+const METRICS_PAGE = { limit: 100, order: 'asc' as const };
+
 const UserMetrics: React.FC = () => {
   const { getUserId } = useAuth();
   const [metrics, setMetrics] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [selectedType, setSelectedType] = useState<string>('all');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     // We intentionally call fetchMetrics when selectedType changes.
@@ -22,8 +27,9 @@ const UserMetrics: React.FC = () => {
     try {
       const userId = getUserId();
       const diseaseType = selectedType === 'all' ? undefined : selectedType;
-      const response = await metricsAPI.getUserMetrics(userId, diseaseType);
+      const response = await metricsAPI.getUserMetrics(userId, diseaseType, METRICS_PAGE);
       setMetrics(response.data);
+      setNextCursor(response.headers['x-next-cursor'] || null);
     } catch (err: any) {
       console.error('Metrics error:', err);
       if (err.response?.data?.detail) {
@@ -40,6 +46,22 @@ const UserMetrics: React.FC = () => {
     }
   };
 
+  const fetchMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const diseaseType = selectedType === 'all' ? undefined : selectedType;
+      const response = await metricsAPI.getUserMetrics(getUserId(), diseaseType, { ...METRICS_PAGE, cursor: nextCursor });
+      setMetrics((prev) => [...prev, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (err: any) {
+      console.error('Metrics error:', err);
+      setError('Failed to fetch more metrics');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDate = (dateOrTimestamp: string | number | undefined) => {
     if (!dateOrTimestamp) return '—';
     const date = typeof dateOrTimestamp === 'number' ? new Date(dateOrTimestamp) : new Date(String(dateOrTimestamp));
@@ -139,12 +161,20 @@ const UserMetrics: React.FC = () => {
       ) : (
         <div>
           <div style={{ marginBottom: '2rem', color: 'var(--gray-medium)' }}>
-            Showing {metrics.length} metric{metrics.length !== 1 ? 's' : ''}
+            Showing {metrics.length}{nextCursor ? '+' : ''} metric{metrics.length !== 1 ? 's' : ''}
           </div>
           
           {metrics.map((metric) => 
             renderDiabetesMetrics(metric)
           )}
+
+          {nextCursor && (
+            <div style={{ padding: '1rem', textAlign: 'center' }}>
+              <button className="btn btn-secondary" onClick={fetchMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading…' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -77,36 +77,77 @@ export interface UserMetricsData {
   [key: string]: any;
 }
 
+// Admin user listing
+export interface UserListOptions {
+  limit?: number;
+  cursor?: string;
+  q?: string;
+  sort?: 'id' | 'name' | 'email';
+  order?: 'asc' | 'desc';
+}
+
 // Auth API
 export const authAPI = {
   login: (data: LoginData) => api.post('/login', data),
   register: (data: RegisterData) => api.post('/register', data),
   getMe: () => api.get<UserProfileData>('/me'),
   updateMe: (data: { name: string; email: string; phone_number: string }) => api.post<UserProfileData>('/me', data),
-  getUsers: () => api.get('/users'),
+  // One page at a time; pass the response's next_cursor back for the next page
+  getUsers: (options: UserListOptions = {}) => {
+    const params: Record<string, string | number> = {};
+    if (options.limit) params.limit = options.limit;
+    if (options.cursor) params.cursor = options.cursor;
+    if (options.q) params.q = options.q;
+    if (options.sort) params.sort = options.sort;
+    if (options.order) params.order = options.order;
+    return api.get('/users', { params });
+  },
   deleteUser: (userId: number) => api.delete(`/users/${userId}`),
   toggleAdmin: (userId: number, isAdmin: boolean) => api.post(`/users/${userId}/admin-toggle`, { is_admin: isAdmin }),
   getAdminStats: () => api.get('/admin/stats'),
-  getUserRecommendations: (userId: number) => api.get(`/users/${userId}/recommendations`),
+  // Newest first; pass next_cursor back for older entries, summary=true skips the recommendation text
+  getUserRecommendations: (userId: number, options: { limit?: number; cursor?: string; summary?: boolean } = {}) =>
+    api.get(`/users/${userId}/recommendations`, { params: options }),
 };
 
 // Risk Assessment API
 export const riskAPI = {
   calculateDiabetesRisk: (data: any) => api.post('/diabetes-risk', data),
-  getDiabetesExplanation: (data: any) => api.post('/explain-diabetes', data),
-  getDiabetesRecommendations: (data: any) => api.post('/diabetes-recommendations', data),
+  calculateDiabetesRiskBatch: (items: any[]) => api.post('/diabetes-risk/batch', items),
+  // Risk score, summary, explanation and recommendations in one request
+  assessDiabetes: (data: any, lang = 'en') => api.post('/diabetes-assessment', data, { params: { lang } }),
+  // Text comes back already in `lang`, rendered from the server's pre-translated catalogs
+  getDiabetesExplanation: (data: any, lang = 'en') => api.post('/explain-diabetes', data, { params: { lang } }),
+  getDiabetesRecommendations: (data: any, lang = 'en') => api.post('/diabetes-recommendations', data, { params: { lang } }),
 };
 
 // User Metrics API
+export interface MetricsPageOptions {
+  limit?: number;
+  cursor?: string;
+  since?: string;
+  until?: string;
+  order?: 'asc' | 'desc';
+  fields?: string[];
+}
+
 export const metricsAPI = {
   createMetrics: (data: any) => api.post('/user-metrics', data),
-  getUserMetrics: (userId?: number, diseaseType?: string) => {
-    const params: string[] = [];
-    if (userId) params.push(`user_id=${userId}`);
-    if (diseaseType) params.push(`disease_type=${diseaseType}`);
-    const qs = params.length ? `?${params.join('&')}` : '';
-    return api.get(`/user-metrics${qs}`);
+  // One page at a time (newest first unless options.order is 'asc'); the next page's cursor comes back in the X-Next-Cursor header
+  getUserMetrics: (userId?: number, diseaseType?: string, options: MetricsPageOptions = {}) => {
+    const params: Record<string, string | number> = {};
+    if (userId) params.user_id = userId;
+    if (diseaseType) params.disease_type = diseaseType;
+    if (options.limit) params.limit = options.limit;
+    if (options.cursor) params.cursor = options.cursor;
+    if (options.since) params.since = options.since;
+    if (options.until) params.until = options.until;
+    if (options.order) params.order = options.order;
+    if (options.fields?.length) params.fields = options.fields.join(',');
+    return api.get('/user-metrics', { params });
   },
+  // Latest/average glucose, HbA1c estimate, BMI and a short trend, aggregated server-side
+  getDashboardSummary: () => api.get('/dashboard-summary'),
 };
 
 // Health endpoints
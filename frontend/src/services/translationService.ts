@@ -55,3 +55,30 @@ export const translateTexts = async (texts: string[], targetLang: string): Promi
     return texts;
   }
 };
+
+// Report text (summary, explanations, recommendations) comes back rendered in
+// `report.lang`; when the server had no catalog for the requested language it
+// is English, and is translated here instead
+export const translateReport = async (report: any, targetLang: string): Promise<any> => {
+  if (!report.lang || report.lang === targetLang) return report;
+
+  const priority: string[] = report.explanation?.priority_explanations || [];
+  const remaining: string[] = report.explanation?.remaining_explanations || [];
+  const recommendations: string[] = report.recommendations || [];
+  const texts = [report.summary || '', ...priority, ...remaining, ...recommendations];
+  const translated = await translateTexts(texts, targetLang);
+
+  let offset = 1;
+  const take = (count: number) => translated.slice(offset, (offset += count));
+  return {
+    ...report,
+    summary: report.summary ? translated[0] : report.summary,
+    explanation: report.explanation && {
+      ...report.explanation,
+      priority_explanations: take(priority.length),
+      remaining_explanations: take(remaining.length),
+    },
+    recommendations: report.recommendations && take(recommendations.length),
+    lang: targetLang,
+  };
+};
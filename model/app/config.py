@@ -0,0 +1,75 @@
+# app/config.py
+#
+# Service settings, read once from the environment at import time.
+
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+# ---------- BATCH PREDICTION ----------
+# Rows accepted by one /api/predict/batch call
+MAX_BATCH_ROWS = _env_int("MAX_BATCH_ROWS", 4096)
+
+# ---------- MICRO-BATCHING ----------
+# Coalesce concurrent /api/predict calls into one vectorized predict_proba
+MICRO_BATCH_ENABLED = _env_bool("MICRO_BATCH_ENABLED", True)
+# Rows scored together at most
+MICRO_BATCH_MAX_ROWS = _env_int("MICRO_BATCH_MAX_ROWS", 64)
+# Longest a request waits for others to join its batch (latency budget)
+MICRO_BATCH_MAX_WAIT_MS = _env_float("MICRO_BATCH_MAX_WAIT_MS", 2.0)
+
+# ---------- PREDICTION CACHE ----------
+# Reuse the probability of a feature vector already scored by the same model version
+PREDICTION_CACHE_ENABLED = _env_bool("PREDICTION_CACHE_ENABLED", True)
+# Entries kept before the least recently used is evicted (~500 bytes each)
+PREDICTION_CACHE_MAX_ENTRIES = _env_int("PREDICTION_CACHE_MAX_ENTRIES", 100000)
+# Seconds an entry stays valid (0: until evicted; keys already include the model version)
+PREDICTION_CACHE_TTL_SECONDS = _env_float("PREDICTION_CACHE_TTL_SECONDS", 0)
+# With the cache on, round BMI to this many decimals before scoring, so
+# near-identical profiles share an entry (0 matches the whole-number BMIs of
+# the training data; unset, or with the cache off, BMI is scored as sent)
+PREDICTION_CACHE_BMI_DECIMALS = _env_int("PREDICTION_CACHE_BMI_DECIMALS", None)
+
+# ---------- MODEL LOADING ----------
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Versioned model store written by training/train.py (see app/services/model_store.py)
+MODEL_STORE_DIR = os.getenv("MODEL_STORE_DIR", os.path.join(APP_DIR, "models", "store"))
+# Single-file model served while the store has no active version; resolved
+# from this package, not the working directory
+MODEL_PATH = os.getenv("MODEL_PATH", os.path.join(APP_DIR, "models", "trained_model.pkl"))
+# Seconds between checks for a new active version set by another process (0 disables)
+MODEL_RELOAD_CHECK_SECONDS = _env_float("MODEL_RELOAD_CHECK_SECONDS", 10.0)
+# Reject a new version whose canary probabilities differ from the serving
+# version's by more than this (unset: report the drift, do not gate on it)
+MODEL_CANARY_MAX_DRIFT = _env_float("MODEL_CANARY_MAX_DRIFT", None)
+# Serve predictions from the flattened ensemble (app/services/fast_ensemble.py)
+# instead of StackingClassifier.predict_proba; a model that cannot be
+# flattened exactly is served as is
+MODEL_FAST_PATH = _env_bool("MODEL_FAST_PATH", True)
+# Shared secret for the endpoints that activate or roll back model versions,
+# sent as the X-Admin-Token header; unset leaves those endpoints disabled
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN") or None
+# joblib mmap_mode for the model's NumPy arrays ("r", "c" or empty for in-memory copies)
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE", "r") or None
+# When to load the model:
+#   lazy    - on the first prediction
+#   startup - in the app's startup hook, before the worker takes traffic
+#   import  - when the app module is imported; with `gunicorn --preload` the
+#             master loads once and forked workers share its pages copy-on-write
+MODEL_LOAD = os.getenv("MODEL_LOAD", "startup")
@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routes.risk_routes import router as risk_router
+from starlette.concurrency import run_in_threadpool
+from app.config import MODEL_LOAD
+from app.services.prediction_service import model_registry, prediction_batcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up before taking traffic so the first request does not pay the load
+    if MODEL_LOAD == "startup":
+        await run_in_threadpool(model_registry.load)
+    yield
+    # Stop the micro-batcher's background task with the event loop
+    await prediction_batcher.stop()
+
 
 app = FastAPI(
     title="AI Health Risk Prediction API",
     description="Predicts complication risk using ML and SHAP explainability",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Root test endpoint
@@ -1,21 +1,106 @@
-from fastapi import APIRouter
+import hmac
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.config import MAX_BATCH_ROWS, MICRO_BATCH_ENABLED, MODEL_ADMIN_TOKEN
 from app.schemas.risk_schema import RiskRequest
-from app.services.prediction_service import predict_risk
+from app.services.model_store import ModelStoreError, list_versions
+from app.services.prediction_service import (
+    predict_risk, predict_risk_batch, predict_risk_batched, prediction_batcher, prediction_cache, model_registry,
+)
 from app.utils.converters import convert_to_native_python
 
 router = APIRouter()
 
 @router.post("/predict")
-def predict(data: RiskRequest):
+async def predict(data: RiskRequest):
     
-    input_dict = data.dict()
+    input_dict = data.model_dump()
     
-    risk_score, risk_level = predict_risk(input_dict)
+    if MICRO_BATCH_ENABLED:
+        risk_score, risk_level, model_version = await predict_risk_batched(input_dict)
+    else:
+        risk_score, risk_level, model_version = await run_in_threadpool(predict_risk, input_dict)
     
     response = {
         "risk_score": risk_score,
-        "risk_level": risk_level
+        "risk_level": risk_level,
+        "model_version": model_version
     }
     
     # Ensure all values are JSON-serializable
     return convert_to_native_python(response)
+
+
+@router.post("/predict/batch")
+def predict_batch(rows: List[RiskRequest]):
+
+    if not rows:
+        raise HTTPException(status_code=400, detail="At least one row is required")
+    if len(rows) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds limit of {MAX_BATCH_ROWS}")
+
+    # One feature matrix, one predict_proba for the whole batch
+    predictions = predict_risk_batch([row.model_dump() for row in rows])
+
+    response = {
+        "count": len(predictions),
+        "model_version": predictions[0][2],
+        "results": [
+            {"risk_score": risk_score, "risk_level": risk_level}
+            for risk_score, risk_level, _ in predictions
+        ]
+    }
+
+    return convert_to_native_python(response)
+
+
+@router.get("/predict/stats")
+def predict_stats():
+    # Micro-batcher batch size and queue wait distributions, prediction cache effectiveness
+    return {
+        "micro_batching": MICRO_BATCH_ENABLED,
+        "max_batch_rows": prediction_batcher.max_rows,
+        "max_wait_ms": prediction_batcher.max_wait * 1000,
+        **prediction_batcher.stats.snapshot(),
+        "cache": prediction_cache.stats() if prediction_cache is not None else None,
+    }
+
+
+@router.get("/model/info")
+def model_info():
+    # Where the model came from, what loading it cost, and this worker's resident size
+    return model_registry.stats()
+
+
+@router.get("/model/versions")
+def model_versions():
+    return {
+        "active": model_registry.stats().get("version"),
+        "versions": list_versions(model_registry.store_dir),
+    }
+
+
+def require_model_admin(x_admin_token: Optional[str] = Header(None)):
+    # Swapping the production model is an operator action, not a public API
+    if MODEL_ADMIN_TOKEN is None:
+        raise HTTPException(status_code=403, detail="Model administration is disabled (MODEL_ADMIN_TOKEN is not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, MODEL_ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/model/versions/{version}/activate", dependencies=[Depends(require_model_admin)])
+def activate_model_version(version: str):
+    # Loads and validates in this worker thread; traffic keeps using the current version until the swap
+    try:
+        return model_registry.activate(version)
+    except ModelStoreError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/model/rollback", dependencies=[Depends(require_model_admin)])
+def rollback_model_version():
+    try:
+        return model_registry.rollback()
+    except ModelStoreError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,159 @@
+import numpy as np
+from scipy.special import expit
+
+
+class UnsupportedModel(Exception):
+    """The fitted model is not an ensemble this module knows how to flatten."""
+
+
+class LinearModel:
+    """Binary LogisticRegression as one dot product."""
+
+    def __init__(self, estimator):
+        if estimator.coef_.shape[0] != 1:
+            raise UnsupportedModel("Only binary logistic regression is supported")
+        self.coef = np.ascontiguousarray(estimator.coef_[0], dtype=np.float64)
+        self.intercept = float(estimator.intercept_[0])
+
+    def positive_proba(self, X: np.ndarray) -> np.ndarray:
+        return expit(X @ self.coef + self.intercept)
+
+
+class PackedForest:
+    """
+    Every tree of a binary RandomForestClassifier in one set of contiguous
+    node arrays, walked for all trees and rows at once.
+
+    Leaves point back at themselves with an infinite threshold, so after
+    `depth` steps every (row, tree) pair sits on its leaf whatever the depth
+    it reached it at. Inputs are compared as float32, like sklearn's trees.
+    """
+
+    def __init__(self, estimator):
+        if estimator.n_outputs_ != 1 or len(estimator.classes_) != 2:
+            raise UnsupportedModel("Only single-output binary forests are supported")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, depth = 0, 0
+        for tree_estimator in estimator.estimators_:
+            tree = tree_estimator.tree_
+            leaf = tree.children_left == -1
+            own_index = np.arange(tree.node_count) + offset
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1)
+            totals[totals == 0] = 1.0
+
+            roots.append(offset)
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, own_index, tree.children_left + offset))
+            rights.append(np.where(leaf, own_index, tree.children_right + offset))
+            values.append(counts[:, 1] / totals)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds).astype(np.float64)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.value = np.concatenate(values).astype(np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = depth
+
+    @property
+    def node_count(self) -> int:
+        return len(self.feature)
+
+    def positive_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=1)
+
+
+class BoosterModel:
+    """A binary XGBClassifier scored through its native booster."""
+
+    def __init__(self, estimator):
+        if getattr(estimator, "objective", None) != "binary:logistic":
+            raise UnsupportedModel("Only binary:logistic XGBoost models are supported")
+        self.booster = estimator.get_booster()
+        try:
+            # Same trees XGBClassifier.predict_proba uses after early stopping
+            self.iteration_range = (0, estimator.best_iteration + 1)
+        except AttributeError:
+            self.iteration_range = (0, 0)
+
+    def positive_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.inplace_predict(X, iteration_range=self.iteration_range, validate_features=False)
+
+
+def _flatten_base(estimator):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    if isinstance(estimator, LogisticRegression):
+        return LinearModel(estimator)
+    if isinstance(estimator, RandomForestClassifier):
+        return PackedForest(estimator)
+    if type(estimator).__name__ == "XGBClassifier":
+        return BoosterModel(estimator)
+    raise UnsupportedModel(f"Cannot flatten base estimator {type(estimator).__name__}")
+
+
+class FlatStackingEnsemble:
+    """
+    A fitted binary StackingClassifier reduced to its arithmetic.
+
+    predict_proba() gives the same probabilities as the stacking model
+    without sklearn's per-call validation and dispatch: each base model's
+    positive-class probability becomes one column of the meta features and
+    the final LogisticRegression is a dot product over them. Build with
+    flatten_stacking().
+    """
+
+    def __init__(self, base_models: list, final: LinearModel, n_features: int):
+        self.base_models = base_models
+        self.final = final
+        self.n_features = n_features
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected rows of {self.n_features} features, got shape {X.shape}")
+        meta = np.column_stack([model.positive_proba(X) for model in self.base_models])
+        positive = self.final.positive_proba(meta)
+        return np.column_stack([1.0 - positive, positive])
+
+    def describe(self) -> dict:
+        return {
+            "base_models": [type(model).__name__ for model in self.base_models],
+            "forest_nodes": sum(model.node_count for model in self.base_models if isinstance(model, PackedForest)),
+        }
+
+
+def flatten_stacking(model) -> FlatStackingEnsemble:
+    """Export a fitted StackingClassifier as a FlatStackingEnsemble; raises UnsupportedModel."""
+    from sklearn.ensemble import StackingClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    if not isinstance(model, StackingClassifier):
+        raise UnsupportedModel(f"Cannot flatten {type(model).__name__}")
+    if model.passthrough:
+        raise UnsupportedModel("Stacking with passthrough features is not supported")
+    if list(model.classes_) != [0, 1]:
+        raise UnsupportedModel("Only binary 0/1 stacking models are supported")
+    if any(method != "predict_proba" for method in model.stack_method_):
+        raise UnsupportedModel("Base estimators must be stacked on predict_proba")
+    if not isinstance(model.final_estimator_, LogisticRegression):
+        raise UnsupportedModel("The final estimator must be a LogisticRegression")
+
+    # A base estimator set to "drop" has no entry in estimators_
+    base_models = [_flatten_base(estimator) for estimator in model.estimators_]
+    for estimator in model.estimators_:
+        if list(estimator.classes_) != [0, 1]:
+            raise UnsupportedModel("Base estimators must be binary 0/1 classifiers")
+    return FlatStackingEnsemble(base_models, LinearModel(model.final_estimator_), model.n_features_in_)
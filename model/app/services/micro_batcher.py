@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+from app.config import MICRO_BATCH_MAX_ROWS, MICRO_BATCH_MAX_WAIT_MS
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+# Upper bounds (ms) of the queue wait histogram buckets
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _bucket(value, bounds) -> str:
+    for bound in bounds:
+        if value <= bound:
+            return f"<={bound}"
+    return f">{bounds[-1]}"
+
+
+def _empty_histogram(bounds) -> dict:
+    counts = {f"<={bound}": 0 for bound in bounds}
+    counts[f">{bounds[-1]}"] = 0
+    return counts
+
+
+class BatcherStats:
+    """Batch size and queue wait distributions, safe to read from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._batches = 0
+            self._rows = 0
+            self._errors = 0
+            self._batch_sizes = _empty_histogram(BATCH_SIZE_BUCKETS)
+            self._queue_waits = _empty_histogram(QUEUE_WAIT_BUCKETS_MS)
+            self._total_wait = 0.0
+            self._max_wait = 0.0
+            self._total_predict = 0.0
+
+    def record(self, size: int, waits: list, predict_seconds: float, failed: bool = False):
+        with self._lock:
+            self._batches += 1
+            self._rows += size
+            self._errors += int(failed)
+            self._batch_sizes[_bucket(size, BATCH_SIZE_BUCKETS)] += 1
+            for wait in waits:
+                self._queue_waits[_bucket(wait * 1000, QUEUE_WAIT_BUCKETS_MS)] += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            self._total_predict += predict_seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            batches, rows = self._batches, self._rows
+            return {
+                "batches": batches,
+                "rows": rows,
+                "failed_batches": self._errors,
+                "avg_batch_size": round(rows / batches, 2) if batches else 0.0,
+                "batch_size_histogram": dict(self._batch_sizes),
+                "avg_queue_wait_ms": round(self._total_wait / rows * 1000, 3) if rows else 0.0,
+                "max_queue_wait_ms": round(self._max_wait * 1000, 3),
+                "queue_wait_histogram_ms": dict(self._queue_waits),
+                "avg_predict_ms": round(self._total_predict / batches * 1000, 3) if batches else 0.0,
+            }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one vectorized call.
+
+    Callers await submit(row). A background task takes the first queued
+    row, keeps collecting until `max_rows` rows are queued or `max_wait_ms`
+    has passed since that row arrived, runs `predict_batch` on the whole
+    batch in a worker thread and resolves every caller's future with its
+    own result. While a batch is being scored new rows keep queueing, so
+    under load batches grow on their own and the wait only applies when
+    traffic is light.
+    """
+
+    def __init__(self, predict_batch, max_rows: int = MICRO_BATCH_MAX_ROWS, max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_rows = max(1, max_rows)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.stats = BatcherStats()
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            # First use, or the event loop was replaced (e.g. between test clients)
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, row: dict):
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _collect(self) -> list:
+        first = await self._queue.get()
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_rows:
+            # Whatever is already queued is taken without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            waits = [started - enqueued for _, _, enqueued in batch]
+            rows = [row for row, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.predict_batch, rows)
+            except Exception as exc:
+                self.stats.record(len(batch), waits, time.perf_counter() - started, failed=True)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.stats.record(len(batch), waits, time.perf_counter() - started)
+            for (_, future, _), result in zip(batch, results):
+                # A caller that disconnected has a cancelled future
+                if not future.done():
+                    future.set_result(result)
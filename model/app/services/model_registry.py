@@ -0,0 +1,330 @@
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import joblib
+import numpy as np
+
+from app.services.fast_ensemble import UnsupportedModel, flatten_stacking
+from app.services.model_store import (
+    ModelStoreError, clear_current_version, current_version, list_versions,
+    load_version, read_canary, set_current_version,
+)
+
+logger = logging.getLogger(__name__)
+
+# Version name of the single-file model used when the store is empty
+LEGACY_VERSION = "legacy"
+# Canary probabilities must match what the model produced at publish time
+CANARY_TOLERANCE = 1e-6
+# The flattened fast path must match the stacking model this closely
+FAST_PATH_TOLERANCE = 1e-9
+# Rows checked for fast path parity when a version has no canary sample
+FAST_PATH_CHECK_ROWS = 256
+
+
+def resident_bytes():
+    """Resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _memmapped_bytes(obj, seen=None) -> int:
+    """Bytes of np.memmap arrays reachable from a fitted estimator's attributes."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.memmap):
+        return obj.nbytes
+    if isinstance(obj, np.ndarray):
+        return 0
+    if isinstance(obj, (list, tuple)):
+        return sum(_memmapped_bytes(item, seen) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_memmapped_bytes(item, seen) for item in obj.values())
+    if hasattr(obj, "__dict__") and type(obj).__module__.split(".")[0] in ("sklearn", "xgboost"):
+        return sum(_memmapped_bytes(item, seen) for item in vars(obj).values())
+    return 0
+
+
+class LoadedModel(NamedTuple):
+    version: str
+    model: object
+    manifest: dict
+    feature_order: tuple
+    load_info: dict
+    # What predictions are served from: the flattened ensemble when it
+    # reproduces `model`, otherwise `model` itself
+    predictor: object
+
+
+class ModelRegistry:
+    """
+    The model version this process serves, swappable under live traffic.
+
+    Readers take the active LoadedModel with one attribute read and use it
+    for a whole batch, so a swap never mixes versions inside a request.
+    activate() loads a stored version, checks its checksum and feature
+    order, replays its canary sample and only then swaps it in, keeping the
+    outgoing version loaded for an instant rollback(). Requests keep being
+    served by the old version while the new one loads.
+
+    With `fast_path`, each loaded stacking model is also flattened (see
+    app/services/fast_ensemble.py) and predictions are served from the flat
+    copy once it matches the original on the canary rows; any model it
+    cannot flatten or reproduce is served as is.
+
+    The store's CURRENT file names the version to serve; other worker
+    processes notice a change within `reload_check_seconds` and switch in a
+    background thread. With an empty store the legacy single-file model is
+    served.
+
+    With `mmap_mode`, NumPy arrays stored in the (uncompressed) joblib file
+    are memory-mapped rather than copied, so processes mapping the same
+    file share those pages through the OS page cache. Estimators that copy
+    arrays into their own buffers on unpickle (sklearn trees, the XGBoost
+    booster) are not shared this way; loading before workers fork
+    (MODEL_LOAD=import with gunicorn --preload) shares them copy-on-write.
+    """
+
+    def __init__(
+        self,
+        store_dir: str,
+        legacy_path: str,
+        allowed_features,
+        mmap_mode: str = None,
+        reload_check_seconds: float = 0,
+        max_canary_drift: Optional[float] = None,
+        fast_path: bool = True,
+    ):
+        self.store_dir = store_dir
+        self.legacy_path = legacy_path
+        self.allowed_features = tuple(allowed_features)
+        self.mmap_mode = mmap_mode
+        self.reload_check_seconds = reload_check_seconds
+        self.max_canary_drift = max_canary_drift
+        self.fast_path = fast_path
+        # Serializes loads and swaps; readers never take it
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._active = None
+        self._previous = None
+        self._next_check = 0.0
+        self._reloading = False
+        self._failed_versions = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._active is not None
+
+    def get(self) -> LoadedModel:
+        active = self._active
+        if active is None:
+            return self.load()
+        if self.reload_check_seconds and time.monotonic() >= self._next_check:
+            self._check_current(active)
+        return active
+
+    def load(self) -> LoadedModel:
+        """Load the store's current version (or the legacy model) unless one is active."""
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if self._active is not None:
+                return self._active
+            version = current_version(self.store_dir)
+            self._active = self._load(version) if version else self._load_legacy()
+            self._next_check = time.monotonic() + self.reload_check_seconds
+            logger.info("Serving model version %s", self._active.version)
+            return self._active
+
+    def activate(self, version: str, persist: bool = True) -> dict:
+        """Load, validate and swap in `version`. Raises ModelStoreError if it is rejected."""
+        with self._lock:
+            active = self._active
+            if active is not None and active.version == version:
+                return {"version": version, "previous_version": None, "changed": False}
+            candidate = self._load(version)
+            canary = self._validate(candidate, active)
+            self._previous, self._active = active, candidate
+            if persist:
+                set_current_version(self.store_dir, version)
+            self._failed_versions.pop(version, None)
+        logger.info("Swapped model version %s -> %s", active.version if active else None, version)
+        return {
+            "version": version,
+            "previous_version": active.version if active else None,
+            "changed": True,
+            "canary": canary,
+        }
+
+    def rollback(self) -> dict:
+        """Swap back to the version served before the active one."""
+        with self._lock:
+            active = self._active
+            if active is None:
+                raise ModelStoreError("No model version is loaded")
+            previous = self._previous
+            if previous is None:
+                # After a restart only the store remembers what came before
+                versions = [m["version"] for m in list_versions(self.store_dir)]
+                if active.version in versions and versions.index(active.version) > 0:
+                    previous = self._load(versions[versions.index(active.version) - 1])
+                    self._validate(previous, None)
+            if previous is None:
+                raise ModelStoreError("No previous model version to roll back to")
+
+            self._active, self._previous = previous, active
+            if previous.version == LEGACY_VERSION:
+                clear_current_version(self.store_dir)
+            else:
+                set_current_version(self.store_dir, previous.version)
+        logger.info("Rolled back model version %s -> %s", active.version, previous.version)
+        return {"version": previous.version, "previous_version": active.version, "changed": True}
+
+    def stats(self) -> dict:
+        active, previous = self._active, self._previous
+        info = {
+            "store_dir": self.store_dir,
+            "mmap_mode": self.mmap_mode,
+            "loaded": active is not None,
+            "pid": os.getpid(),
+            "rss_bytes": resident_bytes(),
+            "fast_path_enabled": self.fast_path,
+            "previous_version": previous.version if previous else None,
+            "failed_versions": dict(self._failed_versions),
+        }
+        if active is not None:
+            manifest = {key: value for key, value in active.manifest.items() if key != "feature_order"}
+            info.update({"version": active.version, "manifest": manifest, **active.load_info})
+        return info
+
+    # ---------- INTERNALS ----------
+
+    def _timed_load(self, load) -> tuple:
+        rss_before = resident_bytes()
+        started = time.perf_counter()
+        model, manifest, path = load()
+        load_seconds = time.perf_counter() - started
+        rss_after = resident_bytes()
+        load_info = {
+            "path": path,
+            "load_seconds": round(load_seconds, 3),
+            "file_bytes": os.path.getsize(path),
+            "memmapped_bytes": _memmapped_bytes(model) if self.mmap_mode else 0,
+            # Includes libraries (sklearn, xgboost) first imported by the unpickle
+            "load_rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+        }
+        return model, manifest, load_info
+
+    def _load(self, version: str) -> LoadedModel:
+        def load():
+            model, manifest = load_version(self.store_dir, version, self.mmap_mode)
+            return model, manifest, os.path.join(self.store_dir, version, manifest["file"])
+
+        model, manifest, load_info = self._timed_load(load)
+        feature_order = tuple(manifest["feature_order"])
+        unknown = set(feature_order) - set(self.allowed_features)
+        if unknown:
+            raise ModelStoreError(f"Model version {version} uses unknown features: {', '.join(sorted(unknown))}")
+        canary = read_canary(self.store_dir, version)
+        predictor = self._predictor(model, canary[0] if canary else None, len(feature_order), load_info)
+        return LoadedModel(version, model, manifest, feature_order, load_info, predictor)
+
+    def _load_legacy(self) -> LoadedModel:
+        def load():
+            model = joblib.load(self.legacy_path, mmap_mode=self.mmap_mode)
+            manifest = {"version": LEGACY_VERSION, "file": self.legacy_path, "threshold": None, "metrics": {}}
+            return model, manifest, self.legacy_path
+
+        model, manifest, load_info = self._timed_load(load)
+        predictor = self._predictor(model, None, len(self.allowed_features), load_info)
+        return LoadedModel(LEGACY_VERSION, model, manifest, self.allowed_features, load_info, predictor)
+
+    def _predictor(self, model, rows, n_features: int, load_info: dict):
+        """The flattened ensemble if it reproduces `model` on `rows`, else `model`."""
+        if not self.fast_path:
+            load_info["fast_path"] = {"enabled": False}
+            return model
+        if rows is None or not len(rows):
+            # Small non-negative integers, like every RiskRequest field
+            rows = np.random.default_rng(0).integers(0, 31, size=(FAST_PATH_CHECK_ROWS, n_features)).astype(np.float64)
+        try:
+            flat = flatten_stacking(model)
+            max_error = float(np.max(np.abs(flat.predict_proba(rows)[:, 1] - model.predict_proba(rows)[:, 1])))
+        except UnsupportedModel as exc:
+            load_info["fast_path"] = {"enabled": False, "reason": str(exc)}
+            return model
+        if not max_error <= FAST_PATH_TOLERANCE:
+            logger.warning("Flattened model differs by %.3g from the stacking model; serving it unflattened", max_error)
+            load_info["fast_path"] = {"enabled": False, "reason": f"parity check failed (max error {max_error:.3g})"}
+            return model
+        load_info["fast_path"] = {"enabled": True, "parity_rows": len(rows), "max_error": max_error, **flat.describe()}
+        return flat
+
+    def _validate(self, candidate: LoadedModel, active: Optional[LoadedModel]) -> dict:
+        """Replay the candidate's canary sample; optionally bound its drift from the active model."""
+        canary = read_canary(self.store_dir, candidate.version) if candidate.version != LEGACY_VERSION else None
+        if canary is None:
+            # Nothing recorded to compare against; at least make sure it predicts
+            rows = np.zeros((1, len(candidate.feature_order)))
+            probs = candidate.predictor.predict_proba(rows)[:, 1]
+            if not np.all(np.isfinite(probs)):
+                raise ModelStoreError(f"Model version {candidate.version} produced non-finite probabilities")
+            return {"rows": 0}
+
+        rows, expected = canary
+        probs = candidate.predictor.predict_proba(rows)[:, 1]
+        max_error = float(np.max(np.abs(probs - expected))) if len(rows) else 0.0
+        if not np.all(np.isfinite(probs)) or max_error > CANARY_TOLERANCE:
+            raise ModelStoreError(
+                f"Model version {candidate.version} does not reproduce its canary sample (max error {max_error:.3g})"
+            )
+        report = {"rows": len(rows), "max_error": max_error}
+
+        if active is not None and set(active.feature_order) <= set(candidate.feature_order):
+            columns = [candidate.feature_order.index(name) for name in active.feature_order]
+            drift = np.abs(probs - active.predictor.predict_proba(rows[:, columns])[:, 1])
+            report.update({"max_drift": float(drift.max()), "mean_drift": float(drift.mean())})
+            if self.max_canary_drift is not None and report["max_drift"] > self.max_canary_drift:
+                raise ModelStoreError(
+                    f"Model version {candidate.version} drifts {report['max_drift']:.3f} from "
+                    f"{active.version} on the canary sample (limit {self.max_canary_drift})"
+                )
+        return report
+
+    def _check_current(self, active: LoadedModel):
+        # Follow CURRENT changes made by another process (activate/rollback on another worker, train.py)
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            if self._reloading or time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.reload_check_seconds
+            version = current_version(self.store_dir) or LEGACY_VERSION
+            if version == active.version or version in self._failed_versions:
+                return
+            self._reloading = True
+        finally:
+            self._check_lock.release()
+        threading.Thread(target=self._background_activate, args=(version,), daemon=True).start()
+
+    def _background_activate(self, version: str):
+        try:
+            if version == LEGACY_VERSION:
+                with self._lock:
+                    self._previous, self._active = self._active, self._load_legacy()
+            else:
+                self.activate(version, persist=False)
+        except Exception as exc:
+            # Keep serving the current version and stop retrying this one
+            with self._lock:
+                self._failed_versions[version] = str(exc)
+            logger.exception("Could not switch to model version %s", version)
+        finally:
+            self._reloading = False
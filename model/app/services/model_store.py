@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+
+# Store layout:
+#   <store>/CURRENT                    active version name
+#   <store>/<version>/model.pkl        joblib dump (uncompressed, so it can be mmapped)
+#   <store>/<version>/manifest.json    version, feature order, threshold, metrics, checksum
+#   <store>/<version>/canary.json      sample rows and the probabilities the model gave them
+MODEL_FILE = "model.pkl"
+MANIFEST_FILE = "manifest.json"
+CANARY_FILE = "canary.json"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelStoreError(Exception):
+    """A model version is missing, corrupt or fails validation."""
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, data: str):
+    # Readers see either the old file or the new one, never a partial write
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def version_dir(store_dir: str, version: str) -> str:
+    if not version or os.sep in version or version.startswith("."):
+        raise ModelStoreError(f"Invalid model version: {version!r}")
+    return os.path.join(store_dir, version)
+
+
+def list_versions(store_dir: str) -> list:
+    """Manifests of every stored version, oldest first."""
+    if not os.path.isdir(store_dir):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(store_dir)):
+        path = os.path.join(store_dir, name, MANIFEST_FILE)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def read_manifest(store_dir: str, version: str) -> dict:
+    path = os.path.join(version_dir(store_dir, version), MANIFEST_FILE)
+    if not os.path.isfile(path):
+        raise ModelStoreError(f"Unknown model version: {version}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_canary(store_dir: str, version: str):
+    """(rows, expected probabilities) recorded when the version was published, or None."""
+    path = os.path.join(version_dir(store_dir, version), CANARY_FILE)
+    if not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        canary = json.load(f)
+    return np.asarray(canary["rows"], dtype=np.float64), np.asarray(canary["expected"], dtype=np.float64)
+
+
+def current_version(store_dir: str):
+    try:
+        with open(os.path.join(store_dir, CURRENT_FILE), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def set_current_version(store_dir: str, version: str):
+    read_manifest(store_dir, version)
+    _write_atomic(os.path.join(store_dir, CURRENT_FILE), version + "\n")
+
+
+def clear_current_version(store_dir: str):
+    """Go back to serving the legacy single-file model."""
+    try:
+        os.remove(os.path.join(store_dir, CURRENT_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def load_version(store_dir: str, version: str, mmap_mode: str = None):
+    """(model, manifest) for `version`, after checking the file against its checksum."""
+    manifest = read_manifest(store_dir, version)
+    path = os.path.join(version_dir(store_dir, version), manifest.get("file", MODEL_FILE))
+    if file_sha256(path) != manifest["sha256"]:
+        raise ModelStoreError(f"Checksum mismatch for model version {version}")
+    return joblib.load(path, mmap_mode=mmap_mode), manifest
+
+
+def publish_version(
+    store_dir: str,
+    model,
+    feature_order: list,
+    threshold: float,
+    metrics: dict,
+    canary_rows=None,
+    version: str = None,
+    activate: bool = False,
+) -> dict:
+    """
+    Write a fitted model into the store as a new version and return its
+    manifest. Probabilities for `canary_rows` are recorded so the serving
+    side can check it reproduces them before switching to this version.
+    """
+    import sklearn
+    import xgboost
+
+    version = version or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    target = version_dir(store_dir, version)
+    if os.path.exists(target):
+        raise ModelStoreError(f"Model version already exists: {version}")
+    os.makedirs(target)
+
+    model_path = os.path.join(target, MODEL_FILE)
+    joblib.dump(model, model_path)
+
+    if canary_rows is not None:
+        rows = np.asarray(canary_rows, dtype=np.float64)
+        canary = {"rows": rows.tolist(), "expected": model.predict_proba(rows)[:, 1].tolist()}
+        with open(os.path.join(target, CANARY_FILE), "w", encoding="utf-8") as f:
+            json.dump(canary, f)
+
+    manifest = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "file": MODEL_FILE,
+        "sha256": file_sha256(model_path),
+        "feature_order": list(feature_order),
+        "threshold": threshold,
+        "metrics": metrics,
+        "libraries": {"scikit-learn": sklearn.__version__, "xgboost": xgboost.__version__},
+    }
+    # The manifest is written last: a version without one is not listed or loadable
+    _write_atomic(os.path.join(target, MANIFEST_FILE), json.dumps(manifest, indent=2))
+
+    if activate:
+        set_current_version(store_dir, version)
+    return manifest
@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Per-entry bookkeeping not covered by sys.getsizeof of the key and value:
+# the OrderedDict slot and link node, the key tuple and the expiry float
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predicted probabilities with an optional TTL.
+
+    Keys are (model version, packed feature row) so a model swap never
+    serves another version's results; entries of a retired version simply
+    age out of the LRU. Once `max_entries` is reached the least recently
+    used entry is evicted; with `ttl_seconds` entries also expire that long
+    after they were stored (0 keeps them until evicted).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0, clock=time.monotonic):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expirations = 0
+
+    def get_many(self, keys: list) -> list:
+        """Cached value for each key, or None where it is missing or expired."""
+        now = self.clock()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is not None and entry[1] <= now:
+                    self._remove(key)
+                    self._expirations += 1
+                    entry = None
+                if entry is None:
+                    self._misses += 1
+                    values.append(None)
+                else:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    values.append(entry[0])
+        return values
+
+    def put_many(self, items):
+        """Store (key, value) pairs, evicting least recently used entries past max_entries."""
+        expires = self.clock() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            for key, value in items:
+                if key in self._entries:
+                    self._remove(key)
+                self._entries[key] = (value, expires)
+                self._bytes += self._entry_bytes(key, value)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "approx_bytes": self._bytes,
+            }
+
+    # ---------- INTERNALS ----------
+
+    @staticmethod
+    def _entry_bytes(key, value) -> int:
+        return sum(sys.getsizeof(part) for part in key) + sys.getsizeof(value) + ENTRY_OVERHEAD_BYTES
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= self._entry_bytes(key, value)
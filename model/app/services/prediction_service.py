@@ -1,9 +1,12 @@
-import joblib
-import os
 import numpy as np
 
-MODEL_PATH = os.path.join("app", "models", "trained_model.pkl")
-model = joblib.load(MODEL_PATH)
+from app.config import (
+    MODEL_CANARY_MAX_DRIFT, MODEL_FAST_PATH, MODEL_LOAD, MODEL_MMAP_MODE, MODEL_PATH, MODEL_RELOAD_CHECK_SECONDS, MODEL_STORE_DIR,
+    PREDICTION_CACHE_BMI_DECIMALS, PREDICTION_CACHE_ENABLED, PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS,
+)
+from app.services.micro_batcher import MicroBatcher
+from app.services.model_registry import ModelRegistry
+from app.services.prediction_cache import PredictionCache
 
 FEATURE_ORDER = [
     'Diabetes_012',
@@ -28,21 +31,91 @@ FEATURE_ORDER = [
     'Income'
 ]
 
-def predict_risk(input_data: dict):
-
-    features = np.array([[input_data[col] for col in FEATURE_ORDER]])
+model_registry = ModelRegistry(
+    MODEL_STORE_DIR,
+    MODEL_PATH,
+    FEATURE_ORDER,
+    mmap_mode=MODEL_MMAP_MODE,
+    reload_check_seconds=MODEL_RELOAD_CHECK_SECONDS,
+    max_canary_drift=MODEL_CANARY_MAX_DRIFT,
+    fast_path=MODEL_FAST_PATH,
+)
+if MODEL_LOAD == "import":
+    model_registry.load()
 
-    prob = model.predict_proba(features)[0][1]
+# Shared by every prediction path in this process; None when disabled
+prediction_cache = (
+    PredictionCache(PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_SECONDS) if PREDICTION_CACHE_ENABLED else None
+)
 
-    risk_score = float(round(prob * 100, 2))
 
+def risk_level(risk_score: float) -> str:
     if risk_score <= 25:
-        level = "Low"
+        return "Low"
     elif risk_score <= 50:
-        level = "Moderate"
+        return "Moderate"
     elif risk_score <= 75:
-        level = "High"
+        return "High"
+    return "Critical"
+
+
+def feature_matrix(rows: list, feature_order=FEATURE_ORDER) -> np.ndarray:
+    """One contiguous float64 row per input dict, columns in `feature_order`."""
+    return np.array([[row[col] for col in feature_order] for row in rows], dtype=np.float64)
+
+
+def predict_risk_batch(rows: list) -> list:
+    """
+    Score many inputs with a single predict_proba call, so the stacking
+    ensemble's per-call overhead is paid once per batch instead of per row.
+    Returns [(risk_score, risk_level, model_version), ...] in input order;
+    the whole batch is scored by one model version. Rows found in the
+    prediction cache skip the model; only the rest are scored.
+    """
+    if not rows:
+        return []
+
+    active = model_registry.get()
+    matrix = feature_matrix(rows, active.feature_order)
+
+    if prediction_cache is None:
+        probs = active.predictor.predict_proba(matrix)[:, 1]
     else:
-        level = "Critical"
+        probs = _cached_probabilities(active, matrix)
+
+    results = []
+    for prob in probs:
+        risk_score = float(round(prob * 100, 2))
+        results.append((risk_score, risk_level(risk_score), active.version))
+    return results
+
+
+def _cached_probabilities(active, matrix: np.ndarray) -> list:
+    if PREDICTION_CACHE_BMI_DECIMALS is not None and "BMI" in active.feature_order:
+        # Rows that round to the same BMI are scored as, and cached under, the rounded row
+        column = active.feature_order.index("BMI")
+        matrix[:, column] = np.round(matrix[:, column], PREDICTION_CACHE_BMI_DECIMALS)
+
+    # Keyed by the packed float64 row, so only identical feature vectors share an entry
+    keys = [(active.version, row.tobytes()) for row in matrix]
+    probs = prediction_cache.get_many(keys)
+    missing = [i for i, prob in enumerate(probs) if prob is None]
+    if missing:
+        scored = active.predictor.predict_proba(matrix[missing])[:, 1].tolist()
+        for i, prob in zip(missing, scored):
+            probs[i] = prob
+        prediction_cache.put_many((keys[i], prob) for i, prob in zip(missing, scored))
+    return probs
+
+
+def predict_risk(input_data: dict):
+    return predict_risk_batch([input_data])[0]
+
+
+# Shared by every /api/predict request in this process
+prediction_batcher = MicroBatcher(predict_risk_batch)
+
 
-    return risk_score, level
+async def predict_risk_batched(input_data: dict):
+    """predict_risk, scored together with whatever other rows are queued."""
+    return await prediction_batcher.submit(input_data)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# Benchmark: single-row latency of the flattened ensemble vs. the stacking model
+#
+# Scores one random profile at a time with StackingClassifier.predict_proba
+# and with the FlatStackingEnsemble exported from it (and with each of its
+# base models alone, to show where the remaining time goes), then reports
+# p50/p99 latency and the largest probability difference seen.
+#
+# Run from anywhere:
+#   python bench_fast_path.py
+#   python bench_fast_path.py --requests 2000
+import argparse
+import os
+import sys
+import time
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def latencies_ms(fn, rows):
+    fn(rows[0])  # warm-up
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        fn(row)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500, help="single-row predictions per measurement")
+    args = parser.parse_args()
+
+    # sklearn warns on every call that the model was fitted with feature names
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    import numpy as np
+    from app.services.fast_ensemble import flatten_stacking
+    from app.services.prediction_service import feature_matrix, model_registry
+    from bench_predict_batch import random_rows
+
+    model = model_registry.load().model
+    started = time.perf_counter()
+    flat = flatten_stacking(model)
+    print(f"Export: {(time.perf_counter() - started) * 1000:.1f} ms, {flat.describe()}\n")
+
+    matrix = feature_matrix(random_rows(args.requests, seed=1))
+    rows = [matrix[i:i + 1] for i in range(len(matrix))]
+
+    measurements = [("stacking predict_proba", model.predict_proba), ("flat predict_proba", flat.predict_proba)]
+    measurements += [(f"  {type(base).__name__}", base.positive_proba) for base in flat.base_models]
+
+    print(f"{'path':>24} | {'p50 ms':>8} | {'p99 ms':>8}")
+    print("-" * 46)
+    for name, fn in measurements:
+        timings = latencies_ms(fn, rows)
+        print(f"{name:>24} | {percentile(timings, 50):8.3f} | {percentile(timings, 99):8.3f}")
+
+    max_error = np.max(np.abs(model.predict_proba(matrix) - flat.predict_proba(matrix)))
+    print(f"\nMax |stacking - flat| over {len(matrix)} rows: {max_error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Benchmark: concurrent single-row /api/predict with and without micro-batching
+#
+# Simulates C clients each sending one row at a time through the ASGI app
+# (no network). Without micro-batching every request runs the ensemble on
+# its own in the thread pool; with it, concurrent requests are coalesced
+# into one predict_proba. Reports throughput, latency percentiles and the
+# batcher's batch size distribution.
+#
+# Run from anywhere:
+#   python bench_micro_batching.py
+#   python bench_micro_batching.py --concurrency 1 16 64 --requests 400 --max-wait-ms 2
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_predict_batch import random_rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=256, help="requests per measurement")
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--max-wait-ms", type=float, default=None)
+    return parser.parse_args()
+
+
+async def run_clients(client, rows, concurrency):
+    latencies = []
+    queue = list(rows)
+
+    async def worker():
+        while queue:
+            row = queue.pop()
+            start = time.perf_counter()
+            response = await client.post("/api/predict", json=row)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return len(rows) / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def main():
+    args = parse_args()
+    warnings.filterwarnings("ignore", category=UserWarning)
+    # The same rows are scored repeatedly; measure the model, not the prediction cache
+    os.environ.setdefault("PREDICTION_CACHE_ENABLED", "0")
+
+    import httpx
+    from app.main import app
+    from app.routes import risk_routes
+    from app.services.prediction_service import model_registry, prediction_batcher
+
+    model_registry.load()
+
+    if args.max_rows is not None:
+        prediction_batcher.max_rows = args.max_rows
+    if args.max_wait_ms is not None:
+        prediction_batcher.max_wait = args.max_wait_ms / 1000
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'clients':>7} | {'mode':<9} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | avg batch")
+        for concurrency in args.concurrency:
+            rows = random_rows(args.requests, seed=concurrency)
+            for enabled in (False, True):
+                risk_routes.MICRO_BATCH_ENABLED = enabled
+                prediction_batcher.stats.reset()
+                throughput, p50, p99 = await run_clients(client, rows, concurrency)
+                batch = prediction_batcher.stats.snapshot()["avg_batch_size"] if enabled else 1
+                mode = "batched" if enabled else "per-call"
+                print(f"{concurrency:>7} | {mode:<9} | {throughput:>8,.0f} | {p50:>8.1f} | {p99:>8.1f} | {batch}")
+        await prediction_batcher.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# Benchmark: rows/sec of batched vs. row-at-a-time risk prediction
+#
+# For each batch size, scores random BRFSS-style profiles three ways: one
+# predict_risk call per row (what /api/predict costs), one
+# predict_risk_batch call for the whole batch, and the /api/predict/batch
+# endpoint end to end (JSON parsing and validation included).
+#
+# Run from anywhere:
+#   python bench_predict_batch.py
+#   python bench_predict_batch.py --sizes 1 32 256 4096 --seconds 3
+import argparse
+import os
+import random
+import sys
+import time
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Inclusive value range of each RiskRequest field in the training data
+FIELD_RANGES = {
+    "Diabetes_012": (0, 2), "HighBP": (0, 1), "HighChol": (0, 1), "CholCheck": (0, 1),
+    "BMI": (12, 98), "Smoker": (0, 1), "PhysActivity": (0, 1), "Fruits": (0, 1),
+    "Veggies": (0, 1), "HvyAlcoholConsump": (0, 1), "AnyHealthcare": (0, 1), "NoDocbcCost": (0, 1),
+    "GenHlth": (1, 5), "MentHlth": (0, 30), "PhysHlth": (0, 30), "DiffWalk": (0, 1),
+    "Sex": (0, 1), "Age": (1, 13), "Education": (1, 6), "Income": (1, 8),
+}
+
+
+def random_rows(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {field: (float(rng.randint(lo, hi)) if field == "BMI" else rng.randint(lo, hi))
+         for field, (lo, hi) in FIELD_RANGES.items()}
+        for _ in range(n)
+    ]
+
+
+def rows_per_second(fn, rows, seconds):
+    # Repeat until the time budget is spent so small batches are measured fairly
+    done, start = 0, time.perf_counter()
+    while True:
+        fn(rows)
+        done += len(rows)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 32, 256, 4096])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time budget per measurement")
+    args = parser.parse_args()
+
+    # sklearn warns on every call that the model was fitted with feature names
+    warnings.filterwarnings("ignore", category=UserWarning)
+    # The same rows are scored repeatedly; measure the model, not the prediction cache
+    os.environ.setdefault("PREDICTION_CACHE_ENABLED", "0")
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.prediction_service import model_registry, predict_risk, predict_risk_batch
+
+    client = TestClient(app)
+    # Keep the one-off model load out of the measurements
+    model_registry.load()
+
+    def per_row(rows):
+        for row in rows:
+            predict_risk(row)
+
+    def batched(rows):
+        predict_risk_batch(rows)
+
+    def endpoint(rows):
+        client.post("/api/predict/batch", json=rows).raise_for_status()
+
+    print(f"{'batch':>6} | {'per-row':>12} | {'batched':>12} | {'endpoint':>12}   (rows/sec)")
+    for size in args.sizes:
+        rows = random_rows(size, seed=size)
+        # Row-at-a-time cost does not depend on the batch size; cap its sample
+        single = rows_per_second(per_row, rows[:32], args.seconds)
+        batch = rows_per_second(batched, rows, args.seconds)
+        http = rows_per_second(endpoint, rows, args.seconds)
+        print(f"{size:>6} | {single:>12,.0f} | {batch:>12,.0f} | {http:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# The flattened ensemble must give the stacking model's probabilities, and
+# the service must fall back to the stacking model when it cannot.
+import os
+import sys
+import tempfile
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the service off the real model store
+os.environ.setdefault("MODEL_STORE_DIR", tempfile.mkdtemp())
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import joblib
+import numpy as np
+from sklearn.ensemble import StackingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from app.config import MODEL_PATH
+from app.services.fast_ensemble import FlatStackingEnsemble, UnsupportedModel, flatten_stacking
+from app.services.model_registry import FAST_PATH_TOLERANCE
+from app.services.prediction_service import FEATURE_ORDER, feature_matrix, model_registry, predict_risk_batch
+from bench_predict_batch import FIELD_RANGES, random_rows
+
+MODEL = joblib.load(MODEL_PATH)
+FLAT = flatten_stacking(MODEL)
+
+
+def test_flat_ensemble_matches_stacking_model():
+    rows = feature_matrix(random_rows(4000, seed=24))
+    # Corners of the input space, where split thresholds are easiest to get wrong
+    lows = [FIELD_RANGES[name][0] for name in FEATURE_ORDER]
+    highs = [FIELD_RANGES[name][1] for name in FEATURE_ORDER]
+    rows = np.vstack([rows, lows, highs, [[25.5] * len(FEATURE_ORDER)]])
+
+    expected = MODEL.predict_proba(rows)
+    actual = FLAT.predict_proba(rows)
+    assert actual.shape == expected.shape
+    assert np.max(np.abs(actual - expected)) <= FAST_PATH_TOLERANCE
+
+    # Each base model separately, so a mismatch points at its cause
+    for estimator, flat in zip(MODEL.estimators_, FLAT.base_models):
+        assert np.max(np.abs(flat.positive_proba(rows) - estimator.predict_proba(rows)[:, 1])) <= FAST_PATH_TOLERANCE
+
+    # A single row goes down the same path as a batch
+    assert np.max(np.abs(FLAT.predict_proba(rows[:1]) - expected[:1])) <= FAST_PATH_TOLERANCE
+
+
+def test_service_serves_the_flat_ensemble():
+    active = model_registry.get()
+    assert isinstance(active.predictor, FlatStackingEnsemble)
+    assert active.load_info["fast_path"]["enabled"]
+
+    rows = random_rows(32, seed=7)
+    expected = MODEL.predict_proba(feature_matrix(rows))[:, 1]
+    scores = [score for score, _, _ in predict_risk_batch(rows)]
+    assert scores == [float(round(prob * 100, 2)) for prob in expected]
+
+
+def test_unsupported_models_are_not_flattened():
+    X = feature_matrix(random_rows(200, seed=3))
+    y = (X[:, FEATURE_ORDER.index("HighBP")] > 0).astype(int)
+    tree = DecisionTreeClassifier(max_depth=3).fit(X, y)
+    stack = StackingClassifier([("tree", tree)], final_estimator=LogisticRegression(), cv=2).fit(X, y)
+
+    for model in (tree, stack):
+        try:
+            flatten_stacking(model)
+        except UnsupportedModel:
+            pass
+        else:
+            raise AssertionError(f"{type(model).__name__} should not be flattened")
+
+    load_info = {}
+    assert model_registry._predictor(stack, None, len(FEATURE_ORDER), load_info) is stack
+    assert load_info["fast_path"]["enabled"] is False
+
+
+if __name__ == "__main__":
+    test_flat_ensemble_matches_stacking_model()
+    test_service_serves_the_flat_ensemble()
+    test_unsupported_models_are_not_flattened()
+    print("Fast ensemble tests passed")
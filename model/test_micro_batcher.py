@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+# MicroBatcher: concurrent submit() calls are scored together, each caller
+# gets its own row's result, batches respect max_rows / max_wait_ms, and a
+# failing batch fails only its own callers.
+import asyncio
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.micro_batcher import MicroBatcher
+
+
+class StubPredictor:
+    """predict_batch stand-in recording the batches it was given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, rows):
+        self.batches.append([row["id"] for row in rows])
+        if any(row.get("fail") for row in rows):
+            raise ValueError("bad row")
+        return [row["id"] * 10 for row in rows]
+
+
+def test_results_return_to_their_callers_in_bounded_batches():
+    predictor = StubPredictor()
+    batcher = MicroBatcher(predictor, max_rows=8, max_wait_ms=50)
+
+    async def main():
+        results = await asyncio.gather(*(batcher.submit({"id": i}) for i in range(20)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(main()) == [i * 10 for i in range(20)]
+    # Everything was queued at once, so batches fill to max_rows without waiting
+    assert predictor.batches == [list(range(0, 8)), list(range(8, 16)), list(range(16, 20))]
+
+    stats = batcher.stats.snapshot()
+    assert (stats["batches"], stats["rows"], stats["failed_batches"]) == (3, 20, 0)
+    assert stats["batch_size_histogram"]["<=8"] == 2 and stats["batch_size_histogram"]["<=4"] == 1
+    assert sum(stats["queue_wait_histogram_ms"].values()) == 20
+    assert stats["avg_batch_size"] == round(20 / 3, 2)
+
+
+def test_lone_request_waits_at_most_max_wait():
+    predictor = StubPredictor()
+    batcher = MicroBatcher(predictor, max_rows=64, max_wait_ms=20)
+
+    async def main():
+        started = time.perf_counter()
+        first = await batcher.submit({"id": 1})
+        elapsed = time.perf_counter() - started
+        second = await batcher.submit({"id": 2})
+        await batcher.stop()
+        return first, second, elapsed
+
+    first, second, elapsed = asyncio.run(main())
+    assert (first, second) == (10, 20)
+    assert predictor.batches == [[1], [2]]
+    # Held for the full window hoping for company, then scored alone
+    assert 0.015 <= elapsed < 1.0
+    stats = batcher.stats.snapshot()
+    assert stats["batch_size_histogram"]["<=1"] == 2
+    assert stats["max_queue_wait_ms"] >= 15
+    assert stats["queue_wait_histogram_ms"]["<=20"] + stats["queue_wait_histogram_ms"]["<=50"] >= 1
+
+
+def test_failed_batch_fails_its_callers_and_the_loop_keeps_running():
+    predictor = StubPredictor()
+    batcher = MicroBatcher(predictor, max_rows=4, max_wait_ms=50)
+
+    async def main():
+        rows = [{"id": 1}, {"id": 2, "fail": True}, {"id": 3}]
+        failed = await asyncio.gather(*(batcher.submit(row) for row in rows), return_exceptions=True)
+        after = await batcher.submit({"id": 4})
+        await batcher.stop()
+        return failed, after
+
+    failed, after = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in failed)
+    assert after == 40
+    stats = batcher.stats.snapshot()
+    assert (stats["batches"], stats["failed_batches"], stats["rows"]) == (2, 1, 4)
+
+
+def test_restarts_on_a_new_event_loop():
+    predictor = StubPredictor()
+    batcher = MicroBatcher(predictor, max_rows=4, max_wait_ms=1)
+
+    # Without stop(): the worker task belongs to a loop that is now closed
+    assert asyncio.run(batcher.submit({"id": 1})) == 10
+    assert asyncio.run(batcher.submit({"id": 2})) == 20
+    assert predictor.batches == [[1], [2]]
+
+
+if __name__ == "__main__":
+    test_results_return_to_their_callers_in_bounded_batches()
+    test_lone_request_waits_at_most_max_wait()
+    test_failed_batch_fails_its_callers_and_the_loop_keeps_running()
+    test_restarts_on_a_new_event_loop()
+    print("Micro-batcher tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+# ModelRegistry loads lazily and exactly once however many requests race
+# for it, memory-maps the model's arrays, and reports where the model came
+# from and what loading it cost; MODEL_LOAD picks when the app loads it.
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("MODEL_STORE_DIR", tempfile.mkdtemp())
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.services import model_registry as registry_module
+from app.services.model_registry import LEGACY_VERSION, ModelRegistry
+from app.services.prediction_service import FEATURE_ORDER
+
+FEATURES = ("a", "b", "c")
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_model_file() -> str:
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, len(FEATURES)))
+    model = LogisticRegression().fit(X, (X[:, 0] > 0).astype(int))
+    path = os.path.join(tempfile.mkdtemp(), "legacy.pkl")
+    joblib.dump(model, path)
+    return path
+
+
+def test_concurrent_get_loads_once():
+    path = legacy_model_file()
+    registry = ModelRegistry(tempfile.mkdtemp(), path, FEATURES, mmap_mode="r")
+    assert not registry.loaded and registry.stats()["loaded"] is False
+
+    loads = []
+    real_load = registry_module.joblib.load
+
+    def slow_load(*args, **kwargs):
+        loads.append(kwargs.get("mmap_mode"))
+        time.sleep(0.2)  # keep the race window open
+        return real_load(*args, **kwargs)
+
+    registry_module.joblib.load = slow_load
+    try:
+        barrier = threading.Barrier(8)
+        results = []
+
+        def request():
+            barrier.wait()
+            results.append(registry.get())
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        registry_module.joblib.load = real_load
+
+    assert loads == ["r"]
+    assert len(results) == 8 and all(result is results[0] for result in results)
+    assert results[0].version == LEGACY_VERSION and results[0].feature_order == FEATURES
+
+    stats = registry.stats()
+    assert stats["loaded"] and stats["version"] == LEGACY_VERSION
+    assert stats["path"] == path and stats["file_bytes"] == os.path.getsize(path)
+    assert stats["mmap_mode"] == "r" and stats["memmapped_bytes"] > 0
+    assert stats["load_seconds"] >= 0.2
+    assert stats["pid"] == os.getpid()
+    assert stats["rss_bytes"] is None or stats["rss_bytes"] > 0
+    assert isinstance(results[0].model.coef_, np.memmap)
+
+
+def load_state(mode: str) -> str:
+    # MODEL_LOAD is read at import, so each mode needs a fresh interpreter
+    script = (
+        "import warnings; warnings.filterwarnings('ignore')\n"
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "from app.services.prediction_service import model_registry\n"
+        "states = [model_registry.loaded]\n"
+        "with TestClient(app) as client:\n"
+        "    states.append(model_registry.loaded)\n"
+        "    info = client.get('/api/model/info').json()\n"
+        "    states.append(info['loaded'])\n"
+        "    client.post('/api/predict/batch', json=[dict.fromkeys(%r, 1)]).raise_for_status()\n"
+        "    states.append(model_registry.loaded)\n"
+        "print(''.join('1' if state else '0' for state in states))\n"
+    ) % (FEATURE_ORDER,)
+    env = dict(os.environ, MODEL_LOAD=mode, MODEL_STORE_DIR=tempfile.mkdtemp())
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=MODEL_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+def test_model_load_modes():
+    # Loaded: at import, after startup, per /api/model/info, after a prediction
+    assert load_state("import") == "1111"
+    assert load_state("startup") == "0111"
+    assert load_state("lazy") == "0001"
+
+
+if __name__ == "__main__":
+    test_concurrent_get_loads_once()
+    test_model_load_modes()
+    print("Model registry tests passed")
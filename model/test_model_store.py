@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+# Versioned model store: a published version is validated (checksum,
+# canary sample) before it is swapped in, predictions are tagged with the
+# version that scored them, and rollback restores the previous one.
+import copy
+import json
+import os
+import sys
+import tempfile
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("MODEL_STORE_DIR", tempfile.mkdtemp())
+os.environ.setdefault("MODEL_RELOAD_CHECK_SECONDS", "0")
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import risk_routes
+from app.services.model_store import current_version, publish_version
+from app.services.prediction_service import FEATURE_ORDER, model_registry
+from bench_predict_batch import random_rows
+
+client = TestClient(app)
+TOKEN = "test-admin-token"
+# Config is read once at import; enable model administration for these tests
+risk_routes.MODEL_ADMIN_TOKEN = TOKEN
+client.headers["X-Admin-Token"] = TOKEN
+ROWS = random_rows(16, seed=23)
+CANARY = np.array([[row[name] for name in FEATURE_ORDER] for row in ROWS])
+
+
+def publish(name, model=None, **kwargs):
+    store = model_registry.store_dir
+    if not os.path.exists(os.path.join(store, name)):
+        publish_version(store, model or model_registry.get().model, FEATURE_ORDER, 0.35, {}, canary_rows=CANARY, version=name, **kwargs)
+    return os.path.join(store, name)
+
+
+def predict_version():
+    response = client.post("/api/predict", json=ROWS[0])
+    assert response.status_code == 200
+    return response.json()["model_version"]
+
+
+def test_activate_tags_predictions_and_rolls_back():
+    publish("t-base")
+    shifted = copy.deepcopy(model_registry.get().model)
+    shifted.final_estimator_.intercept_ = shifted.final_estimator_.intercept_ + 0.5
+    publish("t-shifted", shifted)
+
+    client.post("/api/model/versions/t-base/activate").raise_for_status()
+    swap = client.post("/api/model/versions/t-shifted/activate").json()
+    assert swap["previous_version"] == "t-base"
+    assert swap["canary"]["rows"] == len(ROWS) and swap["canary"]["max_drift"] > 0
+    assert predict_version() == "t-shifted"
+    assert client.post("/api/predict/batch", json=ROWS[:2]).json()["model_version"] == "t-shifted"
+    assert current_version(model_registry.store_dir) == "t-shifted"
+
+    rollback = client.post("/api/model/rollback").json()
+    assert rollback == {"version": "t-base", "previous_version": "t-shifted", "changed": True}
+    assert predict_version() == "t-base"
+
+
+def test_corrupt_or_unreproducible_versions_are_rejected():
+    serving = predict_version()
+
+    path = publish("t-corrupt")
+    with open(os.path.join(path, "model.pkl"), "ab") as f:
+        f.write(b"\0")
+    response = client.post("/api/model/versions/t-corrupt/activate")
+    assert response.status_code == 400 and "Checksum" in response.json()["detail"]
+
+    path = publish("t-bad-canary")
+    canary_path = os.path.join(path, "canary.json")
+    with open(canary_path) as f:
+        canary = json.load(f)
+    canary["expected"][0] += 0.05
+    with open(canary_path, "w") as f:
+        json.dump(canary, f)
+    response = client.post("/api/model/versions/t-bad-canary/activate")
+    assert response.status_code == 400 and "canary" in response.json()["detail"]
+
+    assert client.post("/api/model/versions/t-missing/activate").status_code == 400
+    # Rejected versions never reach traffic
+    assert predict_version() == serving
+
+
+def test_admin_endpoints_require_the_token():
+    publish("t-base")
+    for headers in ({"X-Admin-Token": ""}, {"X-Admin-Token": "wrong"}):
+        assert client.post("/api/model/versions/t-base/activate", headers=headers).status_code == 401
+        assert client.post("/api/model/rollback", headers=headers).status_code == 401
+
+    risk_routes.MODEL_ADMIN_TOKEN = None
+    try:
+        assert client.post("/api/model/rollback").status_code == 403
+    finally:
+        risk_routes.MODEL_ADMIN_TOKEN = TOKEN
+
+
+if __name__ == "__main__":
+    test_activate_tags_predictions_and_rolls_back()
+    test_corrupt_or_unreproducible_versions_are_rejected()
+    test_admin_endpoints_require_the_token()
+    print("Model store tests passed")
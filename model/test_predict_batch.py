@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+# /api/predict/batch scores every row as /api/predict would, in input
+# order, and rejects empty or oversized batches before scoring.
+import os
+import sys
+import tempfile
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the service off the real model store
+os.environ.setdefault("MODEL_STORE_DIR", tempfile.mkdtemp())
+warnings.filterwarnings("ignore", category=UserWarning)
+
+from fastapi.testclient import TestClient
+
+from app.config import MAX_BATCH_ROWS
+from app.main import app
+from bench_predict_batch import random_rows
+
+client = TestClient(app)
+
+
+def test_batch_matches_single_predictions_in_order():
+    rows = random_rows(40, seed=31)
+    response = client.post("/api/predict/batch", json=rows)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["count"] == len(rows)
+
+    singles = [client.post("/api/predict", json=row).json() for row in rows]
+    assert body["results"] == [{"risk_score": s["risk_score"], "risk_level": s["risk_level"]} for s in singles]
+    assert {s["model_version"] for s in singles} == {body["model_version"]}
+
+    # Reordering the input reorders the output the same way
+    reversed_body = client.post("/api/predict/batch", json=rows[::-1]).json()
+    assert reversed_body["results"] == body["results"][::-1]
+
+
+def test_batch_size_limits():
+    response = client.post("/api/predict/batch", json=[])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "At least one row is required"
+
+    rows = random_rows(MAX_BATCH_ROWS + 1, seed=32)
+    response = client.post("/api/predict/batch", json=rows)
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Batch size exceeds limit of {MAX_BATCH_ROWS}"
+
+    response = client.post("/api/predict/batch", json=rows[:MAX_BATCH_ROWS])
+    assert response.status_code == 200 and response.json()["count"] == MAX_BATCH_ROWS
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_predictions_in_order()
+    test_batch_size_limits()
+    print("Batch prediction endpoint tests passed")
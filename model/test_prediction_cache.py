@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Repeated feature vectors are answered from the prediction cache: same
+# result as the model, per model version, bounded by LRU and TTL. BMI
+# rounding only applies to cached scoring.
+import os
+import sys
+import tempfile
+import warnings
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the service off the real model store
+os.environ.setdefault("MODEL_STORE_DIR", tempfile.mkdtemp())
+warnings.filterwarnings("ignore", category=UserWarning)
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import prediction_service
+from app.services.prediction_cache import PredictionCache
+from app.services.prediction_service import feature_matrix, model_registry, predict_risk_batch, prediction_cache
+from bench_predict_batch import random_rows
+
+client = TestClient(app)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put_many([(("v1", b"a"), 0.1), (("v1", b"b"), 0.2)])
+    assert cache.get_many([("v1", b"a")]) == [0.1]  # "b" is now least recently used
+
+    cache.put_many([(("v1", b"c"), 0.3)])
+    assert cache.get_many([("v1", b"a"), ("v1", b"b"), ("v1", b"c"), ("v2", b"a")]) == [0.1, None, 0.3, None]
+
+    clock.now = 10
+    assert cache.get_many([("v1", b"a")]) == [None]
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["evictions"] == 1 and stats["expirations"] == 1
+    assert (stats["hits"], stats["misses"]) == (3, 3) and stats["hit_ratio"] == 0.5
+    assert stats["approx_bytes"] > 0
+
+    cache.clear()
+    assert cache.stats()["approx_bytes"] == 0
+
+
+def test_repeated_rows_are_served_from_cache():
+    assert prediction_cache is not None
+    prediction_cache.clear()
+    rows = random_rows(20, seed=25)
+    active = model_registry.get()
+    expected = active.predictor.predict_proba(feature_matrix(rows, active.feature_order))[:, 1]
+
+    first = predict_risk_batch(rows)
+    # Half the rows seen before, half new
+    second = predict_risk_batch(rows[10:] + random_rows(10, seed=26))
+    assert [score for score, _, _ in first] == [float(round(prob * 100, 2)) for prob in expected]
+    assert second[:10] == first[10:]
+
+    stats = client.get("/api/predict/stats").json()["cache"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (10, 30, 30)
+
+    # Another model version never reuses these entries
+    keys = [(active.version + "-other", row.tobytes()) for row in feature_matrix(rows, active.feature_order)]
+    assert prediction_cache.get_many(keys) == [None] * len(rows)
+
+
+def bmi_rounding(decimals, cache):
+    """Run with PREDICTION_CACHE_BMI_DECIMALS and the cache swapped in, restoring both after."""
+    def wrap(test):
+        def wrapper():
+            saved = prediction_service.PREDICTION_CACHE_BMI_DECIMALS, prediction_service.prediction_cache
+            prediction_service.PREDICTION_CACHE_BMI_DECIMALS, prediction_service.prediction_cache = decimals, cache
+            try:
+                test()
+            finally:
+                prediction_service.PREDICTION_CACHE_BMI_DECIMALS, prediction_service.prediction_cache = saved
+        wrapper.__name__ = test.__name__
+        return wrapper
+    return wrap
+
+
+def fractional_bmi_rows():
+    rows = random_rows(20, seed=27)
+    for i, row in enumerate(rows):
+        row["BMI"] += 0.1 + 0.02 * i
+    return rows
+
+
+@bmi_rounding(0, None)
+def test_bmi_is_scored_exactly_with_cache_disabled():
+    rows = fractional_bmi_rows()
+    active = model_registry.get()
+    expected = active.predictor.predict_proba(feature_matrix(rows, active.feature_order))[:, 1]
+    assert [score for score, _, _ in predict_risk_batch(rows)] == [float(round(prob * 100, 2)) for prob in expected]
+
+
+@bmi_rounding(0, PredictionCache(1000))
+def test_bmi_rounding_shares_cache_entries():
+    rows = fractional_bmi_rows()
+    rounded = [dict(row, BMI=round(row["BMI"])) for row in rows]
+    active = model_registry.get()
+    expected = active.predictor.predict_proba(feature_matrix(rounded, active.feature_order))[:, 1]
+
+    assert [score for score, _, _ in predict_risk_batch(rows)] == [float(round(prob * 100, 2)) for prob in expected]
+    # The whole-number profiles were cached by the fractional ones
+    assert predict_risk_batch(rounded) == predict_risk_batch(rows)
+    stats = prediction_service.prediction_cache.stats()
+    assert stats["misses"] == len(rows) and stats["hits"] == 2 * len(rows)
+
+
+if __name__ == "__main__":
+    test_lru_eviction_and_ttl()
+    test_repeated_rows_are_served_from_cache()
+    test_bmi_is_scored_exactly_with_cache_disabled()
+    test_bmi_rounding_shares_cache_entries()
+    print("Prediction cache tests passed")
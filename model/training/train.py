@@ -1,7 +1,7 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
-import joblib
 
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, roc_auc_score
@@ -10,6 +10,11 @@ from sklearn.linear_model import LogisticRegression
 from imblearn.over_sampling import SMOTE
 import xgboost as xgb
 
+# The model store lives in the serving app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.config import MODEL_STORE_DIR
+from app.services.model_store import publish_version
+
 
 # ------------------------------------------------
 # 1️⃣ Load Dataset
@@ -118,9 +123,26 @@ print("ROC-AUC Score:", roc)
 
 
 # ------------------------------------------------
-# 🔟 Save Model
-# ------------------------------------------------
-MODEL_PATH = os.path.join("app", "models", "trained_model.pkl")
-joblib.dump(stack_model, MODEL_PATH)
+# 🔟 Publish to the Model Store
+# ------------------------------------------------
+# A new version with its manifest and a canary sample from the test split.
+# Activating it makes running servers load, validate and swap to it within
+# MODEL_RELOAD_CHECK_SECONDS; POST /api/model/rollback (X-Admin-Token, see
+# MODEL_ADMIN_TOKEN) undoes the switch.
+# Set ACTIVATE_MODEL=0 to publish without activating.
+manifest = publish_version(
+    MODEL_STORE_DIR,
+    stack_model,
+    feature_order=list(X.columns),
+    threshold=threshold,
+    metrics={
+        "roc_auc": float(roc),
+        "classification_report": classification_report(y_test, y_pred, output_dict=True),
+        "train_rows": int(len(X_train_res)),
+        "test_rows": int(len(X_test)),
+    },
+    canary_rows=X_test.sample(n=min(64, len(X_test)), random_state=42),
+    activate=os.getenv("ACTIVATE_MODEL", "1") != "0",
+)
 
-print("\nStacking model training complete and saved.")
+print("\nStacking model training complete; published version", manifest["version"], "to", MODEL_STORE_DIR)